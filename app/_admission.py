@@ -0,0 +1,177 @@
+"""
+Admission control for DB-bound requests
+
+When every pooled connection is checked out, further requests queue inside
+SQLAlchemy for up to DB_POOL_TIMEOUT seconds and then fail, while holding an
+executor thread and making every other request slower.  The admission
+middleware caps in-flight DB-bound requests per worker at the connection
+pool's capacity and decides up front who waits:
+
+- CRITICAL (auth, reviews): queued first, with twice the queue deadline
+- NORMAL (everything else): queued with DB_ADMISSION_QUEUE_TIMEOUT_MS
+- LOW (most-liked / recent words, admin stats): only admitted while
+  ``LOW_PRIORITY_SHARE`` of the slots are free, otherwise rejected at once
+
+Rejected and timed-out requests get ``503`` with ``Retry-After`` instead of
+a slow pool timeout.  Static files and ``/health`` bypass admission.
+
+Counters are per worker process (single event loop, so no locking).
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+CRITICAL, NORMAL, LOW = 0, 1, 2
+PRIORITY_NAMES = {CRITICAL: "critical", NORMAL: "normal", LOW: "low"}
+
+# LOW requests only run while this share of the slots is still free
+LOW_PRIORITY_SHARE = 0.25
+# Suggested client back-off per priority
+RETRY_AFTER_SECONDS = {CRITICAL: 1, NORMAL: 2, LOW: 5}
+
+EXEMPT_PREFIXES = ("/static", "/favicon.ico", "/health")
+LOW_PRIORITY_PREFIXES = (
+    "/api/most-liked-words",
+    "/api/user/recent-words",
+    "/api/admin/",
+    "/admin",
+)
+CRITICAL_PREFIXES = (
+    "/api/auth/",
+    "/auth/",
+    "/login",
+    "/logout",
+)
+CRITICAL_SUFFIXES = ("/review", "/know")
+
+
+def classify(path: str) -> Optional[int]:
+    """Priority for ``path``, or None if it bypasses admission control."""
+    if path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path.startswith(LOW_PRIORITY_PREFIXES):
+        return LOW
+    if path.startswith(CRITICAL_PREFIXES) or (
+        path.startswith("/api/words/") and path.endswith(CRITICAL_SUFFIXES)
+    ):
+        return CRITICAL
+    return NORMAL
+
+
+class Rejected(Exception):
+    """Request was shed; ``retry_after`` is the suggested back-off in seconds."""
+
+    def __init__(self, priority: int, reason: str):
+        super().__init__(reason)
+        self.priority = priority
+        self.reason = reason
+        self.retry_after = RETRY_AFTER_SECONDS[priority]
+
+
+class _Counters:
+    __slots__ = ("admitted", "queued", "shed", "timed_out", "wait_ms", "max_wait_ms")
+
+    def __init__(self):
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+            "mean_queue_wait_ms": round(self.wait_ms / self.queued, 3) if self.queued else 0.0,
+            "max_queue_wait_ms": round(self.max_wait_ms, 3),
+        }
+
+
+class AdmissionController:
+    """Per-worker limit on in-flight DB-bound requests with a priority queue."""
+
+    def __init__(self, max_in_flight: int, queue_timeout_ms: float):
+        self.max_in_flight = max(max_in_flight, 1)
+        self.queue_timeout_s = max(queue_timeout_ms, 0.0) / 1000
+        self.in_flight = 0
+        self._seq = itertools.count()
+        # (priority, seq, future): lower priority value is served first
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counters = {p: _Counters() for p in PRIORITY_NAMES}
+        self._max_in_flight_seen = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _p, _s, f in self._waiters if not f.done())
+
+    def _free_slots(self) -> int:
+        return self.max_in_flight - self.in_flight
+
+    def _admit(self, priority: int) -> None:
+        self.in_flight += 1
+        self._max_in_flight_seen = max(self._max_in_flight_seen, self.in_flight)
+        self._counters[priority].admitted += 1
+
+    async def acquire(self, priority: int) -> None:
+        """Take a slot or raise Rejected."""
+        counters = self._counters[priority]
+        if priority == LOW:
+            if self._free_slots() <= self.max_in_flight * LOW_PRIORITY_SHARE:
+                counters.shed += 1
+                raise Rejected(priority, "busy")
+            self._admit(priority)
+            return
+        if self._free_slots() > 0 and not self.queue_depth:
+            self._admit(priority)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        counters.queued += 1
+        started = time.perf_counter()
+        timeout = self.queue_timeout_s * (2 if priority == CRITICAL else 1)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                counters.timed_out += 1
+                raise Rejected(priority, "queue timeout")
+            # The slot was handed over just as the deadline hit: keep it
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # handed a slot, but the client went away
+            else:
+                future.cancel()
+            raise
+        finally:
+            wait_ms = (time.perf_counter() - started) * 1000
+            counters.wait_ms += wait_ms
+            counters.max_wait_ms = max(counters.max_wait_ms, wait_ms)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the highest-priority live waiter."""
+        while self._waiters:
+            priority, _seq, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue  # timed out or cancelled
+            self._counters[priority].admitted += 1
+            future.set_result(None)
+            return  # the slot moves to the waiter; in_flight is unchanged
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "queue_timeout_ms": round(self.queue_timeout_s * 1000, 3),
+            "in_flight": self.in_flight,
+            "max_in_flight_seen": self._max_in_flight_seen,
+            "queue_depth": self.queue_depth,
+            "by_priority": {name: self._counters[p].as_dict() for p, name in PRIORITY_NAMES.items()},
+        }
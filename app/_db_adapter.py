@@ -7,45 +7,281 @@ existing DatabaseManager method bodies require minimal changes.
 This adapter automatically:
 - Converts ? positional placeholders to :named parameters
 - Adapts SQLite-specific SQL for PostgreSQL (julianday, COLLATE NOCASE, etc.)
+- Turns INSERT OR REPLACE / OR IGNORE into single-statement
+  ON CONFLICT upserts on PostgreSQL
 - Wraps SQLAlchemy Row objects with dict-like access (row['column'])
+- Caches translated statements so each literal SQL string is only
+  rewritten and wrapped in text() once per process
+- Executes precompiled Core statements (_db_statements) as-is, with a dict
+  of named parameters
+- Records per-statement execute/fetch latency and row counts (_db_metrics)
+- Retries SQLite statements and commits that fail with "database is locked"
+  using jittered exponential backoff up to DB_LOCK_RETRY_DEADLINE_MS
+- Enforces the request's deadline (_db_deadline): no statement starts once
+  it has passed, and interrupted / timed-out ones raise DeadlineExceeded
+- Offers the same interface over AsyncSession (AsyncConnectionAdapter)
 """
 
+import asyncio
+import random
 import re
-from typing import Any, Optional
+import sqlite3
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, TypeVar, Union
 
-from sqlalchemy import text
+from sqlalchemy import TextClause, UniqueConstraint, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.base import Executable
+
+import _db_metrics
+from _db_deadline import DeadlineExceeded, check_deadline, expired, is_timeout_error, remaining_ms
+from settings import settings
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class RowAdapter:
-    """Wraps a SQLAlchemy Row to provide sqlite3.Row-like dict/index access."""
-    __slots__ = ("_mapping",)
+    """sqlite3.Row-like row backed by a plain tuple.
+
+    All rows of one result set share a single ``keys`` tuple and key-to-index
+    map, so each row only holds its values.  Access by name or index is O(1).
+    """
+    __slots__ = ("_values", "_keys", "_index")
 
-    def __init__(self, sa_row):
-        object.__setattr__(self, "_mapping", sa_row._mapping)
+    def __init__(self, values: tuple, keys: Tuple[str, ...], index: Dict[str, int]):
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "_keys", keys)
+        object.__setattr__(self, "_index", index)
+
+    @classmethod
+    def from_result(cls, result) -> Callable[[Any], "RowAdapter"]:
+        """Return a factory that wraps rows of ``result`` with a shared key map."""
+        keys = tuple(result.keys())
+        index = {k: i for i, k in enumerate(keys)}
+        return lambda sa_row: cls(tuple(sa_row), keys, index)
 
     def __getitem__(self, key):
         if isinstance(key, int):
-            return list(self._mapping.values())[key]
-        return self._mapping[key]
+            return self._values[key]
+        return self._values[self._index[key]]
+
+    def get(self, key, default=None):
+        i = self._index.get(key)
+        return default if i is None else self._values[i]
 
     def keys(self):
-        return self._mapping.keys()
+        return self._keys
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the row as a new dict of column name -> value."""
+        return dict(zip(self._keys, self._values))
 
     def __iter__(self):
-        return iter(self._mapping.values())
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._index
 
     def __repr__(self):
-        return f"RowAdapter({dict(self._mapping)})"
+        return f"RowAdapter({self.to_dict()})"
+
+
+# Session.info key counting writes not yet committed (see _db_unit_of_work)
+PENDING_WRITES = "pending_writes"
+
+_READ_ONLY_KEYWORDS = frozenset({"SELECT", "PRAGMA", "EXPLAIN"})
+
+
+# Literal SQL string or a precompiled Core statement
+Statement = Union[str, Executable]
+
+
+@lru_cache(maxsize=1024)
+def _is_write(sql: Statement) -> bool:
+    if not isinstance(sql, str):
+        return sql.is_dml
+    head = sql.lstrip().split(None, 1)
+    return bool(head) and head[0].upper() not in _READ_ONLY_KEYWORDS
+
+
+@lru_cache(maxsize=1024)
+def _statement_key(sql: Statement) -> str:
+    """Metrics / lock-retry key: the SQL text, whitespace collapsed."""
+    return _db_metrics.normalize_statement(sql if isinstance(sql, str) else str(sql))
+
+
+# ── lock retry (SQLite) ──────────────────────────────────────
+# PRAGMA busy_timeout bounds each attempt (DB_BUSY_TIMEOUT_MS); between
+# attempts the thread sleeps a random "full jitter" delay in
+# [0, min(cap, base * 2**attempt)] so colliding writers spread out instead of
+# retrying in lockstep, until DB_LOCK_RETRY_DEADLINE_MS has passed.
+# Only a statement that starts a transaction is retried: connections BEGIN
+# IMMEDIATE (see database._install_sqlite_pragmas), so that is where writers
+# wait, and nothing is held yet.  A lock error inside an open transaction
+# fails the transaction; retrying one statement there could wait on a lock
+# our own snapshot keeps from ever being granted.
+LOCK_RETRY_BASE_MS = 5.0
+LOCK_RETRY_CAP_MS = 500.0
+
+_LOCK_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+T = TypeVar("T")
+
+
+# SQLAlchemy-wrapped errors from statements, raw sqlite3 ones from the DBAPI COMMIT
+_LOCK_ERRORS = (OperationalError, sqlite3.OperationalError)
+
+
+def _is_lock_error(exc: Exception) -> bool:
+    message = str(getattr(exc, "orig", None) or exc).lower()
+    return any(m in message for m in _LOCK_MESSAGES)
+
+
+def _lock_backoff_s(attempt: int) -> float:
+    return random.uniform(0, min(LOCK_RETRY_CAP_MS, LOCK_RETRY_BASE_MS * 2 ** attempt)) / 1000
+
+
+def _next_lock_delay(exc: Exception, key: Optional[str], started: float, attempt: int) -> float:
+    """Seconds to sleep before the next attempt; re-raises when out of time."""
+    if not _is_lock_error(exc):
+        raise exc
+    elapsed = time.perf_counter() - started
+    delay = _lock_backoff_s(attempt)
+    left_ms = remaining_ms()
+    if elapsed + delay > settings.DB_LOCK_RETRY_DEADLINE_MS / 1000 or (
+        left_ms is not None and delay * 1000 >= left_ms
+    ):
+        _db_metrics.record_lock_wait(key, elapsed * 1000, attempt, failed=True)
+        raise exc
+    return delay
+
+
+def retry_locked(fn: Callable[[], T], key: Optional[str] = None) -> T:
+    """Call ``fn``, retrying with backoff while SQLite reports a lock."""
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        try:
+            result = fn()
+        except _LOCK_ERRORS as exc:
+            time.sleep(_next_lock_delay(exc, key, started, attempt))
+            attempt += 1
+            continue
+        if attempt:
+            _db_metrics.record_lock_wait(key, (time.perf_counter() - started) * 1000, attempt)
+        return result
+
+
+async def retry_locked_async(fn: Callable[[], Any], key: Optional[str] = None) -> Any:
+    """Async retry_locked: ``fn`` returns an awaitable, sleeps don't block the loop."""
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        try:
+            result = await fn()
+        except _LOCK_ERRORS as exc:
+            await asyncio.sleep(_next_lock_delay(exc, key, started, attempt))
+            attempt += 1
+            continue
+        if attempt:
+            _db_metrics.record_lock_wait(key, (time.perf_counter() - started) * 1000, attempt)
+        return result
+
+
+def _sqlite_in_transaction(dbapi_conn) -> bool:
+    """True if the SQLite DBAPI connection (sqlite3 or aiosqlite) has a transaction open."""
+    raw = getattr(dbapi_conn, "_connection", dbapi_conn)  # SQLAlchemy's aiosqlite adapter
+    return bool(getattr(raw, "in_transaction", False))
+
+
+def commit_session(session: Session, is_sqlite: bool) -> None:
+    """``session.commit()``, retrying a locked SQLite COMMIT.
+
+    A failed Session.commit() cannot be retried (the session then requires a
+    rollback), so on SQLite the DBAPI-level COMMIT is retried first; the
+    session's own commit afterwards finds nothing left to commit.
+    """
+    if is_sqlite and session.in_transaction():
+        dbapi_conn = session.connection().connection.dbapi_connection
+        if _sqlite_in_transaction(dbapi_conn):
+            retry_locked(dbapi_conn.commit, "COMMIT")
+    session.commit()
+
+
+_OR_REPLACE_RE = re.compile(
+    r"INSERT\s+OR\s+REPLACE\s+INTO\s+(?P<table>\w+)\s*\((?P<cols>[^)]*)\)",
+    re.IGNORECASE,
+)
+
+
+def _conflict_target(table: str, columns: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    """Return the first unique key of ``table`` fully covered by ``columns``."""
+    from models import Base  # deferred: only needed when translating for PG
+
+    tbl = Base.metadata.tables.get(table)
+    if tbl is None:
+        return None
+    keys = sorted(
+        (c for c in tbl.constraints if isinstance(c, UniqueConstraint)),
+        key=lambda c: c.name or "",
+    )
+    candidates = [tuple(col.name for col in c.columns) for c in keys]
+    candidates.append(tuple(col.name for col in tbl.primary_key.columns))
+    for target in candidates:
+        if target and set(target) <= set(columns):
+            return target
+    return None
+
+
+def _or_replace_to_upsert(sql: str) -> str:
+    """Rewrite ``INSERT OR REPLACE`` as a PostgreSQL ``ON CONFLICT`` upsert.
+
+    The conflict target is the table's unique key covered by the inserted
+    columns; every other inserted column is overwritten from EXCLUDED, which
+    matches what SQLite's REPLACE leaves behind in a single statement.
+    """
+    m = _OR_REPLACE_RE.search(sql)
+    if not m:
+        return sql
+    table = m.group("table")
+    columns = tuple(c.strip() for c in m.group("cols").split(","))
+    sql = sql[:m.start()] + f"INSERT INTO {table} ({m.group('cols')})" + sql[m.end():]
+    if re.search(r"\bON\s+CONFLICT\b", sql, flags=re.IGNORECASE):
+        return sql
+
+    target = _conflict_target(table, columns)
+    if target is None:
+        return sql
+    updates = [c for c in columns if c not in target]
+    if updates:
+        action = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in updates)
+    else:
+        action = "DO NOTHING"
+    return sql.rstrip().rstrip(";") + f" ON CONFLICT ({', '.join(target)}) {action}"
 
 
 class CursorAdapter:
-    """Wraps a SQLAlchemy session to behave like sqlite3.Cursor."""
+    """Wraps a SQLAlchemy session to behave like sqlite3.Cursor.
 
-    def __init__(self, session: Session, is_sqlite: bool):
+    With ``stream=True`` results are fetched lazily in batches of
+    ``STREAM_BATCH_SIZE`` rows (a server-side cursor on PostgreSQL), so
+    iterating the cursor or calling fetchmany() runs in constant memory.
+    """
+
+    def __init__(self, session: Session, is_sqlite: bool, stream: bool = False):
         self._session = session
         self._is_sqlite = is_sqlite
+        self._stream = stream
         self._result = None
+        self._make_row = None
+        self._stmt_key: Optional[str] = None
+        self.arraysize: int = 1
         self.lastrowid: Optional[int] = None
         self.rowcount: int = 0
 
@@ -68,9 +304,10 @@ class CursorAdapter:
         return new_sql, named
 
     # ── dialect adaptation ────────────────────────────────────
-    def _adapt_sql(self, sql: str) -> str:
+    @staticmethod
+    def _adapt_sql_for_dialect(sql: str, is_sqlite: bool) -> str:
         """Adapt SQLite-specific SQL for PostgreSQL when running on PG."""
-        if self._is_sqlite:
+        if is_sqlite:
             return sql
 
         # Strip COLLATE NOCASE (PostgreSQL is case-sensitive by default)
@@ -90,47 +327,264 @@ class CursorAdapter:
             sql,
         )
 
-        # INSERT OR REPLACE → plain INSERT (caller should handle conflicts)
-        sql = re.sub(r"INSERT\s+OR\s+REPLACE\s+INTO", "INSERT INTO", sql, flags=re.IGNORECASE)
+        # INSERT OR REPLACE → INSERT ... ON CONFLICT (<unique key>) DO UPDATE
+        sql = _or_replace_to_upsert(sql)
 
         # INSERT OR IGNORE → INSERT ... ON CONFLICT DO NOTHING
-        sql = re.sub(r"INSERT\s+OR\s+IGNORE\s+INTO", "INSERT INTO", sql, flags=re.IGNORECASE)
+        sql, n = re.subn(r"INSERT\s+OR\s+IGNORE\s+INTO", "INSERT INTO", sql, flags=re.IGNORECASE)
+        if n and not re.search(r"\bON\s+CONFLICT\b", sql, flags=re.IGNORECASE):
+            sql = sql.rstrip().rstrip(";") + " ON CONFLICT DO NOTHING"
 
         return sql
 
-    # ── execute ───────────────────────────────────────────────
-    def execute(self, sql: str, params=None):
-        stripped = sql.strip().upper()
-
-        # Skip SQLite-only statements on PostgreSQL
-        if not self._is_sqlite:
-            if stripped.startswith("PRAGMA"):
-                return self
-            if stripped.startswith("CREATE TRIGGER"):
-                return self
+    def _adapt_sql(self, sql: str) -> str:
+        """Adapt SQLite-specific SQL for the dialect of this cursor."""
+        return self._adapt_sql_for_dialect(sql, self._is_sqlite)
 
-        sql, named = self._positional_to_named(sql, params)
-        sql = self._adapt_sql(sql)
+    # ── execute ───────────────────────────────────────────────
+    def _bind(self, sql: Statement, params):
+        """Return (clause, named params), or None to skip the statement."""
+        if not isinstance(sql, str):
+            return sql, dict(params) if params else {}
+        compiled = _translate(sql, self._is_sqlite, bool(params))
+        if compiled is None:
+            # SQLite-only statement on PostgreSQL -- skip it
+            return None
+        clause, param_names = compiled
+        return clause, (dict(zip(param_names, params)) if params else {})
+
+    def execute(self, sql: Statement, params=None):
+        bound = self._bind(sql, params)
+        if bound is None:
+            return self
+        clause, named = bound
+
+        started = time.perf_counter()
+        if self._stream:
+            result = self._session_execute(
+                sql, clause, named,
+                execution_options={"stream_results": True, "yield_per": STREAM_BATCH_SIZE},
+            )
+        else:
+            result = self._session_execute(sql, clause, named)
+        self._set_result(sql, result, (time.perf_counter() - started) * 1000)
+        return self
 
-        self._result = self._session.execute(text(sql), named)
+    def _session_execute(self, sql: Statement, *args, **kwargs):
+        """session.execute() within the request deadline.
+
+        On SQLite a statement that starts a transaction is retried on lock
+        errors; inside an open transaction the error is raised.
+        """
+        check_deadline()
+        try:
+            if not self._is_sqlite or _sqlite_in_transaction(
+                    self._session.connection().connection.dbapi_connection):
+                return self._session.execute(*args, **kwargs)
+            return retry_locked(
+                lambda: self._session.execute(*args, **kwargs),
+                _statement_key(sql),
+            )
+        except OperationalError as e:
+            if expired() and is_timeout_error(e):
+                raise DeadlineExceeded("statement cancelled at the request deadline") from e
+            raise
+
+    def _set_result(self, sql: Statement, result, elapsed_ms: float) -> None:
+        self._result = result
+        self._make_row = None
 
         # Capture lastrowid and rowcount
         self.lastrowid = getattr(self._result, "lastrowid", None)
         rc = getattr(self._result, "rowcount", -1)
         self.rowcount = rc if rc >= 0 else 0
+
+        if _is_write(sql):
+            self._count_write()
+
+        # SELECT rows are counted as they are fetched
+        self._stmt_key = _statement_key(sql)
+        _db_metrics.record_execute(
+            self._stmt_key, elapsed_ms,
+            0 if self._result.returns_rows else self.rowcount,
+        )
+
+    def executemany(self, sql: str, seq_of_params):
+        """Execute ``sql`` for every parameter tuple in ``seq_of_params``.
+
+        ``INSERT ... VALUES (?, ...)`` statements are expanded into multi-row
+        VALUES pages (the insertmanyvalues technique), so N rows cost
+        ceil(N / page) round trips on both SQLite and PostgreSQL.  Other
+        statements go through a single DBAPI executemany().
+
+        ``rowcount`` is the total number of rows affected, so with
+        ``INSERT OR IGNORE`` the caller can count skipped duplicates as
+        ``len(seq_of_params) - rowcount``.
+        """
+        rows = [tuple(p) for p in seq_of_params]
+        self._result = None
+        self._make_row = None
+        self._stmt_key = None
+        self.lastrowid = None
+        self.rowcount = 0
+        if not rows:
+            return self
+
+        self._count_write()
+        started = time.perf_counter()
+        try:
+            self._executemany(sql, rows)
+        finally:
+            _db_metrics.record_execute(
+                _db_metrics.normalize_statement(sql),
+                (time.perf_counter() - started) * 1000,
+                self.rowcount,
+            )
         return self
 
+    def _count_write(self) -> None:
+        info = self._session.info
+        info[PENDING_WRITES] = info.get(PENDING_WRITES, 0) + 1
+
+    def _executemany(self, sql: str, rows) -> None:
+
+        match = _INSERT_VALUES_RE.match(sql)
+        if match and "?" not in match.group("tail") and "RETURNING" not in match.group("tail").upper():
+            width = len(rows[0])
+            page = max(1, min(MAX_ROWS_PER_INSERT, MAX_PARAMS_PER_STATEMENT // max(width, 1)))
+            for start in range(0, len(rows), page):
+                chunk = rows[start:start + page]
+                values = ", ".join([match.group("row")] * len(chunk))
+                paged_sql = f"{match.group('head')}{values}{match.group('tail')}"
+                # Only full pages are cached; the trailing partial page varies per call
+                translate = _translate if len(chunk) == page else _translate.__wrapped__
+                compiled = translate(paged_sql, self._is_sqlite, True)
+                if compiled is None:
+                    return
+                clause, param_names = compiled
+                named = dict(zip(param_names, (v for row in chunk for v in row)))
+                result = self._session_execute(sql, clause, named)
+                rc = getattr(result, "rowcount", -1)
+                self.rowcount += rc if rc >= 0 else 0
+            return
+
+        compiled = _translate(sql, self._is_sqlite, True)
+        if compiled is None:
+            return
+        clause, param_names = compiled
+        result = self._session_execute(sql, clause, [dict(zip(param_names, row)) for row in rows])
+        rc = getattr(result, "rowcount", -1)
+        self.rowcount = rc if rc >= 0 else 0
+
     # ── fetch ─────────────────────────────────────────────────
+    def _row_factory(self):
+        if self._make_row is None:
+            self._make_row = RowAdapter.from_result(self._result)
+        return self._make_row
+
     def fetchone(self):
         if self._result is None:
             return None
+        started = time.perf_counter()
         row = self._result.fetchone()
-        return RowAdapter(row) if row else None
+        _db_metrics.record_fetch(self._stmt_key, (time.perf_counter() - started) * 1000, 1 if row else 0)
+        return self._row_factory()(row) if row else None
 
     def fetchall(self):
         if self._result is None:
             return []
-        return [RowAdapter(r) for r in self._result.fetchall()]
+        started = time.perf_counter()
+        rows = self._result.fetchall()
+        _db_metrics.record_fetch(self._stmt_key, (time.perf_counter() - started) * 1000, len(rows))
+        if not rows:
+            return []
+        make_row = self._row_factory()
+        return [make_row(r) for r in rows]
+
+    def fetchmany(self, size: Optional[int] = None):
+        if self._result is None:
+            return []
+        started = time.perf_counter()
+        rows = self._result.fetchmany(size or self.arraysize)
+        _db_metrics.record_fetch(self._stmt_key, (time.perf_counter() - started) * 1000, len(rows))
+        if not rows:
+            return []
+        make_row = self._row_factory()
+        return [make_row(r) for r in rows]
+
+    def __iter__(self):
+        if self._result is None:
+            return
+        make_row = self._row_factory()
+        partitions = self._result.partitions(STREAM_BATCH_SIZE)
+        while True:
+            started = time.perf_counter()
+            partition = next(partitions, None)
+            _db_metrics.record_fetch(
+                self._stmt_key, (time.perf_counter() - started) * 1000,
+                len(partition) if partition else 0,
+            )
+            if not partition:
+                return
+            for r in partition:
+                yield make_row(r)
+
+
+# Rows buffered per round trip when a cursor streams its results.
+STREAM_BATCH_SIZE = 1000
+
+# executemany() page limits.  SQLite builds before 3.32 cap a statement at
+# 999 bound parameters, so stay under that on every dialect.
+MAX_PARAMS_PER_STATEMENT = 900
+MAX_ROWS_PER_INSERT = 500
+
+# INSERT ... VALUES (<one row>) [tail], where the row has no nested parens
+_INSERT_VALUES_RE = re.compile(
+    r"^(?P<head>\s*INSERT\b.*?\bVALUES\s*)(?P<row>\([^()]*\))(?P<tail>.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+# ── translation cache ─────────────────────────────────────────
+# DatabaseManager issues a fixed set of literal SQL strings, so the
+# translated TextClause is cached per (sql, dialect, has_params) instead of
+# re-running the placeholder and dialect regexes on every execute().
+TRANSLATION_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=TRANSLATION_CACHE_SIZE)
+def _translate(sql: str, is_sqlite: bool, has_params: bool) -> Optional[Tuple[TextClause, Tuple[str, ...]]]:
+    """Translate raw SQL once and return ``(TextClause, param_names)``.
+
+    Returns None for SQLite-only statements (PRAGMA, CREATE TRIGGER) that
+    must be skipped on PostgreSQL.
+    """
+    if not is_sqlite:
+        stripped = sql.strip().upper()
+        if stripped.startswith("PRAGMA") or stripped.startswith("CREATE TRIGGER"):
+            return None
+
+    param_names: Tuple[str, ...] = ()
+    if has_params:
+        count = sql.count("?")
+        sql, _ = CursorAdapter._positional_to_named(sql, range(count))
+        param_names = tuple(f"_p{i}" for i in range(1, count + 1))
+
+    sql = CursorAdapter._adapt_sql_for_dialect(sql, is_sqlite)
+    return text(sql), param_names
+
+
+def get_translation_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters for the SQL translation cache."""
+    info = _translate.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_ratio": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
 
 
 class ConnectionAdapter:
@@ -146,16 +600,24 @@ class ConnectionAdapter:
         self._session = session
         self._is_sqlite = is_sqlite
 
-    def cursor(self) -> CursorAdapter:
-        return CursorAdapter(self._session, self._is_sqlite)
+    def cursor(self, stream: bool = False) -> CursorAdapter:
+        return CursorAdapter(self._session, self._is_sqlite, stream=stream)
 
-    def execute(self, sql: str, params=None) -> CursorAdapter:
+    def execute(self, sql: Statement, params=None) -> CursorAdapter:
         c = self.cursor()
         c.execute(sql, params)
         return c
 
+    def executemany(self, sql: str, seq_of_params) -> CursorAdapter:
+        c = self.cursor()
+        c.executemany(sql, seq_of_params)
+        return c
+
     def commit(self):
-        self._session.commit()
+        commit_session(self._session, self._is_sqlite)
+
+    def rollback(self):
+        self._session.rollback()
 
     def close(self):
         self._session.close()
@@ -169,9 +631,84 @@ class ConnectionAdapter:
             self._session.rollback()
         else:
             try:
-                self._session.commit()
+                commit_session(self._session, self._is_sqlite)
             except Exception:
                 self._session.rollback()
                 raise
         self._session.close()
         return False
+
+
+class AsyncCursorAdapter(CursorAdapter):
+    """CursorAdapter over an AsyncSession: ``await cursor.execute(...)``.
+
+    Results are buffered by the async session, so the fetch methods are the
+    regular synchronous ones.  Streaming and executemany are not supported.
+    """
+
+    def __init__(self, session: "AsyncSession", is_sqlite: bool):
+        super().__init__(session, is_sqlite)
+
+    async def execute(self, sql: Statement, params=None):
+        bound = self._bind(sql, params)
+        if bound is None:
+            return self
+        clause, named = bound
+
+        started = time.perf_counter()
+        check_deadline()
+        try:
+            conn = await self._session.connection()
+            if self._is_sqlite and not _sqlite_in_transaction(
+                    conn.sync_connection.connection.dbapi_connection):
+                result = await retry_locked_async(
+                    lambda: self._session.execute(clause, named),
+                    _statement_key(sql),
+                )
+            else:
+                result = await self._session.execute(clause, named)
+        except OperationalError as e:
+            if expired() and is_timeout_error(e):
+                raise DeadlineExceeded("statement cancelled at the request deadline") from e
+            raise
+        self._set_result(sql, result, (time.perf_counter() - started) * 1000)
+        return self
+
+
+class AsyncConnectionAdapter:
+    """Async counterpart of ConnectionAdapter (``async with`` commits/rolls back)."""
+
+    def __init__(self, session: "AsyncSession", is_sqlite: bool):
+        self._session = session
+        self._is_sqlite = is_sqlite
+
+    def cursor(self) -> AsyncCursorAdapter:
+        return AsyncCursorAdapter(self._session, self._is_sqlite)
+
+    async def execute(self, sql: Statement, params=None) -> AsyncCursorAdapter:
+        return await self.cursor().execute(sql, params)
+
+    async def commit(self):
+        await self._session.commit()
+
+    async def rollback(self):
+        await self._session.rollback()
+
+    async def close(self):
+        await self._session.close()
+
+    # ── context manager ───────────────────────────────────────
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type:
+            await self._session.rollback()
+        else:
+            try:
+                await self._session.commit()
+            except Exception:
+                await self._session.rollback()
+                raise
+        await self._session.close()
+        return False
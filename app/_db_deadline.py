@@ -0,0 +1,158 @@
+"""
+Per-request deadlines for database statements
+
+Nothing used to bound how long a query could run: an aggregate over every
+user's vocabulary or an ``ORDER BY RANDOM()`` on a large table held its
+connection (and executor thread) for as long as it took.
+
+The ``request_deadline`` middleware gives every request a budget
+(DB_REQUEST_DEADLINE_MS, or the longest matching prefix in
+DB_ROUTE_DEADLINES_MS) stored in a ContextVar, which the DB executors carry
+into their worker threads.  The DB layer turns what is left of it into:
+
+- PostgreSQL: ``SET LOCAL statement_timeout`` when a session's transaction
+  begins, lowered again before a later statement once the budget left is
+  STATEMENT_TIMEOUT_SLACK_MS below it (the timeout applies to each
+  statement, not to the transaction), so the server cancels the statement
+- SQLite: a progress handler on every connection that interrupts the
+  running statement once the deadline has passed
+
+Statements are not started at all once the budget is spent, and lock
+retries stop at the deadline.  Either way the caller sees DeadlineExceeded
+and the unit of work rolls back, so the connection goes back to the pool
+clean.  That holds even when a DB method's ``except Exception`` fallback
+swallows the error: every DeadlineExceeded is recorded for the request, and
+the unit of work re-raises it (``raise_if_exceeded``) instead of
+committing.  Background threads (group commit, maintenance) run without a
+deadline.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from settings import settings
+
+_deadline: ContextVar[Optional[float]] = ContextVar("db_request_deadline", default=None)
+# DeadlineExceeded errors raised in this request (the executors' copied
+# contexts share the list)
+_exceeded: ContextVar[Optional[List["DeadlineExceeded"]]] = ContextVar("db_deadline_exceeded", default=None)
+
+# SQLite VM instructions between progress-handler calls
+SQLITE_PROGRESS_OPS = 10000
+# Re-issue statement_timeout once it would overrun the deadline by this much
+STATEMENT_TIMEOUT_SLACK_MS = 50
+# Connection.info key: statement_timeout (ms) set in the current transaction
+_TIMEOUT_KEY = "deadline_statement_timeout_ms"
+
+_TIMEOUT_MESSAGES = ("interrupted", "canceling statement due to statement timeout")
+
+
+class DeadlineExceeded(Exception):
+    """The request's time budget ran out before or during a statement."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        raised = _exceeded.get()
+        if raised is not None:
+            raised.append(self)
+
+
+def deadline_for_path(path: str) -> int:
+    """Budget in ms for ``path`` (0 = unbounded)."""
+    best = None
+    for prefix, budget_ms in settings.DB_ROUTE_DEADLINES_MS.items():
+        if path.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, budget_ms)
+    return best[1] if best is not None else settings.DB_REQUEST_DEADLINE_MS
+
+
+@contextmanager
+def request_deadline(budget_ms: float) -> Iterator[None]:
+    """Run the block with a deadline ``budget_ms`` from now (<= 0: none)."""
+    token = _deadline.set(time.monotonic() + budget_ms / 1000 if budget_ms > 0 else None)
+    exceeded_token = _exceeded.set([])
+    try:
+        yield
+    finally:
+        _exceeded.reset(exceeded_token)
+        _deadline.reset(token)
+
+
+def raise_if_exceeded() -> None:
+    """Re-raise the request's first DeadlineExceeded, even if it was caught."""
+    raised = _exceeded.get()
+    if raised:
+        raise raised[0]
+
+
+def remaining_ms() -> Optional[float]:
+    """Milliseconds left in the current budget, or None without a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return (deadline - time.monotonic()) * 1000
+
+
+def expired() -> bool:
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def check_deadline() -> None:
+    """Raise DeadlineExceeded if the budget is already spent."""
+    if expired():
+        raise DeadlineExceeded("request deadline exceeded before the statement started")
+
+
+def is_timeout_error(exc: Exception) -> bool:
+    """True for a SQLite interrupt / PostgreSQL statement_timeout cancel."""
+    message = str(getattr(exc, "orig", None) or exc).lower()
+    return any(m in message for m in _TIMEOUT_MESSAGES)
+
+
+def sqlite_progress_handler() -> int:
+    """sqlite3 progress handler: non-zero aborts the running statement."""
+    return 1 if expired() else 0
+
+
+@event.listens_for(Session, "after_begin")
+def _set_statement_timeout(session, transaction, connection):
+    if connection.dialect.name != "postgresql":
+        return
+    left = remaining_ms()
+    if left is None:
+        return
+    if left <= 0:
+        raise DeadlineExceeded("request deadline exceeded before the transaction started")
+    timeout_ms = max(int(left), 1)
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+    connection.info[_TIMEOUT_KEY] = timeout_ms
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _refresh_statement_timeout(conn, cursor, statement, parameters, context, executemany):
+    timeout_ms = conn.info.get(_TIMEOUT_KEY)
+    if timeout_ms is None:
+        return
+    left = remaining_ms()
+    if left is None or timeout_ms - left < STATEMENT_TIMEOUT_SLACK_MS:
+        return
+    if left <= 0:
+        raise DeadlineExceeded("request deadline exceeded before the statement started")
+    timeout_ms = max(int(left), 1)
+    # On the raw cursor: Connection.exec_driver_sql would re-enter this hook
+    cursor.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+    conn.info[_TIMEOUT_KEY] = timeout_ms
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _forget_statement_timeout(conn):
+    # SET LOCAL ends with the transaction; info outlives it on the pooled connection
+    conn.info.pop(_TIMEOUT_KEY, None)
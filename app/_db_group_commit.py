@@ -0,0 +1,190 @@
+"""
+Group commit for small SQLite writes
+
+With several threads (and gunicorn workers) writing to one SQLite file, every
+like / hide / review is its own transaction: one write-lock acquisition and
+one fsync each, and bursts end in ``database is locked``.
+
+When DB_GROUP_COMMIT is on, DatabaseManager methods decorated with
+``group_commit`` are not run on the caller's thread.  They are queued to a
+single writer thread per worker process, which drains the queue every
+DB_GROUP_COMMIT_WINDOW_MS, runs the batch inside one unit of work and commits
+once.  Each call borrows the unit's connection like any other method body, so
+its statements run under their own SAVEPOINT: a failing call only undoes its
+own writes and its caller still gets its own return value or exception.
+
+If the batch COMMIT itself fails nothing was written, and every call in the
+batch is re-run in its own transaction so each caller gets an individual
+result.
+
+Batched calls commit independently of the caller's unit of work: its
+pending writes are committed before the call is queued, and a later
+rollback of the unit does not undo the batched write.
+
+Batching is per worker process; across gunicorn workers SQLite's file lock
+still serialises the (now far fewer) commits.
+"""
+
+import functools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from _db_unit_of_work import current_unit_of_work, unit_of_work
+
+_Op = Tuple[Callable[[], Any], Future, float]
+
+
+class GroupCommitWriter:
+    """Single writer thread that commits queued write calls in batches."""
+
+    def __init__(self, engine: Engine, window_ms: float, max_batch: int):
+        self._engine = engine
+        self.window_s = max(window_ms, 0.0) / 1000
+        self.max_batch = max(max_batch, 1)
+        self._queue: "queue.SimpleQueue[_Op]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._ops = 0
+        self._max_batch_seen = 0
+        self._batch_fallbacks = 0
+        self._commit_ms = 0.0
+        self._max_commit_ms = 0.0
+        self._wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    @property
+    def on_writer_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _ensure_started(self) -> None:
+        # Started lazily, and again after a fork (gunicorn) since threads
+        # do not survive it
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._run, name="db-group-commit", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn`` in the next batch and return its result (or raise)."""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((functools.partial(fn, *args, **kwargs), future, time.perf_counter()))
+        return future.result()
+
+    # ── writer thread ─────────────────────────────────────────
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window_s
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_Op]) -> None:
+        started = time.perf_counter()
+        results: List[Tuple[bool, Any]] = []
+        try:
+            with unit_of_work(self._engine, is_sqlite=True):
+                for call, _future, _enqueued in batch:
+                    results.append(_call(call))
+        except Exception:
+            # COMMIT failed, nothing in the batch was written
+            with self._stats_lock:
+                self._batch_fallbacks += 1
+            results = []
+            for call, _future, _enqueued in batch:
+                try:
+                    with unit_of_work(self._engine, is_sqlite=True):
+                        outcome = _call(call)
+                except Exception as e:
+                    outcome = (False, e)
+                results.append(outcome)
+
+        commit_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._batches += 1
+            self._ops += len(batch)
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            self._commit_ms += commit_ms
+            self._max_commit_ms = max(self._max_commit_ms, commit_ms)
+            for _call_, _future, enqueued in batch:
+                wait_ms = (started - enqueued) * 1000
+                self._wait_ms += wait_ms
+                self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+
+        for (_call_, future, _enqueued), (ok, value) in zip(batch, results):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            batches = self._batches
+            ops = self._ops
+            return {
+                "window_ms": round(self.window_s * 1000, 3),
+                "max_batch": self.max_batch,
+                "batches": batches,
+                "ops": ops,
+                "mean_batch_size": round(ops / batches, 2) if batches else 0.0,
+                "max_batch_size": self._max_batch_seen,
+                "batch_fallbacks": self._batch_fallbacks,
+                "mean_commit_ms": round(self._commit_ms / batches, 3) if batches else 0.0,
+                "max_commit_ms": round(self._max_commit_ms, 3),
+                "mean_queue_wait_ms": round(self._wait_ms / ops, 3) if ops else 0.0,
+                "max_queue_wait_ms": round(self._max_wait_ms, 3),
+            }
+
+
+def _call(call: Callable[[], Any]) -> Tuple[bool, Any]:
+    try:
+        return True, call()
+    except Exception as e:
+        return False, e
+
+
+def group_commit(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Route a DatabaseManager write method through its GroupCommitWriter.
+
+    Runs the method directly when group commit is off, on the writer thread
+    itself, or while the caller has a connection open (nested calls).  The
+    caller's unit of work is released first: it must not hold SQLite locks
+    the writer thread waits for.
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        writer: Optional[GroupCommitWriter] = self._group_commit
+        if writer is None or writer.on_writer_thread:
+            return fn(self, *args, **kwargs)
+        unit = current_unit_of_work()
+        if unit is not None:
+            if unit.borrowed:
+                # Called from inside another method's open connection
+                return fn(self, *args, **kwargs)
+            unit.release()
+        try:
+            return writer.submit(fn, self, *args, **kwargs)
+        finally:
+            if unit is not None:
+                unit.wrote = True
+    return wrapper
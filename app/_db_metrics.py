@@ -0,0 +1,186 @@
+"""
+Per-statement DB latency metrics
+
+Execution time, fetch time, row counts, calls and SQLite lock waits for every
+statement that goes through CursorAdapter, keyed by the whitespace-normalised
+SQL text, plus read-routing counts per ``(target, reason)``.
+
+Each thread writes to its own shard (no locks on the hot path); a snapshot
+merges the shards of the current worker.  Latencies go into a fixed log-scale
+histogram, so p50/p95/p99 are estimated without storing samples.
+"""
+
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds in milliseconds: 0.01ms .. ~84s, ~19% apart
+_BUCKET_BOUNDS_MS: List[float] = [0.01 * (2 ** (i / 4)) for i in range(93)]
+_NUM_BUCKETS = len(_BUCKET_BOUNDS_MS) + 1  # last bucket is overflow
+
+# Longest statement text kept in snapshots
+_MAX_STATEMENT_CHARS = 300
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(sql: str) -> str:
+    """Collapse whitespace so the same literal SQL maps to one key."""
+    return " ".join(sql.split())
+
+
+class _StatementStats:
+    """Counters for one statement within one thread shard."""
+    __slots__ = ("calls", "rows", "exec_ms", "fetch_ms", "max_ms", "buckets",
+                 "lock_waits", "lock_retries", "lock_failures", "lock_wait_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.exec_ms = 0.0
+        self.fetch_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * _NUM_BUCKETS
+        self.lock_waits = 0
+        self.lock_retries = 0
+        self.lock_failures = 0
+        self.lock_wait_ms = 0.0
+
+
+_local = threading.local()
+_shards: List[Dict[str, _StatementStats]] = []  # list.append is atomic under the GIL
+_route_shards: List[Dict[Tuple[str, str], int]] = []
+
+
+def _shard() -> Dict[str, _StatementStats]:
+    shard = getattr(_local, "shard", None)
+    if shard is None:
+        shard = {}
+        _local.shard = shard
+        _shards.append(shard)
+    return shard
+
+
+def _stats_for(key: str) -> _StatementStats:
+    shard = _shard()
+    stats = shard.get(key)
+    if stats is None:
+        stats = shard[key] = _StatementStats()
+    return stats
+
+
+def record_execute(key: str, elapsed_ms: float, rowcount: int = 0) -> None:
+    """Record one execution of ``key`` (rowcount counts affected rows for writes)."""
+    stats = _stats_for(key)
+    stats.calls += 1
+    stats.exec_ms += elapsed_ms
+    stats.rows += rowcount
+    if elapsed_ms > stats.max_ms:
+        stats.max_ms = elapsed_ms
+    stats.buckets[bisect_left(_BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+
+
+def record_fetch(key: Optional[str], elapsed_ms: float, rows: int) -> None:
+    """Record time spent fetching ``rows`` rows for ``key``."""
+    if key is None:
+        return
+    stats = _stats_for(key)
+    stats.fetch_ms += elapsed_ms
+    stats.rows += rows
+
+
+def record_lock_wait(key: Optional[str], waited_ms: float, retries: int, failed: bool = False) -> None:
+    """Record a statement that hit "database is locked" and was retried."""
+    if key is None:
+        return
+    stats = _stats_for(key)
+    stats.lock_waits += 1
+    stats.lock_retries += retries
+    stats.lock_wait_ms += waited_ms
+    if failed:
+        stats.lock_failures += 1
+
+
+def record_route(target: str, reason: str) -> None:
+    """Count one read-only get_connection() routed to ``target`` for ``reason``."""
+    routes = getattr(_local, "routes", None)
+    if routes is None:
+        routes = _local.routes = {}
+        _route_shards.append(routes)
+    key = (target, reason)
+    routes[key] = routes.get(key, 0) + 1
+
+
+def route_snapshot() -> Dict[str, Dict[str, int]]:
+    """Merged routing counts: ``{target: {reason: count}}``."""
+    merged: Dict[str, Dict[str, int]] = {}
+    for routes in list(_route_shards):
+        for (target, reason), count in list(routes.items()):
+            by_reason = merged.setdefault(target, {})
+            by_reason[reason] = by_reason.get(reason, 0) + count
+    return merged
+
+
+def _percentile(buckets: List[int], total: int, pct: float) -> float:
+    """Estimate a percentile (ms) as the upper bound of the matching bucket."""
+    if not total:
+        return 0.0
+    target = total * pct
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= target:
+            return _BUCKET_BOUNDS_MS[i] if i < len(_BUCKET_BOUNDS_MS) else _BUCKET_BOUNDS_MS[-1]
+    return _BUCKET_BOUNDS_MS[-1]
+
+
+def snapshot(limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+    """Merge all shards and return statements ordered by total time (desc)."""
+    merged: Dict[str, _StatementStats] = {}
+    for shard in list(_shards):
+        for key, stats in list(shard.items()):
+            m = merged.get(key)
+            if m is None:
+                m = merged[key] = _StatementStats()
+            m.calls += stats.calls
+            m.rows += stats.rows
+            m.exec_ms += stats.exec_ms
+            m.fetch_ms += stats.fetch_ms
+            m.max_ms = max(m.max_ms, stats.max_ms)
+            m.buckets = [a + b for a, b in zip(m.buckets, stats.buckets)]
+            m.lock_waits += stats.lock_waits
+            m.lock_retries += stats.lock_retries
+            m.lock_failures += stats.lock_failures
+            m.lock_wait_ms += stats.lock_wait_ms
+
+    report = []
+    for key, m in merged.items():
+        total_ms = m.exec_ms + m.fetch_ms
+        report.append({
+            "statement": key[:_MAX_STATEMENT_CHARS],
+            "calls": m.calls,
+            "total_ms": round(total_ms, 3),
+            "exec_ms": round(m.exec_ms, 3),
+            "fetch_ms": round(m.fetch_ms, 3),
+            "mean_ms": round(total_ms / m.calls, 3) if m.calls else 0.0,
+            "p50_ms": round(_percentile(m.buckets, m.calls, 0.50), 3),
+            "p95_ms": round(_percentile(m.buckets, m.calls, 0.95), 3),
+            "p99_ms": round(_percentile(m.buckets, m.calls, 0.99), 3),
+            "max_ms": round(m.max_ms, 3),
+            "rows": m.rows,
+            "rows_per_call": round(m.rows / m.calls, 2) if m.calls else 0.0,
+            "lock_waits": m.lock_waits,
+            "lock_retries": m.lock_retries,
+            "lock_failures": m.lock_failures,
+            "lock_wait_ms": round(m.lock_wait_ms, 3),
+        })
+    report.sort(key=lambda r: r["total_ms"], reverse=True)
+    return report[:limit] if limit else report
+
+
+def reset() -> None:
+    """Clear all recorded statistics for this worker."""
+    for shard in list(_shards):
+        shard.clear()
+    for routes in list(_route_shards):
+        routes.clear()
@@ -0,0 +1,199 @@
+"""
+Connection pool sizing and telemetry
+
+Pool sizes used to be hard-coded (PostgreSQL: 5 + 15 overflow per engine),
+so every extra gunicorn worker added 20 possible server connections and
+scaling WORKERS could exhaust the server's ``max_connections``.
+
+``pool_limits()`` derives each engine's pool from:
+
+- the threads that can hold a connection at once in one worker:
+  DB_EXECUTOR_WORKERS steady, plus AI_EXECUTOR_WORKERS and background jobs
+  (group-commit writer, maintenance) as overflow
+- DB_MAX_CONNECTIONS, the server connections this instance may use across
+  all WORKERS and every engine that talks to the same server
+
+DB_POOL_SIZE / DB_POOL_MAX_OVERFLOW override the computed values.
+
+Pools are built as ``TimedQueuePool`` (or the asyncio variant), which counts
+checkouts, time spent waiting for a connection and pool timeouts per worker.
+Instead of ``pool_pre_ping`` on every checkout, ``install_idle_pre_ping``
+pings a connection only when it sat in the pool longer than
+DB_POOL_PRE_PING_IDLE_SECONDS; a failed ping makes the pool replace it.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from settings import settings
+
+# Threads outside the executors that may hold a connection (group-commit
+# writer, SQLite maintenance / backup jobs)
+BACKGROUND_CONNECTIONS = 2
+
+
+def pool_limits(engines_per_worker: int = 1, is_sqlite: bool = False) -> Tuple[int, int]:
+    """Return ``(pool_size, max_overflow)`` for one engine in one worker.
+
+    ``engines_per_worker`` is the number of pools in each worker that connect
+    to the same server (sync + async engine), which share the budget.  SQLite
+    has no server connection limit, so only the thread count applies.
+    """
+    steady = max(settings.DB_EXECUTOR_WORKERS, 1)
+    burst = settings.AI_EXECUTOR_WORKERS + BACKGROUND_CONNECTIONS
+    pool_size, max_overflow = steady, burst
+
+    if not is_sqlite and settings.DB_MAX_CONNECTIONS > 0:
+        per_pool = settings.DB_MAX_CONNECTIONS // (max(settings.WORKERS, 1) * max(engines_per_worker, 1))
+        if per_pool < 1:
+            print(f"⚠️  DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS} is below one connection "
+                  f"per pool for {settings.WORKERS} worker(s) -- using 1")
+            per_pool = 1
+        pool_size = min(pool_size, per_pool)
+        max_overflow = min(max_overflow, per_pool - pool_size)
+
+    if settings.DB_POOL_SIZE > 0:
+        pool_size = settings.DB_POOL_SIZE
+    if settings.DB_POOL_MAX_OVERFLOW >= 0:
+        max_overflow = settings.DB_POOL_MAX_OVERFLOW
+    return pool_size, max_overflow
+
+
+# ── telemetry ─────────────────────────────────────────────────
+# A checkout slower than this had to wait for a connection (or open one)
+SLOW_CHECKOUT_MS = 10.0
+
+
+class _PoolCounters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.slow_checkouts = 0  # waited more than SLOW_CHECKOUT_MS
+        self.pings = 0
+        self.ping_failures = 0
+
+    def record_checkout(self, wait_ms: float) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            if wait_ms >= SLOW_CHECKOUT_MS:
+                self.slow_checkouts += 1
+
+
+_pools: Dict[str, Any] = {}
+
+
+class _TimedPoolMixin:
+    """Times ``connect()`` (the checkout) and counts pool timeouts."""
+
+    def _counters(self) -> _PoolCounters:
+        counters = getattr(self, "_vce_counters", None)
+        if counters is None:
+            counters = self._vce_counters = _PoolCounters()
+        return counters
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            counters = self._counters()
+            with counters.lock:
+                counters.timeouts += 1
+            raise
+        self._counters().record_checkout((time.perf_counter() - started) * 1000)
+        return conn
+
+    def recreate(self):
+        # dispose() swaps in a new pool; keep reporting under the same name
+        new_pool = super().recreate()
+        new_pool._vce_counters = self._counters()
+        for name, pool in list(_pools.items()):
+            if pool is self:
+                _pools[name] = new_pool
+        return new_pool
+
+    def telemetry(self) -> Dict[str, Any]:
+        counters = self._counters()
+        with counters.lock:
+            checkouts = counters.checkouts
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": checkouts,
+                "timeouts": counters.timeouts,
+                "slow_checkouts": counters.slow_checkouts,
+                "mean_wait_ms": round(counters.wait_ms / checkouts, 3) if checkouts else 0.0,
+                "max_wait_ms": round(counters.max_wait_ms, 3),
+                "idle_pings": counters.pings,
+                "idle_ping_failures": counters.ping_failures,
+            }
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def register_pool(name: str, engine) -> None:
+    """Report ``engine``'s pool as ``name`` in pool_stats()."""
+    pool = engine.pool
+    if isinstance(pool, _TimedPoolMixin):
+        _pools[name] = pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Live pool state and checkout counters (this worker process only)."""
+    return {name: pool.telemetry() for name, pool in _pools.items()}
+
+
+# ── idle pre-ping ─────────────────────────────────────────────
+def install_idle_pre_ping(engine, ping_sql: str = "SELECT 1") -> None:
+    """Ping connections on checkout only if they were idle for a while.
+
+    Replaces ``pool_pre_ping``, which costs a round trip on every checkout.
+    A connection that fails the ping is discarded and the pool retries the
+    checkout with a fresh one.
+    """
+    idle_seconds = settings.DB_POOL_PRE_PING_IDLE_SECONDS
+
+    @event.listens_for(engine, "checkin")
+    def _note_checkin(dbapi_conn, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_conn, connection_record, connection_proxy):
+        checked_in_at: Optional[float] = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        pool = engine.pool
+        counters = pool._counters() if isinstance(pool, _TimedPoolMixin) else None
+        try:
+            cursor = dbapi_conn.cursor()
+            try:
+                cursor.execute(ping_sql)
+            finally:
+                cursor.close()
+        except Exception as e:
+            if counters is not None:
+                with counters.lock:
+                    counters.pings += 1
+                    counters.ping_failures += 1
+            raise exc.DisconnectionError(f"idle connection failed pre-ping: {e}") from e
+        if counters is not None:
+            with counters.lock:
+                counters.pings += 1
@@ -0,0 +1,560 @@
+"""
+Precompiled SQLAlchemy Core statements for the hot query set
+
+The hottest DatabaseManager / AsyncDatabaseManager queries (session
+validation, the word list, reviews, likes and the AI-session queries) used to
+be SQLite-flavoured strings that the adapter rewrote for PostgreSQL with
+regexes (``julianday``, ``COLLATE NOCASE``, ``= 1`` on booleans).  They are
+built once here as Core statements with named bound parameters instead, so:
+
+- no placeholder or dialect translation happens per call
+- each dialect renders its native SQL (see ``nocase`` / ``days_since``)
+- SQLAlchemy's compiled cache, and the driver's prepared-statement cache,
+  see one stable statement object
+
+The tables are untyped mirrors of the ORM models (``table()`` /
+``column()``), so rows come back exactly as from the literal SQL they
+replace: no DateTime parsing or Boolean coercion on SQLite.
+
+CursorAdapter.execute() accepts these statements with a dict of parameters.
+An UPDATE cannot bind a name that is also one of its table's columns, so
+the owning user is ``owner_id`` and new column values are ``new_<column>``.
+"""
+
+from functools import lru_cache
+
+from sqlalchemy import (
+    Select, bindparam, case, cast, column, delete, false, func, insert, literal_column, or_, select,
+    table, true, tuple_, update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Double, Float
+
+from models import (
+    AiLearningSesssionModel,
+    AiLearningSessionWordModel,
+    BaseVocabularyModel,
+    UserModel,
+    UserSessionModel,
+    VocabularyModel,
+    WordLikeModel,
+)
+
+
+def _untyped(model) -> "table":
+    """``table()`` with the model's columns, without their result types."""
+    return table(model.__tablename__, *(column(c.name) for c in model.__table__.columns))
+
+
+users = _untyped(UserModel)
+user_sessions = _untyped(UserSessionModel)
+vocabulary = _untyped(VocabularyModel)
+base_vocabulary = _untyped(BaseVocabularyModel)
+word_likes = _untyped(WordLikeModel)
+ai_sessions = _untyped(AiLearningSesssionModel)
+ai_session_words = _untyped(AiLearningSessionWordModel)
+
+
+# ── dialect-native expressions ────────────────────────────────
+class nocase(ColumnElement):
+    """Case-insensitive sort key: ``COLLATE NOCASE`` on SQLite.
+
+    PostgreSQL sorts the plain column, which idx_vocab_word serves.
+    """
+    inherit_cache = True
+
+    def __init__(self, col):
+        self.col = col
+
+
+@compiles(nocase)
+def _nocase_default(element, compiler, **kw):
+    return compiler.process(element.col, **kw)
+
+
+@compiles(nocase, "sqlite")
+def _nocase_sqlite(element, compiler, **kw):
+    return f"{compiler.process(element.col, **kw)} COLLATE NOCASE"
+
+
+class days_since(FunctionElement):
+    """Fractional days between a timestamp column and now."""
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(days_since)
+def _days_since_default(element, compiler, **kw):
+    return f"EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - {compiler.process(element.clauses, **kw)})) / 86400.0"
+
+
+@compiles(days_since, "sqlite")
+def _days_since_sqlite(element, compiler, **kw):
+    return f"julianday('now') - julianday({compiler.process(element.clauses, **kw)})"
+
+
+class days_ago(FunctionElement):
+    """The timestamp a number of days before now, computed by the database.
+
+    ``col >= days_ago(n)`` can use an index on ``col``, unlike
+    ``days_since(col) <= n``.
+    """
+    inherit_cache = True
+
+
+@compiles(days_ago)
+def _days_ago_default(element, compiler, **kw):
+    return f"(CURRENT_TIMESTAMP - {compiler.process(element.clauses, **kw)} * INTERVAL '1 day')"
+
+
+@compiles(days_ago, "sqlite")
+def _days_ago_sqlite(element, compiler, **kw):
+    # Same text format as CURRENT_TIMESTAMP, so the comparison is by time
+    return f"datetime('now', '-' || {compiler.process(element.clauses, **kw)} || ' days')"
+
+
+# ── sessions ──────────────────────────────────────────────────
+VALIDATE_SESSION = (
+    select(
+        users.c.id, users.c.email, users.c.username, users.c.first_name, users.c.last_name,
+        users.c.profile_type, users.c.year_of_birth, users.c.class_year, users.c.created_at,
+        users.c.last_login, users.c.is_active, user_sessions.c.expires_at,
+    )
+    .select_from(user_sessions.join(users, user_sessions.c.user_id == users.c.id))
+    .where(user_sessions.c.session_token == bindparam("token"))
+    .where(user_sessions.c.expires_at > bindparam("now"))
+)
+
+
+# ── vocabulary version ────────────────────────────────────────
+VOCAB_VERSION = select(users.c.vocab_version).where(users.c.id == bindparam("owner_id"))
+
+BUMP_VOCAB_VERSION = (
+    update(users)
+    .where(users.c.id == bindparam("owner_id"))
+    .values(vocab_version=func.coalesce(users.c.vocab_version, 0) + 1)
+)
+
+
+# ── words ─────────────────────────────────────────────────────
+USER_WORDS = (
+    select(vocabulary)
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .order_by(nocase(vocabulary.c.word), vocabulary.c.id)
+)
+
+# ── word list pages ───────────────────────────────────────────
+# Keyset order: same as USER_WORDS, with id as the tie-breaker
+LIKE_ESCAPE = "!"
+_word_sort_key = nocase(vocabulary.c.word)
+
+
+def _user_words_filtered(stmt: Select, word_type: bool, include_hidden: bool) -> Select:
+    stmt = stmt.where(vocabulary.c.user_id == bindparam("owner_id"))
+    if word_type:
+        stmt = stmt.where(func.lower(vocabulary.c.word_type) == bindparam("word_type"))
+    if not include_hidden:
+        stmt = stmt.where(or_(vocabulary.c.is_hidden.is_(None), vocabulary.c.is_hidden == false()))
+    return stmt
+
+
+@lru_cache(maxsize=None)
+def user_words_page(search: bool, word_type: bool, include_hidden: bool,
+                    after: bool, limited: bool) -> Select:
+    """One page of a user's words; the flags pick the optional clauses.
+
+    Parameters: ``owner_id``, ``offset``, plus ``pattern`` (LIKE pattern
+    escaped with LIKE_ESCAPE), ``word_type`` (lower-cased), ``after_word`` /
+    ``after_id`` (last row of the previous page) and ``limit`` as enabled.
+    """
+    stmt = _user_words_filtered(select(vocabulary), word_type, include_hidden)
+    if search:
+        stmt = stmt.where(vocabulary.c.word.ilike(bindparam("pattern"), escape=LIKE_ESCAPE))
+    if after:
+        stmt = stmt.where(tuple_(_word_sort_key, vocabulary.c.id)
+                          > tuple_(bindparam("after_word"), bindparam("after_id")))
+    stmt = stmt.order_by(_word_sort_key, vocabulary.c.id).offset(bindparam("offset"))
+    if limited:
+        stmt = stmt.limit(bindparam("limit"))
+    return stmt
+
+
+# ── full-text search ──────────────────────────────────────────
+# SQLite: an external-content FTS5 table over vocabulary, kept in sync by the
+# triggers below (created by DatabaseManager.init_database).  PostgreSQL: a
+# GIN index on VOCABULARY_TSVECTOR (alembic 0006).  The query must repeat
+# the indexed expression verbatim, so it is inlined, never bound.
+VOCABULARY_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS vocabulary_fts USING fts5("
+    "word, definition, example, content='vocabulary', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+VOCABULARY_FTS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS vocabulary_fts_insert AFTER INSERT ON vocabulary
+    BEGIN
+        INSERT INTO vocabulary_fts(rowid, word, definition, example)
+        VALUES (NEW.id, NEW.word, NEW.definition, NEW.example);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS vocabulary_fts_delete AFTER DELETE ON vocabulary
+    BEGIN
+        INSERT INTO vocabulary_fts(vocabulary_fts, rowid, word, definition, example)
+        VALUES ('delete', OLD.id, OLD.word, OLD.definition, OLD.example);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS vocabulary_fts_update AFTER UPDATE OF word, definition, example ON vocabulary
+    BEGIN
+        INSERT INTO vocabulary_fts(vocabulary_fts, rowid, word, definition, example)
+        VALUES ('delete', OLD.id, OLD.word, OLD.definition, OLD.example);
+        INSERT INTO vocabulary_fts(rowid, word, definition, example)
+        VALUES (NEW.id, NEW.word, NEW.definition, NEW.example);
+    END""",
+)
+
+VOCABULARY_FTS_REBUILD = "INSERT INTO vocabulary_fts(vocabulary_fts) VALUES ('rebuild')"
+
+VOCABULARY_TSVECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(word, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(definition, '')), 'B')"
+    " || setweight(to_tsvector('simple', coalesce(example, '')), 'C'))"
+)
+
+vocabulary_fts = table("vocabulary_fts", column("rowid"))
+
+# Matches in the word count most, then the definition, then the example
+_FTS5_RANK = literal_column("bm25(vocabulary_fts, 10.0, 2.0, 1.0)")
+
+
+@lru_cache(maxsize=None)
+def ranked_user_words_page(is_sqlite: bool, word_type: bool, include_hidden: bool,
+                           after: bool, limited: bool) -> Select:
+    """user_words_page() for a full-text ``search``, best match first.
+
+    Rows carry ``search_rank`` (lower is better) and are keyset-paged on
+    ``(search_rank, id)``: parameters ``fts_query`` (see
+    database_manager.full_text_query), ``after_rank`` / ``after_id``, and
+    the others as in user_words_page().
+    """
+    if is_sqlite:
+        matches = (
+            select(vocabulary, _FTS5_RANK.label("search_rank"))
+            .select_from(vocabulary.join(vocabulary_fts, vocabulary_fts.c.rowid == vocabulary.c.id))
+            .where(literal_column("vocabulary_fts").op("MATCH")(bindparam("fts_query")))
+        )
+    else:
+        document = literal_column(VOCABULARY_TSVECTOR)
+        query = func.to_tsquery(literal_column("'simple'"), bindparam("fts_query"))
+        # float8: ts_rank's float4 would not round-trip through the cursor,
+        # so a tied rank would never compare equal to ``after_rank``
+        matches = (
+            select(vocabulary, cast(-func.ts_rank(document, query), Double()).label("search_rank"))
+            .where(document.op("@@")(query))
+        )
+    ranked = _user_words_filtered(matches, word_type, include_hidden).subquery("ranked")
+    stmt = select(ranked)
+    if after:
+        stmt = stmt.where(tuple_(ranked.c.search_rank, ranked.c.id)
+                          > tuple_(bindparam("after_rank", type_=Double()), bindparam("after_id")))
+    stmt = stmt.order_by(ranked.c.search_rank, ranked.c.id).offset(bindparam("offset"))
+    if limited:
+        stmt = stmt.limit(bindparam("limit"))
+    return stmt
+
+
+WORD_REVIEW_STATS = (
+    select(vocabulary.c.times_reviewed, vocabulary.c.times_correct, vocabulary.c.mastery_level)
+    .where(vocabulary.c.id == bindparam("word_id"))
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+)
+
+RECORD_WORD_REVIEW = (
+    update(vocabulary)
+    .where(vocabulary.c.id == bindparam("word_id"))
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .values(
+        times_reviewed=bindparam("new_times_reviewed"),
+        times_correct=bindparam("new_times_correct"),
+        mastery_level=bindparam("new_mastery_level"),
+        last_reviewed=func.current_timestamp(),
+    )
+)
+
+WORD_EXISTS = (
+    select(literal_column("1"))
+    .select_from(vocabulary)
+    .where(vocabulary.c.id == bindparam("word_id"))
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+)
+
+SET_WORD_DIFFICULTY = (
+    update(vocabulary)
+    .where(vocabulary.c.id == bindparam("word_id"))
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .values(difficulty=bindparam("new_difficulty"), updated_at=func.current_timestamp())
+)
+
+
+def _set_word_hidden(hidden):
+    return (
+        update(vocabulary)
+        .where(vocabulary.c.id == bindparam("word_id"))
+        .where(vocabulary.c.user_id == bindparam("owner_id"))
+        .values(is_hidden=hidden, updated_at=func.current_timestamp())
+    )
+
+
+HIDE_WORD = _set_word_hidden(true())
+UNHIDE_WORD = _set_word_hidden(false())
+
+
+# ── fuzzy search ──────────────────────────────────────────────
+# PostgreSQL: pg_trgm GIN indexes on lower(word) (alembic 0007) serve the
+# ``%`` similarity operator (threshold: pg_trgm.similarity_threshold, 0.3 by
+# default).  SQLite: _trigram_index picks the ids in memory and the rows are
+# then fetched by primary key.
+def _fuzzy(table_, *columns):
+    word = func.lower(table_.c.word)
+    score = func.similarity(word, bindparam("query")).label("similarity")
+    return (
+        select(*columns, score)
+        .where(word.op("%")(bindparam("query")))
+        .order_by(score.desc(), table_.c.id)
+        .limit(bindparam("limit"))
+    )
+
+
+_base_word_columns = (
+    base_vocabulary.c.id, base_vocabulary.c.word, base_vocabulary.c.word_type,
+    base_vocabulary.c.definition, base_vocabulary.c.example, base_vocabulary.c.difficulty,
+    base_vocabulary.c.category,
+)
+
+FUZZY_USER_WORDS = _fuzzy(vocabulary, vocabulary).where(vocabulary.c.user_id == bindparam("owner_id"))
+
+FUZZY_BASE_WORDS = _fuzzy(base_vocabulary, *_base_word_columns).where(base_vocabulary.c.is_active == true())
+
+USER_WORD_TEXTS = (
+    select(vocabulary.c.id, vocabulary.c.word)
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+)
+
+USER_WORDS_BY_ID = (
+    select(vocabulary)
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .where(vocabulary.c.id.in_(bindparam("word_ids", expanding=True)))
+)
+
+# Changes whenever a base word is added, deleted or updated through the ORM
+BASE_WORDS_FINGERPRINT = select(
+    func.count().label("words"),
+    func.max(base_vocabulary.c.id).label("max_id"),
+    func.max(base_vocabulary.c.updated_at).label("updated_at"),
+)
+
+BASE_WORD_TEXTS = select(base_vocabulary.c.id, base_vocabulary.c.word)
+
+BASE_WORDS_BY_ID = (
+    select(*_base_word_columns)
+    .where(base_vocabulary.c.is_active == true())
+    .where(base_vocabulary.c.id.in_(bindparam("word_ids", expanding=True)))
+)
+
+
+# ── likes ─────────────────────────────────────────────────────
+def _like_word(insert_fn):
+    # Only if the word belongs to the user; an existing like is left alone
+    return (
+        insert_fn(word_likes)
+        .from_select(
+            ["user_id", "word_id"],
+            select(vocabulary.c.user_id, vocabulary.c.id)
+            .where(vocabulary.c.id == bindparam("word_id"))
+            .where(vocabulary.c.user_id == bindparam("owner_id")),
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "word_id"])
+    )
+
+
+# ON CONFLICT is dialect-specific DML: index by ``is_sqlite``
+LIKE_WORD = {True: _like_word(sqlite_insert), False: _like_word(pg_insert)}
+
+INCREMENT_WORD_LIKES = (
+    update(vocabulary)
+    .where(vocabulary.c.id == bindparam("word_id"))
+    .values(like_count=vocabulary.c.like_count + 1)
+    .returning(vocabulary.c.base_word_id)
+)
+
+INCREMENT_BASE_WORD_LIKES = (
+    update(base_vocabulary)
+    .where(base_vocabulary.c.id == bindparam("base_word_id"))
+    .values(total_likes=base_vocabulary.c.total_likes + 1)
+)
+
+UNLIKE_WORD = (
+    delete(word_likes)
+    .where(word_likes.c.user_id == bindparam("owner_id"))
+    .where(word_likes.c.word_id == bindparam("word_id"))
+)
+
+DECREMENT_WORD_LIKES = (
+    update(vocabulary)
+    .where(vocabulary.c.id == bindparam("word_id"))
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .values(like_count=case(
+        (vocabulary.c.like_count > 0, vocabulary.c.like_count - 1), else_=0))
+    .returning(vocabulary.c.base_word_id)
+)
+
+DECREMENT_BASE_WORD_LIKES = (
+    update(base_vocabulary)
+    .where(base_vocabulary.c.id == bindparam("base_word_id"))
+    .values(total_likes=case(
+        (base_vocabulary.c.total_likes > 0, base_vocabulary.c.total_likes - 1), else_=0))
+)
+
+
+# ── AI learning sessions ──────────────────────────────────────
+# RETURNING instead of lastrowid: asyncpg / psycopg have no lastrowid
+CREATE_AI_SESSION = insert(ai_sessions).returning(ai_sessions.c.id)
+
+GET_AI_SESSION = select(ai_sessions).where(ai_sessions.c.id == bindparam("session_id"))
+
+AI_SESSION_USER = select(ai_sessions.c.user_id).where(ai_sessions.c.id == bindparam("session_id"))
+
+UPDATE_AI_SESSION_PROGRESS = (
+    update(ai_sessions)
+    .where(ai_sessions.c.id == bindparam("session_id"))
+    .values(
+        words_completed=bindparam("new_words_completed"),
+        words_correct=bindparam("new_words_correct"),
+        current_difficulty=bindparam("new_difficulty"),
+    )
+)
+
+COMPLETE_AI_SESSION = (
+    update(ai_sessions)
+    .where(ai_sessions.c.id == bindparam("session_id"))
+    .values(
+        is_completed=true(),
+        session_ended_at=func.current_timestamp(),
+        total_time_seconds=bindparam("new_total_time_seconds"),
+    )
+)
+
+ADD_AI_SESSION_WORD = insert(ai_session_words)
+
+RECORD_AI_SESSION_RESPONSE = (
+    update(ai_session_words)
+    .where(ai_session_words.c.session_id == bindparam("ai_session_id"))
+    .where(ai_session_words.c.word_text == bindparam("response_word_text"))
+    .values(
+        user_response=bindparam("new_user_response"),
+        is_correct=bindparam("new_is_correct"),
+        response_time_ms=bindparam("new_response_time_ms"),
+    )
+)
+
+AI_RESPONSE_WORD_STATS = (
+    select(vocabulary.c.id, vocabulary.c.times_reviewed, vocabulary.c.times_correct,
+           vocabulary.c.mastery_level)
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .where(func.lower(vocabulary.c.word) == func.lower(bindparam("word_text")))
+)
+
+# s.* with the per-word SUM in place of the stored words_correct column
+AI_SESSION_SUMMARY = (
+    select(
+        *(
+            func.sum(case((ai_session_words.c.is_correct == true(), 1), else_=0)).label("words_correct")
+            if c.name == "words_correct" else c
+            for c in ai_sessions.c
+        ),
+        func.count(ai_session_words.c.id).label("total_words_attempted"),
+        func.avg(ai_session_words.c.response_time_ms).label("avg_response_time"),
+    )
+    .select_from(ai_sessions.outerjoin(
+        ai_session_words, ai_sessions.c.id == ai_session_words.c.session_id))
+    .where(ai_sessions.c.id == bindparam("session_id"))
+    .group_by(ai_sessions.c.id)
+)
+
+AI_SESSION_WORDS_BREAKDOWN = (
+    select(ai_session_words.c.word_text, ai_session_words.c.difficulty_level,
+           ai_session_words.c.is_correct, ai_session_words.c.user_response,
+           ai_session_words.c.response_time_ms)
+    .where(ai_session_words.c.session_id == bindparam("session_id"))
+    .order_by(ai_session_words.c.word_order)
+)
+
+
+# ── AI word selection ─────────────────────────────────────────
+USER_WORD_COUNT = (
+    select(func.count().label("count"))
+    .select_from(vocabulary)
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+)
+
+USER_DIFFICULTIES = (
+    select(vocabulary.c.difficulty)
+    .distinct()
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+)
+
+_not_mastered = vocabulary.c.mastery_level < 3
+
+USER_UNMASTERED_COUNT = USER_WORD_COUNT.where(_not_mastered)
+
+_random_words = (
+    select(vocabulary)
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .order_by(func.random())
+    .limit(bindparam("limit"))
+)
+_at_difficulty = vocabulary.c.difficulty == bindparam("difficulty")
+
+# (exclude_mastered_words, at requested difficulty) -> statement
+AI_LEARNING_WORDS = {
+    (True, True): _random_words.where(_at_difficulty, _not_mastered),
+    (False, True): _random_words.where(_at_difficulty),
+    (True, False): _random_words.where(_not_mastered),
+    (False, False): _random_words,
+}
+
+_accuracy = (vocabulary.c.times_correct * literal_column("1.0")).op("/")(func.nullif(vocabulary.c.times_reviewed, 0))
+_days_since_review = days_since(vocabulary.c.last_reviewed)
+
+SMART_AI_LEARNING_WORDS = (
+    select(
+        vocabulary,
+        _accuracy.label("accuracy"),
+        func.coalesce(_days_since_review, 999).label("days_since_review"),
+        case(
+            (vocabulary.c.times_reviewed == 0, 1),                                  # new words first
+            ((_accuracy < 0.6) & (vocabulary.c.times_reviewed >= 2), 2),            # struggling words
+            (_days_since_review > 7, 3),                                            # not seen in a week
+            (vocabulary.c.mastery_level < 2, 4),                                    # still learning
+            else_=5,
+        ).label("priority"),
+    )
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .where(_not_mastered)  # fully mastered words are excluded
+    .where((vocabulary.c.difficulty == bindparam("difficulty")) | (vocabulary.c.difficulty == ""))
+    .order_by(literal_column("priority"), func.random())
+    .limit(bindparam("limit"))
+)
+
+RECENT_WORDS = (
+    select(
+        vocabulary,
+        _days_since_review.label("days_ago"),
+        func.round(_accuracy * 100, 1).label("accuracy_percent"),
+    )
+    .where(vocabulary.c.user_id == bindparam("owner_id"))
+    .where(vocabulary.c.last_reviewed >= days_ago(bindparam("days", type_=Float())))
+    .order_by(vocabulary.c.last_reviewed.desc())
+    .limit(50)
+)
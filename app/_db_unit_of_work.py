@@ -0,0 +1,299 @@
+"""
+Request-scoped unit of work
+
+While a unit of work is active in the current context (see ``unit_of_work``),
+every ``DatabaseManager.get_connection()`` call borrows the unit's single
+pooled connection instead of opening a new ``SessionLocal()``.  A request that
+calls five DatabaseManager methods therefore costs one pool checkout, one
+pre-ping and one COMMIT instead of five of each.
+
+Borrowed connections keep the sqlite3-style contract the method bodies rely on:
+- ``commit()`` is deferred to the end of the unit
+- leaving a ``with`` block on an exception, ``rollback()``, or ``close()``
+  without a commit only undoes that method's own statements
+
+Partial undo uses a SAVEPOINT per borrow.  On PostgreSQL one is always taken,
+because any failed statement aborts the whole transaction.  On SQLite one is
+only taken once the unit holds uncommitted writes; before that a plain
+rollback loses nothing from earlier borrows.
+
+A unit whose request hit its deadline rolls back, even if the method that
+saw DeadlineExceeded caught it (see _db_deadline).
+
+The unit also remembers whether the request wrote anything (and for which
+user) so read-only calls can be kept on the primary instead of a lagging
+read replica; see ``recently_wrote``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from _db_adapter import PENDING_WRITES, ConnectionAdapter, commit_session
+from _db_deadline import raise_if_exceeded
+from settings import settings
+
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar("db_unit_of_work", default=None)
+
+# user_id -> time.monotonic() of that user's last committed unit with writes,
+# oldest first
+_last_write_at: "OrderedDict[int, float]" = OrderedDict()
+_last_write_lock = threading.Lock()
+_LAST_WRITE_MAX_USERS = 10000
+
+
+class UnitOfWork:
+    """One lazily checked-out connection shared by all borrows in a context."""
+
+    def __init__(self, engine: Engine, is_sqlite: bool):
+        self._engine = engine
+        self.is_sqlite = is_sqlite
+        self._connection: Optional[Connection] = None
+        self._session: Optional[Session] = None
+        self._borrowed = 0
+        self._savepoint_seq = 0
+        self.closed = False
+        self.user_id: Optional[int] = None  # set once the request is authenticated
+        self.wrote = False  # any writes committed (or handed to another engine)
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            self._connection = self._engine.connect()
+            self._session = Session(bind=self._connection, expire_on_commit=False)
+        return self._session
+
+    @property
+    def borrowed(self) -> bool:
+        """True while a borrowed connection is still open."""
+        return self._borrowed > 0
+
+    @property
+    def pending_writes(self) -> int:
+        return self._session.info.get(PENDING_WRITES, 0) if self._session else 0
+
+    def connection(self) -> "UnitConnectionAdapter":
+        """Borrow the shared connection for one DatabaseManager call."""
+        return UnitConnectionAdapter(self)
+
+    def _next_savepoint(self) -> str:
+        self._savepoint_seq += 1
+        return f"uow_sp_{self._savepoint_seq}"
+
+    # ── transaction control ───────────────────────────────────
+    def commit(self) -> None:
+        """Commit pending writes now; the connection stays checked out."""
+        if self._session is not None and self.pending_writes:
+            commit_session(self._session, self.is_sqlite)
+            self._session.info[PENDING_WRITES] = 0
+            self.wrote = True
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
+            self._session.info[PENDING_WRITES] = 0
+
+    def release(self) -> None:
+        """Commit pending writes and hand the connection back to the pool.
+
+        Call before slow non-DB work (e.g. an HTTP call to Azure OpenAI) so
+        the request neither holds SQLite's write lock nor a pooled connection
+        while it waits.  The next borrow checks out a connection again.
+        Does nothing while a borrowed connection is still open.
+        """
+        if self._session is None or self._borrowed:
+            return
+        self.commit()
+        self._close_session()
+
+    def close(self, commit: bool = True) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if self._session is not None:
+                try:
+                    if commit:
+                        self.commit()
+                    else:
+                        self.rollback()
+                finally:
+                    self._close_session()
+        finally:
+            if self.wrote and self.user_id is not None:
+                _note_user_write(self.user_id)
+
+    def _close_session(self) -> None:
+        self._session.close()
+        self._connection.close()
+        self._session = None
+        self._connection = None
+
+
+class UnitConnectionAdapter(ConnectionAdapter):
+    """ConnectionAdapter borrowed from a UnitOfWork (see module docstring)."""
+
+    def __init__(self, unit: UnitOfWork):
+        super().__init__(unit.session, unit.is_sqlite)
+        self._unit = unit
+        self._savepoint: Optional[str] = None
+        self._writes_at_commit = unit.pending_writes
+        self._closed = False
+        unit._borrowed += 1
+        self._open_savepoint()
+
+    def _open_savepoint(self) -> None:
+        if not self._is_sqlite or self._unit.pending_writes:
+            self._savepoint = self._unit._next_savepoint()
+            self._session.execute(text(f"SAVEPOINT {self._savepoint}"))
+
+    def _release_savepoint(self) -> None:
+        if self._savepoint is None:
+            return
+        name, self._savepoint = self._savepoint, None
+        try:
+            self._session.execute(text(f"RELEASE SAVEPOINT {name}"))
+        except DBAPIError:
+            # PostgreSQL: a failed statement left the transaction aborted
+            self._session.execute(text(f"ROLLBACK TO SAVEPOINT {name}"))
+            self._session.execute(text(f"RELEASE SAVEPOINT {name}"))
+
+    def _has_uncommitted(self) -> bool:
+        return self._unit.pending_writes > self._writes_at_commit
+
+    def commit(self):
+        """Keep this call's writes; the unit commits them when it ends."""
+        self._release_savepoint()
+        self._writes_at_commit = self._unit.pending_writes
+        self._open_savepoint()
+
+    def rollback(self):
+        """Undo this call's writes since its last commit()."""
+        if self._savepoint is not None:
+            self._session.execute(text(f"ROLLBACK TO SAVEPOINT {self._savepoint}"))
+            self._session.info[PENDING_WRITES] = self._writes_at_commit
+        else:
+            # No savepoint means the unit had no pending writes at borrow
+            # time, so everything pending belongs to this call
+            self._unit.rollback()
+            self._writes_at_commit = 0
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._has_uncommitted():
+                self.rollback()
+            self._release_savepoint()
+        finally:
+            self._unit._borrowed -= 1
+
+    # ── context manager ───────────────────────────────────────
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type:
+            try:
+                self.rollback()
+            except Exception:
+                pass
+        else:
+            self._writes_at_commit = self._unit.pending_writes
+        self.close()
+        return False
+
+
+def _note_user_write(user_id: int) -> None:
+    now = time.monotonic()
+    with _last_write_lock:
+        _last_write_at[user_id] = now
+        _last_write_at.move_to_end(user_id)
+        # Drop entries past the sticky window, then the oldest over the cap
+        while _last_write_at:
+            uid, at = next(iter(_last_write_at.items()))
+            if now - at < settings.DB_READ_STICKY_SECONDS and len(_last_write_at) <= _LAST_WRITE_MAX_USERS:
+                break
+            del _last_write_at[uid]
+
+
+def recently_wrote(user_id: int, window_seconds: float) -> bool:
+    """True if ``user_id`` committed writes in this process within the window."""
+    at = _last_write_at.get(user_id)
+    return at is not None and time.monotonic() - at < window_seconds
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """Return the open unit of work for this context, if any."""
+    unit = _current.get()
+    return unit if unit is not None and not unit.closed else None
+
+
+def release_unit_of_work() -> None:
+    """Release the current unit's connection before slow non-DB work."""
+    unit = current_unit_of_work()
+    if unit is not None:
+        unit.release()
+
+
+@contextmanager
+def unit_of_work(engine: Engine, is_sqlite: bool) -> Iterator[UnitOfWork]:
+    """Share one connection across all get_connection() calls in this block.
+
+    Commits once on normal exit and rolls back if the block raises.  Nested
+    use joins the outer unit.
+    """
+    outer = current_unit_of_work()
+    if outer is not None:
+        yield outer
+        return
+
+    unit = UnitOfWork(engine, is_sqlite)
+    token = _current.set(unit)
+    try:
+        yield unit
+        raise_if_exceeded()
+    except BaseException:
+        unit.close(commit=False)
+        raise
+    else:
+        unit.close(commit=True)
+    finally:
+        _current.reset(token)
+
+
+@asynccontextmanager
+async def async_unit_of_work(
+    engine: Engine,
+    is_sqlite: bool,
+    run_blocking: Callable[..., Awaitable[Any]],
+) -> AsyncIterator[UnitOfWork]:
+    """``unit_of_work`` for async callers such as the request middleware.
+
+    The final COMMIT (its fsync and any lock-retry backoff) or ROLLBACK and
+    the connection close go through ``run_blocking`` (e.g. ``run_db``)
+    instead of running on the event loop.
+    """
+    outer = current_unit_of_work()
+    if outer is not None:
+        yield outer
+        return
+
+    unit = UnitOfWork(engine, is_sqlite)
+    token = _current.set(unit)
+    try:
+        yield unit
+        raise_if_exceeded()
+    except BaseException:
+        await run_blocking(unit.close, commit=False)
+        raise
+    else:
+        await run_blocking(unit.close, commit=True)
+    finally:
+        _current.reset(token)
@@ -0,0 +1,129 @@
+"""
+Bounded executors for blocking work
+
+Routes are ``async def`` but DatabaseManager and the Azure OpenAI helpers are
+synchronous.  Calling them directly blocks the event loop, so a 60s AI
+request would freeze every other request on the worker.  All blocking calls
+go through one of two bounded thread pools instead:
+
+- ``run_db``: DatabaseManager / auth calls (short, latency sensitive)
+- ``run_ai``: Azure OpenAI requests and the DB work bundled with them
+
+Slow AI calls can only exhaust the AI pool, so flashcard reviews keep getting
+DB threads.  The caller's contextvars (e.g. the request's unit of work) are
+carried into the worker thread.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from settings import settings
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """A named fixed-size thread pool with queue-depth and latency counters."""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-exec")
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queued = 0
+        self._wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._run_ms = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Calls submitted but not yet picked up by a worker thread."""
+        return self._submitted - self._started
+
+    @property
+    def active(self) -> int:
+        return self._started - self._completed
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on this pool and await the result."""
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        enqueued = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self._max_queued = max(self._max_queued, self.queued)
+
+        def call():
+            started = time.perf_counter()
+            wait_ms = (started - enqueued) * 1000
+            with self._lock:
+                self._started += 1
+                self._wait_ms += wait_ms
+                self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+            ok = False
+            try:
+                result = ctx.run(fn, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._completed += 1
+                    if not ok:
+                        self._failed += 1
+                    self._run_ms += (time.perf_counter() - started) * 1000
+
+        future = loop.run_in_executor(self._pool, call)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The thread cannot be interrupted; let it finish before the
+            # request (and its unit of work) is torn down underneath it
+            await asyncio.wait({future})
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            started = self._started
+            return {
+                "max_workers": self.max_workers,
+                "active": self.active,
+                "queued": self.queued,
+                "max_queued": self._max_queued,
+                "submitted": self._submitted,
+                "completed": completed,
+                "failed": self._failed,
+                "mean_wait_ms": round(self._wait_ms / started, 3) if started else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 3),
+                "mean_run_ms": round(self._run_ms / completed, 3) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+db_executor = BoundedExecutor("db", settings.DB_EXECUTOR_WORKERS)
+ai_executor = BoundedExecutor("ai", settings.AI_EXECUTOR_WORKERS)
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database call on the DB pool."""
+    return await db_executor.run(fn, *args, **kwargs)
+
+
+async def run_ai(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Azure OpenAI call on the AI pool."""
+    return await ai_executor.run(fn, *args, **kwargs)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for both pools (this worker process only)."""
+    return {"db": db_executor.stats(), "ai": ai_executor.stats()}
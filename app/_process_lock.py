@@ -0,0 +1,42 @@
+"""
+Cross-process leader lock
+
+Background jobs that must run in only one gunicorn worker (SQLite backups,
+planner maintenance, WAL checkpoints) elect a leader with a non-blocking
+``flock`` on a lock file next to the database.  The lock is released when the
+process exits, so another worker takes over on its next attempt.
+"""
+
+import fcntl
+from typing import Optional, TextIO
+
+
+class ProcessLeaderLock:
+    """Non-blocking exclusive flock held for the lifetime of the leader."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[TextIO] = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """Become leader if no other process is; True while held."""
+        if self._file is not None:
+            return True
+        lock_file = open(self.path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
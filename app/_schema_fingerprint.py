@@ -0,0 +1,66 @@
+"""
+Schema fingerprint for fast startup
+
+DatabaseManager.__init__ used to run create_all (which reflects every
+table), recreate the SQLite triggers, run the PRAGMA column checks in
+update_schema_if_needed and count rows on every container start.
+
+The fingerprint is a hash of the DDL the ORM models compile to on this
+dialect plus ``DatabaseManager.SCHEMA_REVISION`` (bumped whenever
+init_database / update_schema_if_needed change).  After a successful init
+it is stored in the one-row ``schema_fingerprint`` table; a later start that
+reads back the same value skips the whole init.  Deleting the row forces the
+full init on the next start.
+
+The table is created outside the ORM metadata (and ignored by Alembic) so
+it does not change the fingerprint it stores.
+"""
+
+import hashlib
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from models import Base
+
+FINGERPRINT_TABLE = "schema_fingerprint"
+
+
+def schema_fingerprint(engine: Engine, revision: int) -> str:
+    """Hash of the models' DDL for ``engine``'s dialect and ``revision``."""
+    digest = hashlib.sha256(f"{engine.dialect.name}:{revision}".encode())
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode())
+        for index in sorted(table.indexes, key=lambda ix: ix.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode())
+    return digest.hexdigest()
+
+
+def stored_schema_fingerprint(engine: Engine) -> Optional[str]:
+    """The fingerprint saved by the last full init (None if there is none)."""
+    try:
+        with engine.connect() as conn:
+            return conn.exec_driver_sql(
+                f"SELECT fingerprint FROM {FINGERPRINT_TABLE} WHERE id = 1"
+            ).scalar()
+    except Exception:
+        return None  # fresh database: table does not exist yet
+
+
+def store_schema_fingerprint(engine: Engine, fingerprint: str) -> None:
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} ("
+            "id INTEGER PRIMARY KEY, fingerprint VARCHAR(64) NOT NULL, "
+            "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.execute(
+            text(
+                f"INSERT INTO {FINGERPRINT_TABLE} (id, fingerprint) VALUES (1, :fingerprint) "
+                "ON CONFLICT (id) DO UPDATE SET fingerprint = EXCLUDED.fingerprint, "
+                "updated_at = CURRENT_TIMESTAMP"
+            ),
+            {"fingerprint": fingerprint},
+        )
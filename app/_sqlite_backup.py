@@ -0,0 +1,265 @@
+"""
+Local-disk SQLite with online backups to a durable share
+
+On Azure File Shares (CIFS) SQLite cannot use WAL, so the live database falls
+back to ``journal_mode=DELETE`` + ``synchronous=FULL`` and every write pays
+SMB lock and fsync latency.  With SQLITE_BACKUP_PATH set, DATABASE_URL points
+at a file on local (ephemeral) disk running in WAL mode instead, and:
+
+- on startup, if the local file does not exist yet (fresh container), it is
+  restored from the snapshot at SQLITE_BACKUP_PATH
+- every SQLITE_BACKUP_INTERVAL_SECONDS one process copies a consistent
+  snapshot to the share with the sqlite3 online backup API (skipped when
+  nothing was committed since the last one)
+- on shutdown, once every worker has stopped, the gunicorn master takes a
+  final snapshot (``backup_on_exit``, wired up in gunicorn.conf.py); the
+  leader's own final snapshot only covers a single-process uvicorn run,
+  since other workers may still be committing when it stops
+
+Snapshots are written to a local temp file first, copied to the share next to
+the target, fsynced and renamed over it, so the share always holds a complete
+database.  Up to SQLITE_BACKUP_INTERVAL_SECONDS of commits are lost if the
+container dies without a clean shutdown (OOM kill, SIGKILL after the grace
+period, host failure), because the local disk does not survive it.
+
+A ``flock`` on ``<local db>.backup.lock`` elects the process that takes
+backups (gunicorn workers all start a scheduler; one wins, the others retry
+each interval and take over if it exits).  Restore is serialised by its own
+``<local db>.restore.lock``: a worker that starts while the leader holds the
+backup lock (e.g. one respawned by gunicorn) must not wait for it.
+"""
+
+import fcntl
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from _process_lock import ProcessLeaderLock
+from settings import settings
+
+# How long backup_on_exit waits for a (hung) worker to give up the backup lock
+EXIT_LOCK_WAIT_SECONDS = 10.0
+EXIT_LOCK_POLL_SECONDS = 0.1
+
+
+def local_db_path() -> str:
+    return os.path.abspath(settings.db_path)
+
+
+def backup_enabled() -> bool:
+    return bool(settings.SQLITE_BACKUP_PATH) and settings.DATABASE_URL.startswith("sqlite")
+
+
+def _lock_path() -> str:
+    return local_db_path() + ".backup.lock"
+
+
+def _restore_lock_path() -> str:
+    return local_db_path() + ".restore.lock"
+
+
+def _fsync_file(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _check_integrity(path: str) -> Optional[str]:
+    """Return None if ``path`` is a readable SQLite database, else the problem."""
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            result = conn.execute("PRAGMA quick_check").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return str(e)
+    return None if result == "ok" else result
+
+
+def restore_if_needed() -> bool:
+    """Restore the local database from SQLITE_BACKUP_PATH if it is missing.
+
+    Called before the engine opens the database.  Returns True if a snapshot
+    was restored.  A missing or unreadable snapshot leaves the local path
+    alone so the usual init creates a fresh database.
+    """
+    if not backup_enabled():
+        return False
+    local = local_db_path()
+    if os.path.exists(local):
+        return False
+    snapshot = os.path.abspath(settings.SQLITE_BACKUP_PATH)
+    os.makedirs(os.path.dirname(local), exist_ok=True)
+
+    with open(_restore_lock_path(), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(local) or not os.path.exists(snapshot):
+                return False
+            started = time.perf_counter()
+            tmp = local + ".restore"
+            shutil.copyfile(snapshot, tmp)
+            problem = _check_integrity(tmp)
+            if problem:
+                os.remove(tmp)
+                print(f"⚠️  SQLite snapshot {snapshot} is unusable ({problem}) -- starting with a new database")
+                return False
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(local + suffix):
+                    os.remove(local + suffix)
+            os.replace(tmp, local)
+            print(f"✅ Restored SQLite database from {snapshot} "
+                  f"({os.path.getsize(local)} bytes, {(time.perf_counter() - started) * 1000:.0f}ms)")
+            return True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class SQLiteBackupScheduler:
+    """Background thread copying the live database to SQLITE_BACKUP_PATH."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval = max(interval_seconds, 1.0)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._leader = ProcessLeaderLock(_lock_path())
+        self._source: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._stats_lock = threading.Lock()
+        self._backups = 0
+        self._skipped = 0
+        self._failures = 0
+        self._last_backup_at: Optional[str] = None
+        self._last_duration_ms = 0.0
+        self._last_size_bytes = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader.held
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="sqlite-backup", daemon=True)
+        self._thread.start()
+
+    def stop(self, final_backup: bool = True) -> None:
+        """Stop the thread; the leader takes one last snapshot first."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 30)
+            self._thread = None
+        if final_backup and self.is_leader:
+            self.backup_now(force=True)
+        self._release()
+
+    def _release(self) -> None:
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+        self._leader.release()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self._leader.try_acquire():
+                self.backup_now()
+
+    # ── backup ────────────────────────────────────────────────
+    def _changed(self) -> bool:
+        """True if anything was committed since the previous snapshot."""
+        if self._source is None:
+            self._source = sqlite3.connect(local_db_path(), check_same_thread=False)
+        version = self._source.execute("PRAGMA data_version").fetchone()[0]
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+
+    def backup_now(self, force: bool = False) -> bool:
+        """Snapshot the live database to the share; returns True if written."""
+        snapshot = os.path.abspath(settings.SQLITE_BACKUP_PATH)
+        try:
+            if not self._changed() and not force and os.path.exists(snapshot):
+                with self._stats_lock:
+                    self._skipped += 1
+                return False
+
+            started = time.perf_counter()
+            local_tmp = local_db_path() + ".snapshot"
+            dest = sqlite3.connect(local_tmp)
+            try:
+                # One step: a single read transaction, which in WAL mode does
+                # not block writers
+                self._source.backup(dest)
+                # Self-contained file: no -wal/-shm needed to read it
+                dest.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                dest.close()
+
+            os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+            share_tmp = snapshot + ".tmp"
+            shutil.copyfile(local_tmp, share_tmp)
+            _fsync_file(share_tmp)
+            os.replace(share_tmp, snapshot)
+            os.remove(local_tmp)
+
+            with self._stats_lock:
+                self._backups += 1
+                self._last_backup_at = datetime.now(timezone.utc).isoformat()
+                self._last_duration_ms = (time.perf_counter() - started) * 1000
+                self._last_size_bytes = os.path.getsize(snapshot)
+                self._last_error = None
+            return True
+        except (OSError, sqlite3.Error) as e:
+            with self._stats_lock:
+                self._failures += 1
+                self._last_error = str(e)
+            self._data_version = None  # retry next interval
+            print(f"⚠️  SQLite backup to {snapshot} failed: {e}")
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "backup_path": settings.SQLITE_BACKUP_PATH,
+                "interval_seconds": self.interval,
+                "is_leader": self.is_leader,
+                "backups": self._backups,
+                "skipped_unchanged": self._skipped,
+                "failures": self._failures,
+                "last_backup_at": self._last_backup_at,
+                "last_duration_ms": round(self._last_duration_ms, 3),
+                "last_size_bytes": self._last_size_bytes,
+                "last_error": self._last_error,
+            }
+
+
+def backup_on_exit() -> bool:
+    """Take the final snapshot after every worker has stopped.
+
+    Called from gunicorn's ``on_exit`` hook in the master process, so no
+    worker can commit after it.  The backup lock is polled for up to
+    EXIT_LOCK_WAIT_SECONDS, so a worker that never exited cannot hang the
+    shutdown.  Returns True if a snapshot was written.
+    """
+    if not backup_enabled() or not os.path.exists(local_db_path()):
+        return False
+    scheduler = SQLiteBackupScheduler(settings.SQLITE_BACKUP_INTERVAL_SECONDS)
+    deadline = time.monotonic() + EXIT_LOCK_WAIT_SECONDS
+    while not scheduler._leader.try_acquire():
+        if time.monotonic() >= deadline:
+            print(f"⚠️  SQLite backup lock still held after {EXIT_LOCK_WAIT_SECONDS:.0f}s "
+                  f"-- skipping the final snapshot")
+            return False
+        time.sleep(EXIT_LOCK_POLL_SECONDS)
+    try:
+        return scheduler.backup_now(force=True)
+    finally:
+        scheduler._release()
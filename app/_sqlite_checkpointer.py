@@ -0,0 +1,182 @@
+"""
+Background WAL checkpoints
+
+In WAL mode SQLite runs an automatic checkpoint inside whichever COMMIT
+pushes the WAL past ``wal_autocheckpoint`` pages, so a random review request
+pays for copying the WAL back into the database file.  While the
+WALCheckpointer runs, app connections of every SQLite engine (primary, read
+replica, async) are handed out with ``wal_autocheckpoint = 0`` (see
+database.set_inline_wal_checkpoints) and one process (flock leader)
+checkpoints from a background thread instead:
+
+- PASSIVE once the WAL exceeds SQLITE_CHECKPOINT_WAL_BYTES, or every
+  SQLITE_CHECKPOINT_INTERVAL_SECONDS if it has any frames.  PASSIVE never
+  waits for readers or writers.
+- TRUNCATE once the WAL exceeds SQLITE_CHECKPOINT_TRUNCATE_BYTES and the DB
+  executor is idle, which resets the -wal file to zero bytes.  TRUNCATE
+  briefly blocks writers, so it only runs when nothing else is waiting.
+
+WAL size and checkpoint durations are reported by ``stats()``.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from _process_lock import ProcessLeaderLock
+
+# How often the WAL size is polled
+POLL_SECONDS = 1.0
+# busy_timeout for the checkpoint connection: never queue behind writers long
+CHECKPOINT_BUSY_TIMEOUT_MS = 100
+
+
+class _ModeStats:
+    __slots__ = ("runs", "busy", "frames", "total_ms", "max_ms", "last_ms", "last_wal_bytes")
+
+    def __init__(self):
+        self.runs = 0
+        self.busy = 0
+        self.frames = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+        self.last_wal_bytes = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "busy": self.busy,
+            "frames_checkpointed": self.frames,
+            "mean_ms": round(self.total_ms / self.runs, 3) if self.runs else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+            # WAL size when the last checkpoint started (TRUNCATE reports 0 frames)
+            "last_wal_bytes": self.last_wal_bytes,
+        }
+
+
+class WALCheckpointer:
+    """Background thread running PASSIVE / TRUNCATE checkpoints."""
+
+    def __init__(self, db_path: str, interval_seconds: float, passive_bytes: int,
+                 truncate_bytes: int, is_idle: Callable[[], bool] = lambda: True):
+        self.db_path = os.path.abspath(db_path)
+        self.interval = max(interval_seconds, POLL_SECONDS)
+        self.passive_bytes = passive_bytes
+        self.truncate_bytes = truncate_bytes
+        self._is_idle = is_idle
+        self._leader = ProcessLeaderLock(self.db_path + ".checkpoint.lock")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_checkpoint = time.monotonic()
+        self._stats_lock = threading.Lock()
+        self._modes = {"PASSIVE": _ModeStats(), "TRUNCATE": _ModeStats()}
+        self._max_wal_bytes = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def wal_path(self) -> str:
+        return self.db_path + "-wal"
+
+    def wal_size(self) -> int:
+        try:
+            return os.path.getsize(self.wal_path)
+        except OSError:
+            return 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="wal-checkpointer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+        if self._leader.held:
+            self.checkpoint("PASSIVE")
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._leader.release()
+
+    def _run(self) -> None:
+        checkpointed_at = None  # (size, mtime) of the WAL at the last checkpoint
+        while not self._stop.wait(POLL_SECONDS):
+            if not self._leader.try_acquire():
+                continue
+            try:
+                st = os.stat(self.wal_path)
+            except OSError:
+                continue
+            size = st.st_size
+            with self._stats_lock:
+                self._max_wal_bytes = max(self._max_wal_bytes, size)
+            if size >= self.truncate_bytes and self._is_idle():
+                self.checkpoint("TRUNCATE")
+            elif (size, st.st_mtime_ns) == checkpointed_at:
+                continue  # no commits since the last checkpoint
+            elif size >= self.passive_bytes or (
+                size and time.monotonic() - self._last_checkpoint >= self.interval
+            ):
+                self.checkpoint("PASSIVE")
+            else:
+                continue
+            try:
+                st = os.stat(self.wal_path)
+                checkpointed_at = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                checkpointed_at = None
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Optional[Dict[str, int]]:
+        """Run ``PRAGMA wal_checkpoint(<mode>)``; returns SQLite's counters."""
+        wal_bytes = self.wal_size()
+        started = time.perf_counter()
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._conn.execute(f"PRAGMA busy_timeout = {CHECKPOINT_BUSY_TIMEOUT_MS}")
+            busy, log_frames, checkpointed = self._conn.execute(
+                f"PRAGMA wal_checkpoint({mode})"
+            ).fetchone()
+        except sqlite3.Error as e:
+            with self._stats_lock:
+                self._failures += 1
+                self._last_error = str(e)
+            return None
+        finally:
+            self._last_checkpoint = time.monotonic()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            stats = self._modes[mode]
+            stats.runs += 1
+            stats.busy += 1 if busy else 0
+            stats.frames += max(checkpointed, 0)
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.last_ms = elapsed_ms
+            stats.last_wal_bytes = wal_bytes
+        return {"busy": busy, "log_frames": log_frames, "checkpointed_frames": checkpointed}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "is_leader": self._leader.held,
+                "wal_bytes": self.wal_size(),
+                "max_wal_bytes": self._max_wal_bytes,
+                "passive_threshold_bytes": self.passive_bytes,
+                "truncate_threshold_bytes": self.truncate_bytes,
+                "interval_seconds": self.interval,
+                "passive": self._modes["PASSIVE"].as_dict(),
+                "truncate": self._modes["TRUNCATE"].as_dict(),
+                "failures": self._failures,
+                "last_error": self._last_error,
+            }
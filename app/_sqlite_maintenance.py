@@ -0,0 +1,187 @@
+"""
+Scheduled SQLite planner maintenance
+
+SQLite only uses its planner statistics (``sqlite_stat1``) after ANALYZE, and
+never refreshes them on its own.  Without them, ``ORDER BY word COLLATE
+NOCASE`` or the ``last_reviewed`` range filters can pick a full scan plus a
+temp B-tree sort, even once an index exists that would serve them.
+
+Every SQLITE_MAINTENANCE_INTERVAL_SECONDS one process (chosen with a
+``flock``, as for backups) waits until the DB executor is idle and then:
+
+- re-runs ANALYZE for tables whose row count drifted more than
+  ANALYZE_DRIFT from what ``sqlite_stat1`` recorded (or were never analyzed)
+- runs ``PRAGMA optimize`` (bounded by ``analysis_limit``) for the rest
+- returns free pages with ``PRAGMA incremental_vacuum`` when the file was
+  created with ``auto_vacuum = INCREMENTAL`` (the PRAGMA profiles set it, but
+  SQLite ignores it for an existing file until a VACUUM; this job does not
+  VACUUM, which rewrites the whole file under an exclusive lock)
+
+``stats()`` reports per-table freshness: rows at the last ANALYZE versus rows
+now.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from _process_lock import ProcessLeaderLock
+from settings import settings
+
+# Re-ANALYZE a table once its row count moved this much (fraction)
+ANALYZE_DRIFT = 0.25
+# Rows sampled per index by ANALYZE / PRAGMA optimize (0 = all)
+ANALYSIS_LIMIT = 1000
+# Free pages returned per run
+INCREMENTAL_VACUUM_PAGES = 2000
+# How long to wait for an idle moment before running anyway
+MAX_IDLE_WAIT_SECONDS = 300
+FIRST_RUN_DELAY_SECONDS = 60
+
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+class SQLiteMaintenance:
+    """Background thread running ANALYZE / optimize / incremental_vacuum."""
+
+    def __init__(self, engine: Engine, interval_seconds: float,
+                 is_idle: Callable[[], bool] = lambda: True):
+        self._engine = engine
+        self.interval = max(interval_seconds, 1.0)
+        self._is_idle = is_idle
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._leader = ProcessLeaderLock(os.path.abspath(settings.db_path) + ".maintenance.lock")
+        self._stats_lock = threading.Lock()
+        self._runs = 0
+        self._failures = 0
+        self._last_run_at: Optional[str] = None
+        self._last_duration_ms = 0.0
+        self._last_analyzed: List[str] = []
+        self._last_vacuumed_pages = 0
+        self._auto_vacuum: Optional[str] = None
+        self._last_error: Optional[str] = None
+        self._freshness: List[Dict[str, Any]] = []
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader.held
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="sqlite-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+        self._leader.release()
+
+    def _run(self) -> None:
+        # First pass soon after startup, then every interval
+        delay = min(self.interval, FIRST_RUN_DELAY_SECONDS)
+        while not self._stop.wait(delay):
+            delay = self.interval
+            if not self._leader.try_acquire():
+                continue
+            waited = 0.0
+            while not self._is_idle() and waited < MAX_IDLE_WAIT_SECONDS:
+                if self._stop.wait(1.0):
+                    return
+                waited += 1.0
+            self.run_now()
+
+    # ── maintenance ───────────────────────────────────────────
+    def _freshness_report(self, conn) -> List[Dict[str, Any]]:
+        """Rows recorded by the last ANALYZE vs current rows, per table."""
+        tables = [r[0] for r in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' AND name != 'alembic_version'"
+        )]
+        analyzed: Dict[str, int] = {}
+        has_stat1 = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).first() is not None
+        if has_stat1:
+            for tbl, stat in conn.exec_driver_sql("SELECT tbl, stat FROM sqlite_stat1"):
+                try:
+                    analyzed[tbl] = max(analyzed.get(tbl, 0), int(str(stat).split()[0]))
+                except (ValueError, IndexError):
+                    pass
+
+        report = []
+        for table in tables:
+            rows = conn.exec_driver_sql(f'SELECT COUNT(*) FROM "{table}"').scalar()
+            before = analyzed.get(table)
+            if before is None:
+                drift = None
+            else:
+                drift = abs(rows - before) / max(before, 1)
+            report.append({
+                "table": table,
+                "rows": rows,
+                "analyzed_rows": before,
+                "drift": round(drift, 3) if drift is not None else None,
+                "stale": (before is None and rows > 0) or (drift is not None and drift > ANALYZE_DRIFT),
+            })
+        return report
+
+    def run_now(self) -> Dict[str, Any]:
+        """Run one maintenance pass immediately and return stats()."""
+        started = time.perf_counter()
+        try:
+            with self._engine.connect() as conn:
+                conn.exec_driver_sql(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+                stale = [t["table"] for t in self._freshness_report(conn) if t["stale"]]
+                for table in stale:
+                    conn.exec_driver_sql(f'ANALYZE "{table}"')
+                conn.exec_driver_sql("PRAGMA optimize")
+
+                vacuumed = 0
+                auto_vacuum = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+                if auto_vacuum == 2:
+                    free = conn.exec_driver_sql("PRAGMA freelist_count").scalar() or 0
+                    vacuumed = min(free, INCREMENTAL_VACUUM_PAGES)
+                    if vacuumed:
+                        conn.exec_driver_sql(f"PRAGMA incremental_vacuum({vacuumed})")
+                conn.commit()
+                freshness = self._freshness_report(conn)
+
+            with self._stats_lock:
+                self._runs += 1
+                self._last_run_at = datetime.now(timezone.utc).isoformat()
+                self._last_duration_ms = (time.perf_counter() - started) * 1000
+                self._last_analyzed = stale
+                self._last_vacuumed_pages = vacuumed
+                self._auto_vacuum = _AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum))
+                self._last_error = None
+                self._freshness = freshness
+        except Exception as e:
+            with self._stats_lock:
+                self._failures += 1
+                self._last_error = str(e)
+            print(f"⚠️  SQLite maintenance failed: {e}")
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "interval_seconds": self.interval,
+                "is_leader": self.is_leader,
+                "runs": self._runs,
+                "failures": self._failures,
+                "last_run_at": self._last_run_at,
+                "last_duration_ms": round(self._last_duration_ms, 3),
+                "last_analyzed": list(self._last_analyzed),
+                "last_vacuumed_pages": self._last_vacuumed_pages,
+                "auto_vacuum": self._auto_vacuum,
+                "last_error": self._last_error,
+                "tables": list(self._freshness),
+            }
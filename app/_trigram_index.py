@@ -0,0 +1,174 @@
+"""
+Trigram indexes for typo-tolerant word search (SQLite)
+
+A misspelt search ("abberant") shares most of its three-letter fragments
+with the intended word ("aberrant") but is not a substring of it, so neither
+LIKE nor the full-text index finds it.  On PostgreSQL ``pg_trgm`` GIN
+indexes answer this (alembic 0007); SQLite has no equivalent, so this module
+keeps the same structure in memory:
+
+- ``trigrams`` and the similarity score follow pg_trgm: each word is
+  lower-cased and padded with two spaces in front and one behind, and the
+  similarity of two strings is shared trigrams / all distinct trigrams
+- ``TrigramIndex`` holds posting lists (trigram -> ids), so a search only
+  touches the words that share at least one trigram with the query
+- ``VocabularyTrigramIndexes`` keeps one index per recently active user, in
+  an LRU of TRIGRAM_INDEX_MAX_USERS, tagged with the user's
+  ``vocab_version``; a stale index is re-synced against the user's current
+  ``(id, word)`` rows, which only re-indexes words that were added, renamed
+  or deleted.  The base vocabulary's index is tagged with a fingerprint of
+  the table (row count, highest id, latest ``updated_at``) and re-synced the
+  same way whenever it changes, so edits and deletions are picked up too.
+"""
+
+import heapq
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Set, Tuple
+
+# pg_trgm's default pg_trgm.similarity_threshold
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD = re.compile(r"[^\W_]+")
+
+Rows = Iterable[Tuple[int, str]]
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """pg_trgm-style trigram set of ``text`` (empty without any letters)."""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Thread-safe posting lists of ``trigram -> ids`` over one set of words."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[int]] = {}
+        self._words: Dict[int, Tuple[str, FrozenSet[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, word_id: int, word: str) -> None:
+        with self._lock:
+            self._add(word_id, word)
+
+    def sync(self, rows: Rows) -> int:
+        """Make the index hold exactly ``rows``; returns the words (re)indexed or dropped."""
+        changed = 0
+        with self._lock:
+            seen = set()
+            for word_id, word in rows:
+                seen.add(word_id)
+                current = self._words.get(word_id)
+                if current is None or current[0] != word:
+                    self._add(word_id, word)
+                    changed += 1
+            for word_id in self._words.keys() - seen:
+                self._remove(word_id)
+                changed += 1
+        return changed
+
+    def search(self, query: str, limit: int,
+               threshold: float = SIMILARITY_THRESHOLD) -> List[Tuple[int, float]]:
+        """Up to ``limit`` ``(id, similarity)`` pairs, most similar first."""
+        wanted = trigrams(query)
+        if not wanted:
+            return []
+        with self._lock:
+            shared = Counter()
+            for gram in wanted:
+                shared.update(self._postings.get(gram, ()))
+            scored = []
+            for word_id, common in shared.items():
+                score = common / (len(wanted) + len(self._words[word_id][1]) - common)
+                if score >= threshold:
+                    scored.append((word_id, score))
+        return heapq.nlargest(limit, scored, key=lambda hit: (hit[1], -hit[0]))
+
+    def _add(self, word_id: int, word: str) -> None:
+        if word_id in self._words:
+            self._remove(word_id)
+        grams = trigrams(word)
+        self._words[word_id] = (word, grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(word_id)
+
+    def _remove(self, word_id: int) -> None:
+        _word, grams = self._words.pop(word_id)
+        for gram in grams:
+            ids = self._postings[gram]
+            ids.discard(word_id)
+            if not ids:
+                del self._postings[gram]
+
+
+class VocabularyTrigramIndexes:
+    """Per-user trigram indexes (LRU, validated by vocab_version) plus the base vocabulary's."""
+
+    def __init__(self, max_users: int):
+        self.max_users = max(max_users, 1)
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[int, Tuple[int, TrigramIndex]]" = OrderedDict()
+        self._base = TrigramIndex()
+        self._base_fingerprint: Any = None
+        self._base_lock = threading.Lock()
+        self.hits = 0
+        self.syncs = 0
+        self.reindexed = 0
+        self.evictions = 0
+        self.base_syncs = 0
+
+    def user_index(self, user_id: int, version: int, load_rows: Callable[[], Rows]) -> TrigramIndex:
+        """The user's index, re-synced from ``load_rows()`` unless current at ``version``."""
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+        index = entry[1] if entry is not None else TrigramIndex()
+        changed = index.sync(load_rows())
+        with self._lock:
+            self.syncs += 1
+            self.reindexed += changed
+            current = self._users.get(user_id)
+            if current is None or current[0] <= version:
+                self._users[user_id] = (version, index)
+                self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+                self.evictions += 1
+        return index
+
+    def base_index(self, fingerprint: Any, load_rows: Callable[[], Rows]) -> TrigramIndex:
+        """The base vocabulary's index, re-synced from ``load_rows()`` unless current at ``fingerprint``."""
+        if fingerprint != self._base_fingerprint:
+            with self._base_lock:
+                if fingerprint != self._base_fingerprint:
+                    changed = self._base.sync(load_rows())
+                    with self._lock:
+                        self.base_syncs += 1
+                        self.reindexed += changed
+                    self._base_fingerprint = fingerprint
+        return self._base
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "max_users": self.max_users,
+                "user_words": sum(len(index) for _version, index in self._users.values()),
+                "base_words": len(self._base),
+                "hits": self.hits,
+                "syncs": self.syncs,
+                "reindexed_words": self.reindexed,
+                "evictions": self.evictions,
+                "base_syncs": self.base_syncs,
+            }
@@ -0,0 +1,124 @@
+"""
+Per-user vocabulary cache
+
+get_user_words() is called by the flashcards, manage and deep-dive pages,
+the add / update word routes and the AI suggestion code, and every call was a
+full ``SELECT`` of the user's vocabulary plus a VocabularyWord per row.
+
+``VocabularyCache`` keeps the projected word dicts of recently active users in
+an LRU bounded by an estimate of their memory use (VOCAB_CACHE_MAX_BYTES).
+Each entry is tagged with the user's ``vocab_version``, which every write
+path bumps in its own transaction:
+
+- a lookup first reads the version (one primary-key row of ``users``) and
+  only uses the entry if it still matches, so writes made by other worker
+  processes are never served stale
+- the writing process also drops the entry right away (``invalidate``), so
+  memory is not held for lists that are about to be reloaded
+
+The version must be read before the words when filling the cache: a write
+that lands in between then leaves the entry older than its tag, never newer.
+Entries are copied in and out, so callers may modify what they get.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+Words = List[Dict[str, Any]]
+
+
+def estimate_bytes(words: Words) -> int:
+    """Approximate memory held by a list of word dicts (keys are shared)."""
+    total = sys.getsizeof(words)
+    for word in words:
+        total += sys.getsizeof(word) + sum(sys.getsizeof(v) for v in word.values())
+    return total
+
+
+class VocabularyCache:
+    """Thread-safe LRU of ``user_id -> (vocab_version, words)`` bounded in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(max_bytes, 0)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[int, Words, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # entry found but its version was superseded
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, user_id: int, version: int) -> Optional[Words]:
+        """A copy of the cached words if cached at ``version``, else None."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != version:
+                self._drop(user_id)
+                self.stale += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            words = entry[1]
+        return [dict(word) for word in words]
+
+    def put(self, user_id: int, version: int, words: Words) -> None:
+        """Cache a copy of ``words`` as the user's list at ``version``."""
+        if not self.enabled:
+            return
+        words = [dict(word) for word in words]
+        size = estimate_bytes(words)
+        if size > self.max_bytes:
+            return  # would evict everything else
+        with self._lock:
+            current = self._entries.get(user_id)
+            if current is not None:
+                if current[0] > version:
+                    return  # a newer list was cached meanwhile
+                self._drop(user_id)
+            self._entries[user_id] = (version, words, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            if user_id in self._entries:
+                self._drop(user_id)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, user_id: int) -> None:
+        _version, _words, size = self._entries.pop(user_id)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -13,6 +13,7 @@ from sqlalchemy import engine_from_config, pool
 # Add the app directory to sys.path so we can import our modules
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from _schema_fingerprint import FINGERPRINT_TABLE  # noqa: E402
 from models import Base  # noqa: E402
 from settings import settings  # noqa: E402
 
@@ -26,6 +27,11 @@ config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    """Skip the app-managed schema_fingerprint table (see _schema_fingerprint)."""
+    return not (type_ == "table" and name == FINGERPRINT_TABLE)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -35,6 +41,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -58,6 +65,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,35 @@
+"""add vocabulary sort and review-date indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index last_reviewed range filters and (SQLite) case-insensitive word order."""
+    op.create_index('idx_vocab_user_last_reviewed', 'vocabulary', ['user_id', 'last_reviewed'])
+    if op.get_bind().dialect.name == 'sqlite':
+        op.create_index(
+            'idx_vocab_user_word_nocase', 'vocabulary',
+            ['user_id', sa.text('word COLLATE NOCASE')],
+        )
+
+
+def downgrade() -> None:
+    """Drop the indexes added in upgrade()."""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.drop_index('idx_vocab_user_word_nocase', table_name='vocabulary')
+    op.drop_index('idx_vocab_user_last_reviewed', table_name='vocabulary')
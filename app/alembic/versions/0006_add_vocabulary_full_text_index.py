@@ -0,0 +1,74 @@
+"""add full-text search index on vocabulary
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match _db_statements.VOCABULARY_TSVECTOR exactly, or searches
+# cannot use the index
+VOCABULARY_TSVECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(word, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(definition, '')), 'B')"
+    " || setweight(to_tsvector('simple', coalesce(example, '')), 'C'))"
+)
+
+FTS_TRIGGERS = ('vocabulary_fts_insert', 'vocabulary_fts_delete', 'vocabulary_fts_update')
+
+
+def upgrade() -> None:
+    """GIN index on the weighted tsvector (PostgreSQL) or an FTS5 table (SQLite)."""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS vocabulary_fts USING fts5("
+            "word, definition, example, content='vocabulary', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS vocabulary_fts_insert AFTER INSERT ON vocabulary
+            BEGIN
+                INSERT INTO vocabulary_fts(rowid, word, definition, example)
+                VALUES (NEW.id, NEW.word, NEW.definition, NEW.example);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS vocabulary_fts_delete AFTER DELETE ON vocabulary
+            BEGIN
+                INSERT INTO vocabulary_fts(vocabulary_fts, rowid, word, definition, example)
+                VALUES ('delete', OLD.id, OLD.word, OLD.definition, OLD.example);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS vocabulary_fts_update
+            AFTER UPDATE OF word, definition, example ON vocabulary
+            BEGIN
+                INSERT INTO vocabulary_fts(vocabulary_fts, rowid, word, definition, example)
+                VALUES ('delete', OLD.id, OLD.word, OLD.definition, OLD.example);
+                INSERT INTO vocabulary_fts(rowid, word, definition, example)
+                VALUES (NEW.id, NEW.word, NEW.definition, NEW.example);
+            END
+        """)
+        op.execute("INSERT INTO vocabulary_fts(vocabulary_fts) VALUES ('rebuild')")
+    else:
+        op.execute(f"CREATE INDEX idx_vocab_search ON vocabulary USING GIN ({VOCABULARY_TSVECTOR})")
+
+
+def downgrade() -> None:
+    """Drop the search index added in upgrade()."""
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in FTS_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS vocabulary_fts")
+    else:
+        op.execute("DROP INDEX IF EXISTS idx_vocab_search")
@@ -0,0 +1,34 @@
+"""add pg_trgm indexes on vocabulary and base vocabulary words
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Trigram GIN indexes for fuzzy word search (PostgreSQL only; SQLite indexes in memory)."""
+    if op.get_bind().dialect.name == 'sqlite':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX idx_vocab_word_trgm ON vocabulary USING GIN (lower(word) gin_trgm_ops)")
+    op.execute("CREATE INDEX idx_base_vocab_word_trgm ON base_vocabulary USING GIN (lower(word) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Drop the trigram indexes (the pg_trgm extension is left installed)."""
+    if op.get_bind().dialect.name == 'sqlite':
+        return
+    op.execute("DROP INDEX IF EXISTS idx_base_vocab_word_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_vocab_word_trgm")
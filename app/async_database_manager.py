@@ -0,0 +1,441 @@
+"""
+Async Database Manager
+
+Native-async versions of the hot request-path DatabaseManager methods (word
+list, reviews, like/hide toggles, session validation, AI learning sessions),
+running on an AsyncEngine (aiosqlite / asyncpg) so async routes await the
+database instead of hopping to the DB thread pool.
+
+The statements (_db_statements) and result shapes match DatabaseManager.
+When no async engine is available (driver missing or DB_ASYNC_ENGINE off)
+each method falls back to its sync counterpart on the DB executor, so
+callers never need to branch.  Writes made inside a request's unit of work
+also take the sync path, so they commit or roll back with the request.
+"""
+
+import functools
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+import _db_statements as stmts
+from _db_adapter import AsyncConnectionAdapter
+from _db_unit_of_work import current_unit_of_work
+from _executors import run_db
+from database import build_async_engine
+from database_manager import (
+    DatabaseManager, User, VocabularyWord, calculate_mastery_level, user_words_page_from_cache,
+    user_words_page_query, user_words_page_result,
+)
+from fastapi_auth import session_user_from_row
+from settings import settings
+
+
+def _native(write: bool = False, replica: bool = False, batched: bool = False):
+    """Run the async body on the async engine, else the sync method on run_db.
+
+    Writes inside a unit of work use the sync method too: a native write
+    commits on its own connection, so a request that then fails (or hits
+    its deadline) could not roll it back.  ``replica`` reads use the sync
+    method when a DATABASE_READ_URL replica is configured, so they are
+    routed like every other read; ``batched`` writes do the same under
+    DB_GROUP_COMMIT so they join the writer's batches.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self: "AsyncDatabaseManager", *args, **kwargs):
+            if (self._engine is None
+                    or (replica and self._sync.has_read_replica)
+                    or (batched and self._sync.group_commit_enabled)
+                    or (write and current_unit_of_work() is not None)):
+                return await run_db(getattr(self._sync, fn.__name__), *args, **kwargs)
+            return await fn(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class AsyncDatabaseManager:
+    """Async facade over DatabaseManager for the hot request path."""
+
+    def __init__(self, sync_manager: DatabaseManager, engine: Optional[AsyncEngine] = None):
+        self._sync = sync_manager
+        self._is_sqlite = sync_manager._is_sqlite
+        self._engine = engine
+        self._sessionmaker = (
+            async_sessionmaker(engine, expire_on_commit=False) if engine is not None else None
+        )
+
+    @classmethod
+    def from_settings(cls, sync_manager: DatabaseManager) -> "AsyncDatabaseManager":
+        """Build with an async engine when DB_ASYNC_ENGINE is on and the driver exists."""
+        engine = build_async_engine() if settings.DB_ASYNC_ENGINE else None
+        if engine is not None:
+            print(f"⚡ Async DB engine enabled ({engine.dialect.driver})")
+        return cls(sync_manager, engine)
+
+    @property
+    def native(self) -> bool:
+        """True when calls run on the async engine rather than the DB executor."""
+        return self._engine is not None
+
+    def get_connection(self) -> AsyncConnectionAdapter:
+        """Async counterpart of DatabaseManager.get_connection()."""
+        return AsyncConnectionAdapter(self._sessionmaker(), self._is_sqlite)
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+
+    # ── sessions ──────────────────────────────────────────────
+    async def validate_session(self, session_token: str) -> Optional[User]:
+        """Async AuthenticationManager.validate_session (requires ``native``)."""
+        if not session_token:
+            return None
+        async with self.get_connection() as conn:
+            cursor = await conn.execute(stmts.VALIDATE_SESSION, {'token': session_token, 'now': datetime.now()})
+            return session_user_from_row(cursor.fetchone())
+
+    # ── words ─────────────────────────────────────────────────
+    @_native(replica=True)
+    async def get_user_words(self, user_id: int) -> List[Dict[str, Any]]:
+        """Get all vocabulary words for a specific user."""
+        cache = self._sync.vocab_cache
+        async with self.get_connection() as conn:
+            version = None
+            if cache.enabled:
+                version = await self._read_vocab_version(conn, user_id)
+                cached = cache.get(user_id, version)
+                if cached is not None:
+                    return cached
+            cursor = await conn.execute(stmts.USER_WORDS, {'owner_id': user_id})
+            words = [VocabularyWord.from_row(row).to_dict() for row in cursor.fetchall()]
+            if version is not None:
+                cache.put(user_id, version, words)
+            return words
+
+    @_native(replica=True)
+    async def get_vocab_version(self, user_id: int) -> int:
+        """The user's vocabulary version (see DatabaseManager._bump_vocab_version)."""
+        async with self.get_connection() as conn:
+            return await self._read_vocab_version(conn, user_id)
+
+    @staticmethod
+    async def _read_vocab_version(conn: AsyncConnectionAdapter, user_id: int) -> int:
+        cursor = await conn.execute(stmts.VOCAB_VERSION, {'owner_id': user_id})
+        row = cursor.fetchone()
+        return (row['vocab_version'] or 0) if row else 0
+
+    async def _bump_vocab_version(self, conn: AsyncConnectionAdapter, user_id: int) -> None:
+        """Async DatabaseManager._bump_vocab_version (shares its vocabulary cache)."""
+        await conn.execute(stmts.BUMP_VOCAB_VERSION, {'owner_id': user_id})
+        self._sync.vocab_cache.invalidate(user_id)
+
+    @_native(replica=True)
+    async def get_user_words_page(self, user_id: int, search: Optional[str] = None,
+                                  word_type: Optional[str] = None, include_hidden: bool = False,
+                                  limit: Optional[int] = None, offset: int = 0,
+                                  cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Filtered page of a user's words (see DatabaseManager.get_user_words_page)."""
+        stmt, params = user_words_page_query(user_id, search, word_type, include_hidden,
+                                             limit, offset, cursor, is_sqlite=self._is_sqlite)
+        cache = self._sync.vocab_cache
+        async with self.get_connection() as conn:
+            if cache.enabled and not search:
+                cached = cache.get(user_id, await self._read_vocab_version(conn, user_id))
+                page = cached is not None and user_words_page_from_cache(
+                    cached, word_type, include_hidden, limit, offset, cursor)
+                if page:
+                    return page
+            db_cursor = await conn.execute(stmt, params)
+            return user_words_page_result(db_cursor.fetchall(), limit)
+
+    @_native(write=True, batched=True)
+    async def record_word_review(self, user_id: int, word_id: int, correct: bool) -> Tuple[bool, str]:
+        """Record a word review (correct/incorrect) for a specific user."""
+        try:
+            async with self.get_connection() as conn:
+                ids = {'word_id': word_id, 'owner_id': user_id}
+                cursor = await conn.execute(stmts.WORD_REVIEW_STATS, ids)
+
+                result = cursor.fetchone()
+                if not result:
+                    return False, "Word not found or not owned by user"
+
+                new_times_reviewed = result['times_reviewed'] + 1
+                new_times_correct = result['times_correct'] + (1 if correct else 0)
+                mastery_level, accuracy = calculate_mastery_level(
+                    new_times_reviewed, new_times_correct, result['mastery_level'])
+
+                await conn.execute(stmts.RECORD_WORD_REVIEW, {
+                    **ids,
+                    'new_times_reviewed': new_times_reviewed,
+                    'new_times_correct': new_times_correct,
+                    'new_mastery_level': mastery_level,
+                })
+
+                await self._bump_vocab_version(conn, user_id)
+                await conn.commit()
+                return True, (f"Review recorded: {'correct' if correct else 'incorrect'} "
+                              f"(Accuracy: {accuracy:.1f}%, Mastery: {mastery_level})")
+        except Exception as e:
+            return False, f"Error recording review: {str(e)}"
+
+    @_native(write=True, batched=True)
+    async def update_word_difficulty(self, user_id: int, word_id: int, difficulty: str) -> Tuple[bool, str]:
+        """Update the difficulty level of a word for a specific user."""
+        try:
+            if difficulty not in ['easy', 'medium', 'hard']:
+                return False, "Invalid difficulty level. Must be 'easy', 'medium', or 'hard'"
+
+            async with self.get_connection() as conn:
+                cursor = await conn.execute(stmts.SET_WORD_DIFFICULTY, {
+                    'word_id': word_id, 'owner_id': user_id, 'new_difficulty': difficulty,
+                })
+
+                if cursor.rowcount == 0:
+                    return False, "Word not found or not owned by user"
+
+                await self._bump_vocab_version(conn, user_id)
+                await conn.commit()
+                return True, f"Word difficulty updated to {difficulty}"
+        except Exception as e:
+            return False, f"Error updating word difficulty: {str(e)}"
+
+    @_native(write=True, batched=True)
+    async def like_word(self, user_id: int, word_id: int) -> Tuple[bool, str]:
+        """Like a word for a user."""
+        try:
+            async with self.get_connection() as conn:
+                ids = {'word_id': word_id, 'owner_id': user_id}
+                cursor = await conn.execute(stmts.LIKE_WORD[self._is_sqlite], ids)
+
+                if cursor.rowcount == 0:
+                    cursor = await conn.execute(stmts.WORD_EXISTS, ids)
+                    if not cursor.fetchone():
+                        return False, "Word not found or not accessible"
+                    return False, "You have already liked this word"
+
+                cursor = await conn.execute(stmts.INCREMENT_WORD_LIKES, {'word_id': word_id})
+
+                word_row = cursor.fetchone()
+                if word_row and word_row['base_word_id']:
+                    await conn.execute(stmts.INCREMENT_BASE_WORD_LIKES,
+                                       {'base_word_id': word_row['base_word_id']})
+
+                await self._bump_vocab_version(conn, user_id)
+                await conn.commit()
+                return True, "Word liked successfully"
+        except Exception as e:
+            return False, f"Error liking word: {str(e)}"
+
+    @_native(write=True, batched=True)
+    async def unlike_word(self, user_id: int, word_id: int) -> Tuple[bool, str]:
+        """Unlike a word for a user."""
+        try:
+            async with self.get_connection() as conn:
+                ids = {'word_id': word_id, 'owner_id': user_id}
+                cursor = await conn.execute(stmts.UNLIKE_WORD, ids)
+
+                if cursor.rowcount == 0:
+                    return False, "You haven't liked this word"
+
+                cursor = await conn.execute(stmts.DECREMENT_WORD_LIKES, ids)
+
+                word_row = cursor.fetchone()
+                if not word_row:
+                    await conn.rollback()
+                    return False, "Word not found"
+
+                if word_row['base_word_id']:
+                    await conn.execute(stmts.DECREMENT_BASE_WORD_LIKES,
+                                       {'base_word_id': word_row['base_word_id']})
+
+                await self._bump_vocab_version(conn, user_id)
+                await conn.commit()
+                return True, "Word unliked successfully"
+        except Exception as e:
+            return False, f"Error unliking word: {str(e)}"
+
+    @_native(write=True, batched=True)
+    async def hide_word_for_user(self, user_id: int, word_id: int) -> Tuple[bool, str]:
+        """Hide a word for a user (instead of deleting it)."""
+        try:
+            async with self.get_connection() as conn:
+                cursor = await conn.execute(stmts.HIDE_WORD, {'word_id': word_id, 'owner_id': user_id})
+
+                if cursor.rowcount == 0:
+                    return False, "Word not found or not accessible"
+
+                await self._bump_vocab_version(conn, user_id)
+                await conn.commit()
+                return True, "Word hidden from your vocabulary"
+        except Exception as e:
+            return False, f"Error hiding word: {str(e)}"
+
+    @_native(write=True, batched=True)
+    async def unhide_word_for_user(self, user_id: int, word_id: int) -> Tuple[bool, str]:
+        """Unhide a word for a user."""
+        try:
+            async with self.get_connection() as conn:
+                cursor = await conn.execute(stmts.UNHIDE_WORD, {'word_id': word_id, 'owner_id': user_id})
+
+                if cursor.rowcount == 0:
+                    return False, "Word not found"
+
+                await self._bump_vocab_version(conn, user_id)
+                await conn.commit()
+                return True, "Word restored to your vocabulary"
+        except Exception as e:
+            return False, f"Error unhiding word: {str(e)}"
+
+    # ── AI learning sessions ──────────────────────────────────
+    @_native(write=True)
+    async def create_ai_learning_session(self, user_id: int, target_words: int) -> Optional[int]:
+        """Create a new AI learning session."""
+        try:
+            async with self.get_connection() as conn:
+                cursor = await conn.execute(stmts.CREATE_AI_SESSION,
+                                            {'user_id': user_id, 'target_words': target_words})
+                session_id = cursor.fetchone()['id']
+                await conn.commit()
+                return session_id
+        except SQLAlchemyError as e:
+            print(f"Database error creating AI learning session: {e}")
+            return None
+
+    @_native()
+    async def get_ai_learning_session(self, session_id: int) -> Optional[Dict]:
+        """Get AI learning session details."""
+        try:
+            async with self.get_connection() as conn:
+                cursor = await conn.execute(stmts.GET_AI_SESSION, {'session_id': session_id})
+                row = cursor.fetchone()
+                return row.to_dict() if row else None
+        except SQLAlchemyError as e:
+            print(f"Database error getting AI learning session: {e}")
+            return None
+
+    @_native(write=True)
+    async def update_ai_learning_session_progress(self, session_id: int, words_completed: int,
+                                                  words_correct: int, current_difficulty: str) -> bool:
+        """Update AI learning session progress."""
+        try:
+            async with self.get_connection() as conn:
+                await conn.execute(stmts.UPDATE_AI_SESSION_PROGRESS, {
+                    'session_id': session_id,
+                    'new_words_completed': words_completed,
+                    'new_words_correct': words_correct,
+                    'new_difficulty': current_difficulty,
+                })
+                await conn.commit()
+                return True
+        except SQLAlchemyError as e:
+            print(f"Database error updating AI learning session: {e}")
+            return False
+
+    @_native(write=True)
+    async def complete_ai_learning_session(self, session_id: int, total_time_seconds: int) -> bool:
+        """Complete an AI learning session."""
+        try:
+            async with self.get_connection() as conn:
+                await conn.execute(stmts.COMPLETE_AI_SESSION, {
+                    'session_id': session_id,
+                    'new_total_time_seconds': total_time_seconds,
+                })
+                await conn.commit()
+                return True
+        except SQLAlchemyError as e:
+            print(f"Database error completing AI learning session: {e}")
+            return False
+
+    @_native(write=True)
+    async def add_word_to_ai_session(self, session_id: int, word_text: str, word_id: Optional[int] = None,
+                                     base_word_id: Optional[int] = None, difficulty_level: str = 'medium',
+                                     word_order: int = 0) -> bool:
+        """Add a word to an AI learning session."""
+        try:
+            async with self.get_connection() as conn:
+                await conn.execute(stmts.ADD_AI_SESSION_WORD, {
+                    'session_id': session_id, 'word_id': word_id, 'base_word_id': base_word_id,
+                    'word_text': word_text, 'difficulty_level': difficulty_level,
+                    'word_order': word_order,
+                })
+                await conn.commit()
+                return True
+        except SQLAlchemyError as e:
+            print(f"Database error adding word to AI session: {e}")
+            return False
+
+    @_native(write=True)
+    async def record_ai_session_response(self, session_id: int, word_text: str, user_response: str,
+                                         is_correct: bool, response_time_ms: int = 0) -> bool:
+        """Record user response for a word in AI learning session and update vocabulary mastery."""
+        try:
+            async with self.get_connection() as conn:
+                cursor = await conn.execute(stmts.AI_SESSION_USER, {'session_id': session_id})
+                session_result = cursor.fetchone()
+                if not session_result:
+                    print(f"No session found with id {session_id}")
+                    return False
+
+                user_id = session_result['user_id']
+
+                await conn.execute(stmts.RECORD_AI_SESSION_RESPONSE, {
+                    'ai_session_id': session_id,
+                    'response_word_text': word_text,
+                    'new_user_response': user_response,
+                    'new_is_correct': is_correct,
+                    'new_response_time_ms': response_time_ms,
+                })
+
+                cursor = await conn.execute(stmts.AI_RESPONSE_WORD_STATS,
+                                            {'owner_id': user_id, 'word_text': word_text})
+
+                vocab_result = cursor.fetchone()
+                if vocab_result:
+                    new_times_reviewed = (vocab_result['times_reviewed'] or 0) + 1
+                    new_times_correct = (vocab_result['times_correct'] or 0) + (1 if is_correct else 0)
+                    mastery_level, accuracy = calculate_mastery_level(
+                        new_times_reviewed, new_times_correct, vocab_result['mastery_level'])
+
+                    await conn.execute(stmts.RECORD_WORD_REVIEW, {
+                        'word_id': vocab_result['id'],
+                        'owner_id': user_id,
+                        'new_times_reviewed': new_times_reviewed,
+                        'new_times_correct': new_times_correct,
+                        'new_mastery_level': mastery_level,
+                    })
+                    await self._bump_vocab_version(conn, user_id)
+
+                    print(f"Updated vocabulary word '{word_text}' for user {user_id}: "
+                          f"accuracy={accuracy:.1f}%, mastery={mastery_level}")
+                else:
+                    print(f"Word '{word_text}' not found in user {user_id}'s vocabulary - AI session only")
+
+                await conn.commit()
+                return True
+        except SQLAlchemyError as e:
+            print(f"Database error recording AI session response: {e}")
+            return False
+
+    @_native()
+    async def get_ai_session_summary(self, session_id: int) -> Optional[Dict]:
+        """Get summary statistics for an AI learning session."""
+        try:
+            async with self.get_connection() as conn:
+                cursor = await conn.execute(stmts.AI_SESSION_SUMMARY, {'session_id': session_id})
+
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                summary = row.to_dict()
+
+                cursor = await conn.execute(stmts.AI_SESSION_WORDS_BREAKDOWN, {'session_id': session_id})
+
+                summary['words_breakdown'] = [r.to_dict() for r in cursor.fetchall()]
+                return summary
+        except SQLAlchemyError as e:
+            print(f"Database error getting AI session summary: {e}")
+            return None
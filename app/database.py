@@ -7,10 +7,20 @@ Provides connection pooling for production workloads.
 """
 
 import os
+from typing import Optional
 
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import Session, sessionmaker
 
+from _db_deadline import SQLITE_PROGRESS_OPS, sqlite_progress_handler
+from _db_pool import (
+    TimedAsyncQueuePool,
+    TimedQueuePool,
+    install_idle_pre_ping,
+    pool_limits,
+    register_pool,
+)
+from _sqlite_backup import restore_if_needed
 from models import Base
 from settings import settings
 
@@ -37,27 +47,26 @@ def _is_network_filesystem(db_path: str) -> bool:
         return False
 
 
-def _build_engine():
-    """Create the SQLAlchemy engine based on DATABASE_URL."""
-    url = settings.DATABASE_URL
+def _build_engine(url: Optional[str] = None, read_only: bool = False):
+    """Create the SQLAlchemy engine based on DATABASE_URL.
+
+    ``url`` overrides DATABASE_URL (used for the DATABASE_READ_URL replica).
+    With ``read_only`` SQLite connections are opened with ``query_only`` so a
+    mis-routed write fails loudly instead of diverging from the primary.
+    """
+    url = url or settings.DATABASE_URL
 
     is_sqlite = url.startswith("sqlite")
 
     connect_args = {}
-    pool_kwargs = {}
-
     if is_sqlite:
         # SQLite: use check_same_thread=False for multi-thread FastAPI
         connect_args["check_same_thread"] = False
-        pool_kwargs["pool_pre_ping"] = True
-    else:
-        # PostgreSQL: configure connection pooling
-        pool_kwargs.update(
-            pool_size=5,
-            max_overflow=15,      # up to 20 total connections
-            pool_pre_ping=True,   # verify connections before use
-            pool_recycle=1800,    # recycle connections after 30 min
-        )
+    # The async engine (DB_ASYNC_ENGINE) shares the primary's connection budget
+    pool_kwargs = _pool_kwargs(
+        TimedQueuePool, is_sqlite,
+        engines_per_worker=1 if read_only or not settings.DB_ASYNC_ENGINE else 2,
+    )
 
     engine = create_engine(
         url,
@@ -73,38 +82,212 @@ def _build_engine():
         on_network_fs = _is_network_filesystem(db_path)
         if on_network_fs:
             print("\u26a0\ufe0f  SQLite DB is on a network filesystem -- using DELETE journal mode")
+        _install_sqlite_pragmas(engine, on_network_fs, query_only=read_only)
 
-        @event.listens_for(engine, "connect")
-        def _set_sqlite_pragmas(dbapi_conn, connection_record):
-            cursor = dbapi_conn.cursor()
-            # Long busy_timeout -- essential for Azure File Shares (SMB latency)
-            cursor.execute("PRAGMA busy_timeout = 60000")
-            if on_network_fs:
-                # Network FS: WAL mode is UNSAFE (relies on shared-memory mmap).
-                # Use DELETE journal mode which works over SMB/NFS.
-                try:
-                    cursor.execute("PRAGMA journal_mode = DELETE")
-                except Exception:
-                    pass
-                # FULL synchronous for data safety on unreliable locks
-                cursor.execute("PRAGMA synchronous = FULL")
-            else:
-                # Local disk: WAL mode for best concurrency
-                try:
-                    cursor.execute("PRAGMA journal_mode = WAL")
-                except Exception:
-                    pass
-                cursor.execute("PRAGMA synchronous = NORMAL")
-            cursor.execute("PRAGMA cache_size = -64000")
-            cursor.close()
-
+    install_idle_pre_ping(engine)
+    register_pool("replica" if read_only else "primary", engine)
     return engine
 
 
+def _pool_kwargs(pool_class, is_sqlite: bool, engines_per_worker: int) -> dict:
+    """Pool arguments sized from workers, threads and DB_MAX_CONNECTIONS (see _db_pool)."""
+    pool_size, max_overflow = pool_limits(engines_per_worker, is_sqlite)
+    pool_kwargs = dict(
+        poolclass=pool_class,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    if not is_sqlite:
+        pool_kwargs["pool_recycle"] = 1800  # recycle connections after 30 min
+    return pool_kwargs
+
+
+# SQLITE_PRAGMA_PROFILE -> extra per-connection PRAGMAs on top of the base
+# set.  mmap_size is skipped on network filesystems (shared-memory mmap is
+# unsafe there) and wal_autocheckpoint only matters in WAL mode.
+# auto_vacuum only takes effect on a new, empty database file; it lets the
+# maintenance job return free pages with PRAGMA incremental_vacuum.  An
+# existing database keeps its mode (see "auto_vacuum" in the maintenance
+# stats) until converted once, offline:
+#   sqlite3 vocabulary.db "PRAGMA auto_vacuum = INCREMENTAL; VACUUM;"
+SQLITE_PRAGMA_PROFILES = {
+    "minimal": {},
+    "balanced": {
+        "temp_store": "MEMORY",
+        "mmap_size": 64 * 1024 * 1024,
+        "wal_autocheckpoint": 1000,
+        "auto_vacuum": "INCREMENTAL",
+    },
+    "performance": {
+        "temp_store": "MEMORY",
+        "mmap_size": 256 * 1024 * 1024,
+        "wal_autocheckpoint": 4000,
+        "cache_size": -128000,
+        "auto_vacuum": "INCREMENTAL",
+    },
+}
+
+
+def _profile_pragmas(on_network_fs: bool) -> dict:
+    profile = settings.SQLITE_PRAGMA_PROFILE.lower()
+    if profile not in SQLITE_PRAGMA_PROFILES:
+        print(f"\u26a0\ufe0f  Unknown SQLITE_PRAGMA_PROFILE {settings.SQLITE_PRAGMA_PROFILE!r} -- using 'balanced'")
+        profile = "balanced"
+    pragmas = dict(SQLITE_PRAGMA_PROFILES[profile])
+    if on_network_fs:
+        pragmas.pop("mmap_size", None)
+        pragmas.pop("wal_autocheckpoint", None)
+    return pragmas
+
+
+# False while a background WAL checkpointer runs: commits then never pay for
+# an inline auto-checkpoint
+_inline_wal_checkpoints = True
+
+# SQLite's default wal_autocheckpoint (pages), when the profile sets none
+_DEFAULT_WAL_AUTOCHECKPOINT = 1000
+
+
+def set_inline_wal_checkpoints(enabled: bool) -> None:
+    """Turn SQLite's inline auto-checkpoint on/off for every SQLite engine.
+
+    Each engine's connect and checkout hooks read the flag, so the primary,
+    read-replica and async engines all pick it up, pooled connections
+    included, on their next checkout.
+    """
+    global _inline_wal_checkpoints
+    _inline_wal_checkpoints = enabled
+
+
+def _install_sqlite_pragmas(engine, on_network_fs: bool, query_only: bool = False) -> None:
+    """Apply the per-connection SQLite PRAGMAs to every new connection of ``engine``."""
+    profile_pragmas = _profile_pragmas(on_network_fs)
+    wal_autocheckpoint = profile_pragmas.get("wal_autocheckpoint", _DEFAULT_WAL_AUTOCHECKPOINT)
+
+    def _apply_wal_autocheckpoint(dbapi_conn, connection_record) -> None:
+        inline = _inline_wal_checkpoints
+        if on_network_fs or connection_record.info.get("inline_wal_checkpoints", True) == inline:
+            return
+        cursor = dbapi_conn.cursor()
+        # Off while a background WALCheckpointer owns checkpoints (_sqlite_checkpointer)
+        cursor.execute(f"PRAGMA wal_autocheckpoint = {wal_autocheckpoint if inline else 0}")
+        cursor.close()
+        connection_record.info["inline_wal_checkpoints"] = inline
+
+    @event.listens_for(engine, "checkout")
+    def _sync_wal_autocheckpoint(dbapi_conn, connection_record, connection_proxy):
+        _apply_wal_autocheckpoint(dbapi_conn, connection_record)
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        # Long busy_timeout until WAL is confirmed: without WAL readers block
+        # the COMMIT too, and SMB lock latency is high on Azure File Shares
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.DB_BUSY_TIMEOUT_NON_WAL_MS)}")
+        if on_network_fs:
+            # Network FS: WAL mode is UNSAFE (relies on shared-memory mmap).
+            # Use DELETE journal mode which works over SMB/NFS.
+            try:
+                cursor.execute("PRAGMA journal_mode = DELETE")
+            except Exception:
+                pass
+            # FULL synchronous for data safety on unreliable locks
+            cursor.execute("PRAGMA synchronous = FULL")
+        else:
+            # Local disk: WAL mode for best concurrency
+            try:
+                cursor.execute("PRAGMA journal_mode = WAL")
+                journal_mode = cursor.fetchone()[0]
+            except Exception:
+                journal_mode = None
+            if str(journal_mode).lower() == "wal":
+                # Short busy_timeout per attempt; ConnectionAdapter retries a
+                # locked transaction start with jittered backoff up to
+                # DB_LOCK_RETRY_DEADLINE_MS
+                cursor.execute(f"PRAGMA busy_timeout = {int(settings.DB_BUSY_TIMEOUT_MS)}")
+            cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute("PRAGMA cache_size = -64000")
+        for name, value in profile_pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        if query_only:
+            cursor.execute("PRAGMA query_only = ON")
+        else:
+            # Take the write lock at the implicit BEGIN before the first write
+            # (BEGIN IMMEDIATE), so a lock wait can only happen, and be
+            # retried, before the transaction holds anything
+            dbapi_conn.isolation_level = "IMMEDIATE"
+        cursor.close()
+        _apply_wal_autocheckpoint(dbapi_conn, connection_record)
+        # Interrupt statements that outlive their request's deadline
+        # (sqlite3 only; aiosqlite runs them on its own thread)
+        if hasattr(dbapi_conn, "set_progress_handler"):
+            dbapi_conn.set_progress_handler(sqlite_progress_handler, SQLITE_PROGRESS_OPS)
+
+
+# Local-disk mode (SQLITE_BACKUP_PATH): restore before the first connection
+restore_if_needed()
+
 engine = _build_engine()
 
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 
+# Optional read replica (DATABASE_READ_URL): separate engine and pool for
+# read-only queries; see DatabaseManager.get_connection(read_only=True)
+read_engine = (
+    _build_engine(settings.DATABASE_READ_URL, read_only=True)
+    if settings.DATABASE_READ_URL else None
+)
+
+ReadSessionLocal = (
+    sessionmaker(bind=read_engine, expire_on_commit=False)
+    if read_engine is not None else None
+)
+
+
+_ASYNC_DRIVERS = {
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+    "postgres": ("postgresql+asyncpg", "asyncpg"),
+}
+
+
+def build_async_engine(url: Optional[str] = None):
+    """Create an AsyncEngine for DATABASE_URL (aiosqlite / asyncpg).
+
+    Returns None when the async driver is not installed, so callers can fall
+    back to the sync engine.  Pooling and SQLite PRAGMAs match _build_engine().
+    """
+    url = url or settings.DATABASE_URL
+    scheme, _, rest = url.partition("://")
+    base_scheme = scheme.split("+", 1)[0]
+    if base_scheme not in _ASYNC_DRIVERS:
+        return None
+    async_scheme, driver = _ASYNC_DRIVERS[base_scheme]
+    try:
+        __import__(driver)
+        from sqlalchemy.ext.asyncio import create_async_engine
+    except ImportError:
+        print(f"\u26a0\ufe0f  {driver} not installed -- async engine disabled")
+        return None
+
+    is_sqlite = base_scheme == "sqlite"
+    pool_kwargs = _pool_kwargs(TimedAsyncQueuePool, is_sqlite, engines_per_worker=2)
+
+    async_engine = create_async_engine(
+        f"{async_scheme}://{rest}",
+        echo=settings.DEBUG and settings.is_development,
+        **pool_kwargs,
+    )
+    if is_sqlite:
+        _install_sqlite_pragmas(
+            async_engine.sync_engine,
+            _is_network_filesystem(url.replace("sqlite:///", "")),
+        )
+    install_idle_pre_ping(async_engine.sync_engine)
+    register_pool("async", async_engine.sync_engine)
+    return async_engine
+
 
 def get_db() -> Session:
     """Yield a database session (FastAPI dependency compatible)."""
@@ -11,16 +11,26 @@ Date: August 2025
 
 import os
 import re
+import base64
+import json
 import bcrypt
 import secrets
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Union
 import shutil
 
 from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 
-from _db_adapter import ConnectionAdapter
-from database import SessionLocal, init_tables
+import _db_metrics
+import _db_statements as stmts
+from _db_adapter import STREAM_BATCH_SIZE, ConnectionAdapter
+from _db_group_commit import GroupCommitWriter, group_commit
+from _db_unit_of_work import UnitOfWork, async_unit_of_work, current_unit_of_work, recently_wrote, unit_of_work
+from _trigram_index import VocabularyTrigramIndexes
+from _vocab_cache import VocabularyCache
+from _schema_fingerprint import schema_fingerprint, store_schema_fingerprint, stored_schema_fingerprint
+from database import ReadSessionLocal, SessionLocal, engine, init_tables, read_engine
 from settings import settings
 
 # Password hashing with bcrypt (cost factor 12)
@@ -98,6 +108,25 @@ class VocabularyWord:
         self.last_reviewed = last_reviewed
         self.is_hidden = is_hidden
     
+    @classmethod
+    def from_row(cls, row) -> "VocabularyWord":
+        """Build a word from a ``SELECT * FROM vocabulary`` row."""
+        return cls(
+            word_id=row['id'],
+            user_id=row['user_id'],
+            word=row['word'],
+            word_type=row['word_type'],
+            definition=row['definition'],
+            example=row['example'],
+            difficulty=row['difficulty'],
+            times_reviewed=row['times_reviewed'],
+            times_correct=row['times_correct'],
+            mastery_level=row['mastery_level'],
+            created_at=row['created_at'],
+            last_reviewed=row['last_reviewed'],
+            is_hidden=row['is_hidden'] or 0
+        )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert word to dictionary for JSON serialization."""
         return {
@@ -118,8 +147,154 @@ class VocabularyWord:
         }
 
 
+def encode_word_cursor(key: Union[str, float], word_id: int) -> str:
+    """Opaque keyset cursor for the word list: the last row's sort key.
+
+    ``key`` is the word, or the search rank for full-text search pages.
+    """
+    raw = json.dumps([key, word_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_word_cursor(cursor: str) -> Tuple[Union[str, float], int]:
+    """Inverse of encode_word_cursor(); ValueError for a malformed token."""
+    try:
+        key, word_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    if (not isinstance(key, (str, int, float)) or isinstance(key, bool)
+            or not isinstance(word_id, int)):
+        raise ValueError("invalid cursor")
+    return key, word_id
+
+
+def full_text_query(search: str, is_sqlite: bool) -> Optional[str]:
+    """FTS5 MATCH / to_tsquery text finding words that start with every term.
+
+    Only word characters are kept, so user input can never form query
+    syntax.  None when ``search`` has no word characters at all.
+    """
+    terms = re.findall(r'\w+', search.lower())
+    if not terms:
+        return None
+    if is_sqlite:
+        return ' '.join(f'"{term}"*' for term in terms)
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def user_words_page_query(user_id: int, search: Optional[str] = None, word_type: Optional[str] = None,
+                          include_hidden: bool = False, limit: Optional[int] = None, offset: int = 0,
+                          cursor: Optional[str] = None, *, is_sqlite: bool) -> Tuple[Any, Dict[str, Any]]:
+    """Statement and parameters for one page of get_user_words_page().
+
+    ``search`` runs against the full-text index (word, definition, example)
+    and ranks the results; a search without word characters (``"-"``)
+    falls back to a substring match on the word.  One extra row is
+    requested so the caller can tell whether a next page exists.  Shared
+    with AsyncDatabaseManager.
+    """
+    params: Dict[str, Any] = {'owner_id': user_id, 'offset': max(offset or 0, 0)}
+    fts_query = full_text_query(search, is_sqlite) if search else None
+    if fts_query:
+        params['fts_query'] = fts_query
+    elif search:
+        escaped = re.sub(r'([%_!])', r'!\1', search)
+        params['pattern'] = f"%{escaped}%"
+    if word_type:
+        params['word_type'] = word_type.lower()
+    if cursor:
+        key, params['after_id'] = decode_word_cursor(cursor)
+        if isinstance(key, str) == bool(fts_query):
+            raise ValueError("cursor is from a different search")
+        params['after_rank' if fts_query else 'after_word'] = key
+    if limit:
+        params['limit'] = limit + 1
+    if fts_query:
+        stmt = stmts.ranked_user_words_page(is_sqlite, bool(word_type), include_hidden,
+                                            bool(cursor), bool(limit))
+    else:
+        stmt = stmts.user_words_page(bool(search), bool(word_type), include_hidden,
+                                     bool(cursor), bool(limit))
+    return stmt, params
+
+
+def user_words_page_result(rows, limit: Optional[int]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """``(words, next_cursor)`` from the rows of user_words_page_query()."""
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_word_cursor(
+            last['search_rank'] if 'search_rank' in last else last['word'], last['id'])
+    return [VocabularyWord.from_row(row).to_dict() for row in rows], next_cursor
+
+
+def user_words_page_from_cache(words: List[Dict[str, Any]], word_type: Optional[str] = None,
+                               include_hidden: bool = False, limit: Optional[int] = None,
+                               offset: int = 0, cursor: Optional[str] = None,
+                               ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """The user_words_page_query() page, computed from a get_user_words() list.
+
+    Only for pages without a ``search`` (those are ranked by the full-text
+    index).  ``words`` is already in keyset order, so a cursor resumes after
+    its row.  Returns None if that row is no longer in the list, or the
+    cursor is a search cursor (use the SQL path).
+    """
+    start = 0
+    if cursor:
+        after_word, after_id = decode_word_cursor(cursor)
+        if not isinstance(after_word, str):
+            return None
+        start = next((i + 1 for i, w in enumerate(words) if w['id'] == after_id), None)
+        if start is None:
+            return None
+    wanted_type = word_type.lower() if word_type else None
+    matches = (
+        w for w in islice(words, start, None)
+        if (wanted_type is None or (w['word_type'] or '').lower() == wanted_type)
+        and (include_hidden or not w['is_hidden'])
+    )
+    offset = max(offset or 0, 0)
+    page = list(islice(matches, offset, offset + limit + 1 if limit else None))
+    next_cursor = None
+    if limit and len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_word_cursor(page[-1]['word'], page[-1]['id'])
+    return page, next_cursor
+
+
+def calculate_mastery_level(times_reviewed: int, times_correct: int,
+                            current_level: int) -> Tuple[int, float]:
+    """Return (mastery_level, accuracy %) after a review.
+    
+    Enhanced mastery level calculation with minimum review requirements:
+    Level 0 (needs practice): accuracy < 50% OR very few reviews
+    Level 1 (learning): 50-70% accuracy with 2+ reviews
+    Level 2 (good): 70-85% accuracy with 3+ reviews
+    Level 3 (mastered): 85%+ accuracy with 4+ reviews
+    Otherwise the current level is kept (borderline performance).
+    """
+    accuracy = (times_correct / times_reviewed) * 100 if times_reviewed > 0 else 0
+    
+    if times_reviewed < 2 or accuracy < 50:
+        mastery_level = 0
+    elif times_reviewed >= 2 and accuracy >= 50 and accuracy < 70:
+        mastery_level = 1
+    elif times_reviewed >= 3 and accuracy >= 70 and accuracy < 85:
+        mastery_level = 2
+    elif times_reviewed >= 4 and accuracy >= 85:
+        mastery_level = 3
+    else:
+        mastery_level = current_level
+    return mastery_level, accuracy
+
+
 class DatabaseManager:
     """Main database manager for vocabulary operations."""
+
+    # Bump whenever init_database() or update_schema_if_needed() change, so
+    # existing databases run the full init once more (see _schema_fingerprint)
+    SCHEMA_REVISION = 3
     
     def __init__(self, db_path: Optional[str] = None, data_dir: Optional[str] = None):
         """Initialize database manager.
@@ -129,6 +304,18 @@ class DatabaseManager:
             data_dir: Legacy parameter. For SQLite, the data dir is auto-created.
         """
         self._is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+        self._read_is_sqlite = read_engine is not None and read_engine.dialect.name == "sqlite"
+        # SQLite only: batch small writes into one transaction (see _db_group_commit)
+        self._group_commit: Optional[GroupCommitWriter] = (
+            GroupCommitWriter(engine, settings.DB_GROUP_COMMIT_WINDOW_MS, settings.DB_GROUP_COMMIT_MAX_BATCH)
+            if settings.DB_GROUP_COMMIT and self._is_sqlite else None
+        )
+        # Per-worker LRU of users' word lists, validated by vocab_version (see _vocab_cache)
+        self.vocab_cache = VocabularyCache(settings.VOCAB_CACHE_MAX_BYTES)
+        # SQLite only: in-memory trigram indexes for fuzzy search (PG uses pg_trgm)
+        self._trigram_indexes: Optional[VocabularyTrigramIndexes] = (
+            VocabularyTrigramIndexes(settings.TRIGRAM_INDEX_MAX_USERS) if self._is_sqlite else None
+        )
         self.db_path = settings.DATABASE_URL
         
         if self._is_sqlite:
@@ -143,19 +330,94 @@ class DatabaseManager:
         # Skip DB init if already done by entrypoint (avoids SQLite lock race
         # when multiple gunicorn workers import this module simultaneously).
         if not os.environ.get("_DB_INITIALIZED"):
-            self.init_database()
-            # Update schema if needed for existing databases
-            self.update_schema_if_needed()
+            self.ensure_schema()
             os.environ["_DB_INITIALIZED"] = "1"
+
+    def ensure_schema(self) -> bool:
+        """Run the full schema init unless the stored fingerprint matches.
+
+        Returns True if the full init ran.  An up-to-date database costs one
+        single-row lookup instead of create_all reflection, trigger DDL,
+        column checks and row counts.
+        """
+        fingerprint = schema_fingerprint(engine, self.SCHEMA_REVISION)
+        if stored_schema_fingerprint(engine) == fingerprint:
+            print(f"\u2705 Database schema up to date: {self.db_path}")
+            return False
+        self.init_database()
+        # Update schema if needed for existing databases
+        if self.update_schema_if_needed():
+            store_schema_fingerprint(engine, fingerprint)
+        return True
     
-    def get_connection(self) -> ConnectionAdapter:
+    def get_connection(self, read_only: bool = False) -> ConnectionAdapter:
         """Get a database connection backed by a SQLAlchemy session.
         
         Returns a ConnectionAdapter that behaves like sqlite3.Connection
         so existing method code works unchanged.  Supports context-manager.
+        Inside a request-scoped unit of work the unit's shared connection is
+        borrowed instead of opening a new session.
+
+        ``read_only`` calls go to the DATABASE_READ_URL replica when one is
+        configured, unless the caller may need to read its own writes (see
+        _primary_read_reason).  Every routing decision is counted in
+        _db_metrics.
         """
+        unit = current_unit_of_work()
+        if read_only and ReadSessionLocal is not None:
+            reason = self._primary_read_reason(unit)
+            if reason is None:
+                _db_metrics.record_route("replica", "read_only")
+                return ConnectionAdapter(ReadSessionLocal(), self._read_is_sqlite)
+            _db_metrics.record_route("primary", reason)
+        if unit is not None:
+            return unit.connection()
         session = SessionLocal()
         return ConnectionAdapter(session, self._is_sqlite)
+
+    @staticmethod
+    def _primary_read_reason(unit: Optional[UnitOfWork]) -> Optional[str]:
+        """Why a read-only call must stay on the primary (None: use the replica)."""
+        if unit is None:
+            return None
+        if unit.pending_writes:
+            return "pending_writes"
+        if unit.wrote:
+            return "request_wrote"
+        if unit.user_id is not None and recently_wrote(unit.user_id, settings.DB_READ_STICKY_SECONDS):
+            return "recent_user_write"
+        return None
+
+    @property
+    def has_read_replica(self) -> bool:
+        return ReadSessionLocal is not None
+
+    @property
+    def group_commit_enabled(self) -> bool:
+        """True when small writes are batched by a GroupCommitWriter."""
+        return self._group_commit is not None
+
+    def group_commit_stats(self) -> Optional[Dict[str, Any]]:
+        return self._group_commit.stats() if self._group_commit is not None else None
+
+    def trigram_index_stats(self) -> Optional[Dict[str, Any]]:
+        return self._trigram_indexes.stats() if self._trigram_indexes is not None else None
+    
+    def unit_of_work(self):
+        """Context manager sharing one connection and one commit across calls.
+
+        Every get_connection() inside the block (including nested method
+        calls) borrows the same pooled connection; see _db_unit_of_work.
+        """
+        return unit_of_work(engine, self._is_sqlite)
+
+    def async_unit_of_work(self, run_blocking):
+        """Async variant of unit_of_work() for the request middleware.
+
+        The end-of-unit commit/rollback and connection close are awaited via
+        ``run_blocking`` (e.g. run_db) so they stay off the event loop.
+        """
+        return async_unit_of_work(engine, self._is_sqlite, run_blocking)
     
     def init_database(self) -> None:
         """Initialize the database and create tables.
@@ -217,6 +479,7 @@ class DatabaseManager:
                     END
                 """)
                 
+                self._ensure_vocabulary_fts(cursor)
                 conn.commit()
         
         # Log initialization
@@ -231,15 +494,32 @@ class DatabaseManager:
         except Exception:
             print(f"\u2705 Database initialized: {self.db_path}")
 
-    def update_schema_if_needed(self):
+    @staticmethod
+    def _ensure_vocabulary_fts(cursor) -> None:
+        """SQLite: create the word search index and its sync triggers.
+
+        The FTS5 table only stores the index (its content is the vocabulary
+        table), so it is filled once from the existing rows when created.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'vocabulary_fts'")
+        exists = cursor.fetchone() is not None
+        cursor.execute(stmts.VOCABULARY_FTS_DDL)
+        for trigger in stmts.VOCABULARY_FTS_TRIGGERS:
+            cursor.execute(trigger)
+        if not exists:
+            cursor.execute(stmts.VOCABULARY_FTS_REBUILD)
+            print("\U0001f50d Built full-text index for vocabulary search")
+
+    def update_schema_if_needed(self) -> bool:
         """Update existing database schema to add new columns if they don't exist.
         
         For SQLite (dev): runs PRAGMA-based column checks and ALTER TABLE.
         For PostgreSQL (prod): schema is managed by Alembic migrations.
+        Returns False if the update hit an error.
         """
         if not self._is_sqlite:
             print("\u2705 Schema managed by Alembic (PostgreSQL)")
-            return
+            return True
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -285,6 +565,7 @@ class DatabaseManager:
                     ('last_failed_login', 'TIMESTAMP'),
                     ('oauth_provider', 'TEXT'),
                     ('oauth_id', 'TEXT'),
+                    ('vocab_version', 'INTEGER NOT NULL DEFAULT 0'),
                 ]
                 
                 for col_name, col_def in profile_columns:
@@ -339,6 +620,8 @@ class DatabaseManager:
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_reset_tokens_user ON password_reset_tokens(user_id)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_ai_sessions_user ON ai_learning_sessions(user_id)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_ai_session_words_session ON ai_learning_session_words(session_id)')
+                    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vocab_user_last_reviewed ON vocabulary(user_id, last_reviewed)')
+                    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vocab_user_word_nocase ON vocabulary(user_id, word COLLATE NOCASE)')
                 except OperationalError as e:
                     # Ignore errors for tables that don't exist yet
                     if "no such table" not in str(e).lower():
@@ -346,9 +629,11 @@ class DatabaseManager:
                 
                 conn.commit()
                 print("✅ Schema update completed")
+                return True
                 
             except Exception as e:
                 print(f"⚠️  Schema update warning: {e}")
+                return False
 
     # ─── Account Lockout Helpers ─────────────────────────────────
     MAX_FAILED_LOGINS = 5
@@ -744,14 +1029,11 @@ class DatabaseManager:
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            for key, value in default_preferences.items():
-                try:
-                    cursor.execute('''
-                        INSERT INTO user_preferences (user_id, preference_key, preference_value)
-                        VALUES (?, ?, ?)
-                    ''', (user_id, key, value))
-                except IntegrityError:
-                    pass  # preference already exists
+            # Existing preferences are left untouched
+            cursor.executemany('''
+                INSERT OR IGNORE INTO user_preferences (user_id, preference_key, preference_value)
+                VALUES (?, ?, ?)
+            ''', [(user_id, key, value) for key, value in default_preferences.items()])
             conn.commit()
     
     # Vocabulary Management Methods
@@ -786,20 +1068,18 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            for match in matches:
-                word, word_type, definition, example = match
-                
-                try:
-                    cursor.execute('''
-                        INSERT INTO vocabulary (user_id, word, word_type, definition, example, source)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (user_id, word.strip(), word_type.strip(), definition.strip(), example.strip(), 'seed_data'))
-                    loaded_count += 1
-                except IntegrityError:
-                    # Word already exists for this user (duplicate)
-                    skipped_count += 1
-                    print(f"⚠️  Skipping duplicate for user {user_id}: {word.strip()}")
+            # Batched insert; words the user already has are skipped (duplicates)
+            cursor.executemany('''
+                INSERT OR IGNORE INTO vocabulary (user_id, word, word_type, definition, example, source)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (user_id, word.strip(), word_type.strip(), definition.strip(), example.strip(), 'seed_data')
+                for word, word_type, definition, example in matches
+            ])
+            loaded_count = cursor.rowcount
+            skipped_count = len(matches) - loaded_count
             
+            self._bump_vocab_version(cursor, user_id)
             conn.commit()
         
         print(f"✅ Loaded {loaded_count} words into database for user {user_id}")
@@ -839,19 +1119,16 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            for match in matches:
-                word, word_type, definition, example = match
-                
-                try:
-                    cursor.execute('''
-                        INSERT INTO base_vocabulary (word, word_type, definition, example, created_by, approved_by)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (word.strip(), word_type.strip(), definition.strip(), example.strip(), created_by_user_id, created_by_user_id))
-                    loaded_count += 1
-                except IntegrityError:
-                    # Word already exists in base vocabulary (duplicate)
-                    skipped_count += 1
-                    print(f"⚠️  Skipping duplicate base word: {word.strip()}")
+            # Batched insert; words already in base vocabulary are skipped (duplicates)
+            cursor.executemany('''
+                INSERT OR IGNORE INTO base_vocabulary (word, word_type, definition, example, created_by, approved_by)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (word.strip(), word_type.strip(), definition.strip(), example.strip(), created_by_user_id, created_by_user_id)
+                for word, word_type, definition, example in matches
+            ])
+            loaded_count = cursor.rowcount
+            skipped_count = len(matches) - loaded_count
             
             conn.commit()
         
@@ -861,43 +1138,55 @@ class DatabaseManager:
         
         return loaded_count
     
+    def _copy_base_words(self, conn, user_id: int) -> Tuple[int, int]:
+        """Copy active base words into a user's vocabulary on ``conn``.
+        
+        Streams base_vocabulary in batches and inserts each batch with one
+        executemany.  Returns (copied_count, skipped_count), where skipped
+        words were already in the user's vocabulary.
+        """
+        base_words = conn.cursor(stream=True)
+        base_words.execute('''
+            SELECT id, word, word_type, definition, example, difficulty, category
+            FROM base_vocabulary 
+            WHERE is_active = 1
+        ''')
+        
+        cursor = conn.cursor()
+        copied_count = 0
+        skipped_count = 0
+        
+        while True:
+            batch = base_words.fetchmany(STREAM_BATCH_SIZE)
+            if not batch:
+                break
+            cursor.executemany('''
+                INSERT OR IGNORE INTO vocabulary 
+                (user_id, word, word_type, definition, example, difficulty, source, base_word_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (
+                    user_id,
+                    base_word['word'],
+                    base_word['word_type'],
+                    base_word['definition'],
+                    base_word['example'],
+                    base_word['difficulty'],
+                    'base_vocabulary',
+                    base_word['id']
+                )
+                for base_word in batch
+            ])
+            copied_count += cursor.rowcount
+            skipped_count += len(batch) - cursor.rowcount
+        
+        self._bump_vocab_version(cursor, user_id)
+        return copied_count, skipped_count
+    
     def copy_base_vocabulary_to_user(self, user_id: int) -> int:
         """Copy all active base vocabulary words to a user's personal vocabulary."""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get all active base vocabulary words
-            cursor.execute('''
-                SELECT id, word, word_type, definition, example, difficulty, category
-                FROM base_vocabulary 
-                WHERE is_active = 1
-            ''')
-            
-            base_words = cursor.fetchall()
-            copied_count = 0
-            skipped_count = 0
-            
-            for base_word in base_words:
-                try:
-                    cursor.execute('''
-                        INSERT INTO vocabulary 
-                        (user_id, word, word_type, definition, example, difficulty, source, base_word_id)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        user_id,
-                        base_word['word'],
-                        base_word['word_type'],
-                        base_word['definition'],
-                        base_word['example'],
-                        base_word['difficulty'],
-                        'base_vocabulary',
-                        base_word['id']
-                    ))
-                    copied_count += 1
-                except IntegrityError:
-                    # Word already exists for this user
-                    skipped_count += 1
-            
+            copied_count, skipped_count = self._copy_base_words(conn, user_id)
             conn.commit()
             
         print(f"✅ Copied {copied_count} base words to user {user_id}")
@@ -908,133 +1197,136 @@ class DatabaseManager:
     
     def get_user_words(self, user_id: int) -> List[Dict[str, Any]]:
         """Get all vocabulary words for a specific user."""
-        with self.get_connection() as conn:
+        with self.get_connection(read_only=True) as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM vocabulary 
-                WHERE user_id = ? 
-                ORDER BY word COLLATE NOCASE
-            ''', (user_id,))
-            
-            words = []
-            for row in cursor.fetchall():
-                word = VocabularyWord(
-                    word_id=row['id'],
-                    user_id=row['user_id'],
-                    word=row['word'],
-                    word_type=row['word_type'],
-                    definition=row['definition'],
-                    example=row['example'],
-                    difficulty=row['difficulty'],
-                    times_reviewed=row['times_reviewed'],
-                    times_correct=row['times_correct'],
-                    mastery_level=row['mastery_level'],
-                    created_at=row['created_at'],
-                    last_reviewed=row['last_reviewed'],
-                    is_hidden=row['is_hidden'] or 0
-                )
-                words.append(word.to_dict())
+            version = None
+            if self.vocab_cache.enabled:
+                # Version first: a concurrent write can only make the entry stale
+                version = self._read_vocab_version(cursor, user_id)
+                cached = self.vocab_cache.get(user_id, version)
+                if cached is not None:
+                    return cached
             
+            cursor.execute(stmts.USER_WORDS, {'owner_id': user_id})
+            words = [VocabularyWord.from_row(row).to_dict() for row in cursor.fetchall()]
+            if version is not None:
+                self.vocab_cache.put(user_id, version, words)
             return words
     
+    def get_vocab_version(self, user_id: int) -> int:
+        """The user's vocabulary version (see _bump_vocab_version)."""
+        with self.get_connection(read_only=True) as conn:
+            return self._read_vocab_version(conn.cursor(), user_id)
+    
+    @staticmethod
+    def _read_vocab_version(cursor, user_id: int) -> int:
+        cursor.execute(stmts.VOCAB_VERSION, {'owner_id': user_id})
+        row = cursor.fetchone()
+        return (row['vocab_version'] or 0) if row else 0
+    
+    def _bump_vocab_version(self, cursor, user_id: int) -> None:
+        """Advance the user's vocabulary version in the current transaction.
+        
+        Every method that changes a user's words, reviews or likes calls this
+        before committing, so the version (and the word endpoints' ETags)
+        changes together with the data.  This worker's cached word list is
+        dropped at once; other workers notice the new version.
+        """
+        cursor.execute(stmts.BUMP_VOCAB_VERSION, {'owner_id': user_id})
+        self.vocab_cache.invalidate(user_id)
+    
+    def get_user_words_page(self, user_id: int, search: Optional[str] = None,
+                            word_type: Optional[str] = None, include_hidden: bool = False,
+                            limit: Optional[int] = None, offset: int = 0,
+                            cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Filtered page of a user's words, in get_user_words() order.
+
+        ``search`` is a full-text search of word, definition and example
+        (every term must start a word) and orders the page best match first;
+        ``word_type`` matches the type, ignoring case; hidden words are
+        skipped unless ``include_hidden``.  Pass the returned cursor back as
+        ``cursor`` for the next page (None when this is the last one, or
+        without ``limit``).  Pages without a search are served from the
+        vocabulary cache when the user's list is cached.
+        Raises ValueError for a malformed cursor.
+        """
+        stmt, params = user_words_page_query(user_id, search, word_type, include_hidden,
+                                             limit, offset, cursor, is_sqlite=self._is_sqlite)
+        with self.get_connection(read_only=True) as conn:
+            db_cursor = conn.cursor()
+            if self.vocab_cache.enabled and not search:
+                cached = self.vocab_cache.get(user_id, self._read_vocab_version(db_cursor, user_id))
+                page = cached is not None and user_words_page_from_cache(
+                    cached, word_type, include_hidden, limit, offset, cursor)
+                if page:
+                    return page
+            db_cursor.execute(stmt, params)
+            return user_words_page_result(db_cursor.fetchall(), limit)
+    
     # Word Likes Management
+    @group_commit
     def like_word(self, user_id: int, word_id: int) -> Tuple[bool, str]:
         """Like a word for a user."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check if word exists and belongs to user
-                cursor.execute('''
-                    SELECT id, base_word_id FROM vocabulary 
-                    WHERE id = ? AND user_id = ?
-                ''', (word_id, user_id))
-                
-                word_row = cursor.fetchone()
-                if not word_row:
-                    return False, "Word not found or not accessible"
+                # Insert like only if the word belongs to the user; an existing
+                # like is left alone instead of raising an IntegrityError
+                ids = {'word_id': word_id, 'owner_id': user_id}
+                cursor.execute(stmts.LIKE_WORD[self._is_sqlite], ids)
                 
-                # Insert like
-                cursor.execute('''
-                    INSERT INTO word_likes (user_id, word_id)
-                    VALUES (?, ?)
-                ''', (user_id, word_id))
+                if cursor.rowcount == 0:
+                    cursor.execute(stmts.WORD_EXISTS, ids)
+                    if not cursor.fetchone():
+                        return False, "Word not found or not accessible"
+                    return False, "You have already liked this word"
                 
                 # Update like count on the word
-                cursor.execute('''
-                    UPDATE vocabulary 
-                    SET like_count = like_count + 1 
-                    WHERE id = ?
-                ''', (word_id,))
+                cursor.execute(stmts.INCREMENT_WORD_LIKES, {'word_id': word_id})
+                
+                word_row = cursor.fetchone()
                 
                 # If this is a base vocabulary word, update base vocabulary like count too
-                if word_row['base_word_id']:
-                    cursor.execute('''
-                        UPDATE base_vocabulary 
-                        SET total_likes = total_likes + 1 
-                        WHERE id = ?
-                    ''', (word_row['base_word_id'],))
+                if word_row and word_row['base_word_id']:
+                    cursor.execute(stmts.INCREMENT_BASE_WORD_LIKES,
+                                   {'base_word_id': word_row['base_word_id']})
                 
+                self._bump_vocab_version(cursor, user_id)
                 conn.commit()
                 return True, "Word liked successfully"
                 
-        except IntegrityError:
-            return False, "You have already liked this word"
         except Exception as e:
             return False, f"Error liking word: {str(e)}"
     
+    @group_commit
     def unlike_word(self, user_id: int, word_id: int) -> Tuple[bool, str]:
         """Unlike a word for a user."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check if like exists
-                cursor.execute('''
-                    SELECT id FROM word_likes 
-                    WHERE user_id = ? AND word_id = ?
-                ''', (user_id, word_id))
+                # Remove like
+                ids = {'word_id': word_id, 'owner_id': user_id}
+                cursor.execute(stmts.UNLIKE_WORD, ids)
                 
-                if not cursor.fetchone():
+                if cursor.rowcount == 0:
                     return False, "You haven't liked this word"
                 
-                # Get word info for base word update
-                cursor.execute('''
-                    SELECT base_word_id FROM vocabulary 
-                    WHERE id = ? AND user_id = ?
-                ''', (word_id, user_id))
+                # Update like count on the word
+                cursor.execute(stmts.DECREMENT_WORD_LIKES, ids)
                 
                 word_row = cursor.fetchone()
                 if not word_row:
+                    conn.rollback()
                     return False, "Word not found"
                 
-                # Remove like
-                cursor.execute('''
-                    DELETE FROM word_likes 
-                    WHERE user_id = ? AND word_id = ?
-                ''', (user_id, word_id))
-                
-                # Update like count on the word
-                cursor.execute('''
-                    UPDATE vocabulary 
-                    SET like_count = CASE 
-                        WHEN like_count > 0 THEN like_count - 1 
-                        ELSE 0 
-                    END
-                    WHERE id = ?
-                ''', (word_id,))
-                
                 # If this is a base vocabulary word, update base vocabulary like count too
                 if word_row['base_word_id']:
-                    cursor.execute('''
-                        UPDATE base_vocabulary 
-                        SET total_likes = CASE 
-                            WHEN total_likes > 0 THEN total_likes - 1 
-                            ELSE 0 
-                        END
-                        WHERE id = ?
-                    ''', (word_row['base_word_id'],))
+                    cursor.execute(stmts.DECREMENT_BASE_WORD_LIKES,
+                                   {'base_word_id': word_row['base_word_id']})
                 
+                self._bump_vocab_version(cursor, user_id)
                 conn.commit()
                 return True, "Word unliked successfully"
                 
@@ -1054,7 +1346,7 @@ class DatabaseManager:
     
     def get_most_liked_words(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get the most liked base vocabulary words."""
-        with self.get_connection() as conn:
+        with self.get_connection(read_only=True) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT word, word_type, definition, example, total_likes, category
@@ -1192,48 +1484,37 @@ class DatabaseManager:
             return False, f"Error resetting password: {str(e)}"
     
     # Word Management  
+    @group_commit
     def hide_word_for_user(self, user_id: int, word_id: int) -> Tuple[bool, str]:
         """Hide a word for a user (instead of deleting it)."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check if word exists and belongs to user
-                cursor.execute('''
-                    SELECT source FROM vocabulary 
-                    WHERE id = ? AND user_id = ?
-                ''', (word_id, user_id))
+                # Mark word as hidden (only matches words the user owns)
+                cursor.execute(stmts.HIDE_WORD, {'word_id': word_id, 'owner_id': user_id})
                 
-                word_row = cursor.fetchone()
-                if not word_row:
+                if cursor.rowcount == 0:
                     return False, "Word not found or not accessible"
                 
-                # Mark word as hidden
-                cursor.execute('''
-                    UPDATE vocabulary 
-                    SET is_hidden = 1, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ? AND user_id = ?
-                ''', (word_id, user_id))
-                
+                self._bump_vocab_version(cursor, user_id)
                 conn.commit()
                 return True, "Word hidden from your vocabulary"
                 
         except Exception as e:
             return False, f"Error hiding word: {str(e)}"
     
+    @group_commit
     def unhide_word_for_user(self, user_id: int, word_id: int) -> Tuple[bool, str]:
         """Unhide a word for a user."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    UPDATE vocabulary 
-                    SET is_hidden = 0, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ? AND user_id = ?
-                ''', (word_id, user_id))
+                cursor.execute(stmts.UNHIDE_WORD, {'word_id': word_id, 'owner_id': user_id})
                 
                 if cursor.rowcount > 0:
+                    self._bump_vocab_version(cursor, user_id)
                     conn.commit()
                     return True, "Word restored to your vocabulary"
                 else:
@@ -1251,6 +1532,7 @@ class DatabaseManager:
                     INSERT INTO vocabulary (user_id, word, word_type, definition, example)
                     VALUES (?, ?, ?, ?, ?)
                 ''', (user_id, word.strip(), word_type.strip(), definition.strip(), example.strip()))
+                self._bump_vocab_version(cursor, user_id)
                 conn.commit()
                 return True, "Word added successfully"
         except IntegrityError:
@@ -1269,6 +1551,7 @@ class DatabaseManager:
                 ''', (word_id, user_id))
                 
                 if cursor.rowcount > 0:
+                    self._bump_vocab_version(cursor, user_id)
                     conn.commit()
                     return True, "Word removed successfully"
                 else:
@@ -1307,6 +1590,7 @@ class DatabaseManager:
                 ''', (word.strip(), word_type.strip(), definition.strip(), example.strip(), word_id, user_id))
                 
                 if cursor.rowcount > 0:
+                    self._bump_vocab_version(cursor, user_id)
                     conn.commit()
                     return True, "Word updated successfully"
                 else:
@@ -1314,6 +1598,7 @@ class DatabaseManager:
         except Exception as e:
             return False, f"Error updating word: {str(e)}"
     
+    @group_commit
     def record_word_review(self, user_id: int, word_id: int, correct: bool) -> Tuple[bool, str]:
         """Record a word review (correct/incorrect) for a specific user."""
         try:
@@ -1321,55 +1606,30 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 
                 # First, check if the word belongs to the user
-                cursor.execute('''
-                    SELECT times_reviewed, times_correct FROM vocabulary 
-                    WHERE id = ? AND user_id = ?
-                ''', (word_id, user_id))
+                ids = {'word_id': word_id, 'owner_id': user_id}
+                cursor.execute(stmts.WORD_REVIEW_STATS, ids)
                 
                 result = cursor.fetchone()
                 if not result:
                     return False, "Word not found or not owned by user"
                 
-                current_times_reviewed = result['times_reviewed']
-                current_times_correct = result['times_correct']
-                
                 # Update the review statistics
-                new_times_reviewed = current_times_reviewed + 1
-                new_times_correct = current_times_correct + (1 if correct else 0)
+                new_times_reviewed = result['times_reviewed'] + 1
+                new_times_correct = result['times_correct'] + (1 if correct else 0)
                 
                 # Calculate new mastery level based on accuracy and review count
-                accuracy = (new_times_correct / new_times_reviewed) * 100 if new_times_reviewed > 0 else 0
-                
-                # Enhanced mastery level calculation with minimum review requirements:
-                # Level 0 (needs practice): accuracy < 50% OR very few reviews
-                # Level 1 (learning): 50-70% accuracy with 2+ reviews  
-                # Level 2 (good): 70-85% accuracy with 3+ reviews
-                # Level 3 (mastered): 85%+ accuracy with 4+ reviews
-                
-                if new_times_reviewed < 2 or accuracy < 50:
-                    mastery_level = 0
-                elif new_times_reviewed >= 2 and accuracy >= 50 and accuracy < 70:
-                    mastery_level = 1
-                elif new_times_reviewed >= 3 and accuracy >= 70 and accuracy < 85:
-                    mastery_level = 2
-                elif new_times_reviewed >= 4 and accuracy >= 85:
-                    mastery_level = 3
-                else:
-                    # Keep current level if not enough data or borderline performance
-                    cursor.execute('SELECT mastery_level FROM vocabulary WHERE id = ? AND user_id = ?', (word_id, user_id))
-                    current_mastery = cursor.fetchone()['mastery_level']
-                    mastery_level = current_mastery
+                mastery_level, accuracy = calculate_mastery_level(
+                    new_times_reviewed, new_times_correct, result['mastery_level'])
                 
                 # Update the word statistics
-                cursor.execute('''
-                    UPDATE vocabulary 
-                    SET times_reviewed = ?, 
-                        times_correct = ?, 
-                        mastery_level = ?,
-                        last_reviewed = CURRENT_TIMESTAMP
-                    WHERE id = ? AND user_id = ?
-                ''', (new_times_reviewed, new_times_correct, mastery_level, word_id, user_id))
+                cursor.execute(stmts.RECORD_WORD_REVIEW, {
+                    **ids,
+                    'new_times_reviewed': new_times_reviewed,
+                    'new_times_correct': new_times_correct,
+                    'new_mastery_level': mastery_level,
+                })
                 
+                self._bump_vocab_version(cursor, user_id)
                 conn.commit()
                 
                 result_message = f"Review recorded: {'correct' if correct else 'incorrect'} " \
@@ -1380,6 +1640,7 @@ class DatabaseManager:
         except Exception as e:
             return False, f"Error recording review: {str(e)}"
     
+    @group_commit
     def update_word_difficulty(self, user_id: int, word_id: int, difficulty: str) -> Tuple[bool, str]:
         """Update the difficulty level of a word for a specific user."""
         try:
@@ -1389,22 +1650,15 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check if word exists and belongs to user
-                cursor.execute('''
-                    SELECT id FROM vocabulary 
-                    WHERE id = ? AND user_id = ?
-                ''', (word_id, user_id))
+                # Update the difficulty (only matches words the user owns)
+                cursor.execute(stmts.SET_WORD_DIFFICULTY, {
+                    'word_id': word_id, 'owner_id': user_id, 'new_difficulty': difficulty,
+                })
                 
-                if not cursor.fetchone():
+                if cursor.rowcount == 0:
                     return False, "Word not found or not owned by user"
                 
-                # Update the difficulty
-                cursor.execute('''
-                    UPDATE vocabulary 
-                    SET difficulty = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ? AND user_id = ?
-                ''', (difficulty, word_id, user_id))
-                
+                self._bump_vocab_version(cursor, user_id)
                 conn.commit()
                 return True, f"Word difficulty updated to {difficulty}"
                 
@@ -1549,42 +1803,73 @@ class DatabaseManager:
             return False, f"Error resetting study session: {str(e)}"
     
     def search_user_words(self, user_id: int, search_query: str) -> List[Dict[str, Any]]:
-        """Search vocabulary words for a specific user."""
+        """Search vocabulary words for a specific user, best match first.
+
+        Uses the full-text index (see get_user_words_page); hidden words are
+        included.
+        """
         if not search_query.strip():
             return self.get_user_words(user_id)
         
-        with self.get_connection() as conn:
+        words, _next_cursor = self.get_user_words_page(user_id, search=search_query.strip(),
+                                                       include_hidden=True)
+        return words
+
+    def fuzzy_search_words(self, user_id: int, query: str, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """Typo-tolerant search of the user's words and the base vocabulary.
+        
+        Returns ``{'words': [...], 'base_words': [...]}``, each at most
+        ``limit`` entries ranked by trigram similarity of the word to
+        ``query`` (best first, with a ``similarity`` score).  PostgreSQL uses
+        the pg_trgm indexes; SQLite the in-memory ones (see _trigram_index).
+        """
+        query = query.strip().lower()
+        with self.get_connection(read_only=True) as conn:
             cursor = conn.cursor()
-            search_pattern = f"%{search_query.strip()}%"
-            cursor.execute('''
-                SELECT * FROM vocabulary 
-                WHERE user_id = ? AND (
-                    word LIKE ? OR 
-                    definition LIKE ? OR 
-                    example LIKE ?
-                )
-                ORDER BY word COLLATE NOCASE
-            ''', (user_id, search_pattern, search_pattern, search_pattern))
-            
-            words = []
-            for row in cursor.fetchall():
-                word = VocabularyWord(
-                    word_id=row['id'],
-                    user_id=row['user_id'],
-                    word=row['word'],
-                    word_type=row['word_type'],
-                    definition=row['definition'],
-                    example=row['example'],
-                    difficulty=row['difficulty'],
-                    times_reviewed=row['times_reviewed'],
-                    times_correct=row['times_correct'],
-                    mastery_level=row['mastery_level'],
-                    created_at=row['created_at'],
-                    last_reviewed=row['last_reviewed']
-                )
-                words.append(word.to_dict())
-            
-            return words
+            if self._trigram_indexes is None:
+                params = {'query': query, 'limit': limit}
+                cursor.execute(stmts.FUZZY_USER_WORDS, {**params, 'owner_id': user_id})
+                user_hits = [(row, row['similarity']) for row in cursor.fetchall()]
+                cursor.execute(stmts.FUZZY_BASE_WORDS, params)
+                base_hits = [(row, row['similarity']) for row in cursor.fetchall()]
+            else:
+                user_hits = self._trigram_user_words(cursor, user_id, query, limit)
+                base_hits = self._trigram_base_words(cursor, query, limit)
+        
+        return {
+            'words': [{**VocabularyWord.from_row(row).to_dict(), 'similarity': round(score, 3)}
+                      for row, score in user_hits],
+            'base_words': [{**row.to_dict(), 'similarity': round(score, 3)} for row, score in base_hits],
+        }
+    
+    def _trigram_user_words(self, cursor, user_id: int, query: str, limit: int) -> List[Tuple[Any, float]]:
+        def load_rows():
+            cursor.execute(stmts.USER_WORD_TEXTS, {'owner_id': user_id})
+            return [(row['id'], row['word']) for row in cursor.fetchall()]
+        
+        version = self._read_vocab_version(cursor, user_id)
+        index = self._trigram_indexes.user_index(user_id, version, load_rows)
+        return self._rows_for_hits(cursor, stmts.USER_WORDS_BY_ID, index.search(query, limit), owner_id=user_id)
+    
+    def _trigram_base_words(self, cursor, query: str, limit: int) -> List[Tuple[Any, float]]:
+        def load_rows():
+            cursor.execute(stmts.BASE_WORD_TEXTS)
+            return [(row['id'], row['word']) for row in cursor.fetchall()]
+        
+        cursor.execute(stmts.BASE_WORDS_FINGERPRINT)
+        row = cursor.fetchone()
+        fingerprint = (row['words'], row['max_id'], row['updated_at'])
+        index = self._trigram_indexes.base_index(fingerprint, load_rows)
+        return self._rows_for_hits(cursor, stmts.BASE_WORDS_BY_ID, index.search(query, limit))
+    
+    @staticmethod
+    def _rows_for_hits(cursor, stmt, hits: List[Tuple[int, float]], **params) -> List[Tuple[Any, float]]:
+        """``(row, score)`` for each ``(id, score)`` hit still returned by ``stmt``, in hit order."""
+        if not hits:
+            return []
+        cursor.execute(stmt, {**params, 'word_ids': [word_id for word_id, _score in hits]})
+        rows = {row['id']: row for row in cursor.fetchall()}
+        return [(rows[word_id], score) for word_id, score in hits if word_id in rows]
 
     # Admin Methods
     def get_all_users(self) -> List[Dict[str, Any]]:
@@ -1730,36 +2015,7 @@ class DatabaseManager:
                 deleted_count = cursor.rowcount
                 
                 # Copy base vocabulary to user directly within this connection
-                cursor.execute('''
-                    SELECT id, word, word_type, definition, example, difficulty, category
-                    FROM base_vocabulary 
-                    WHERE is_active = 1
-                ''')
-                
-                base_words = cursor.fetchall()
-                copied_count = 0
-                skipped_count = 0
-                
-                for base_word in base_words:
-                    try:
-                        cursor.execute('''
-                            INSERT INTO vocabulary 
-                            (user_id, word, word_type, definition, example, difficulty, source, base_word_id)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            user_id,
-                            base_word['word'],
-                            base_word['word_type'],
-                            base_word['definition'],
-                            base_word['example'],
-                            base_word['difficulty'],
-                            'base_vocabulary',
-                            base_word['id']
-                        ))
-                        copied_count += 1
-                    except IntegrityError:
-                        # Word already exists for this user
-                        skipped_count += 1
+                copied_count, skipped_count = self._copy_base_words(conn, user_id)
                 
                 conn.commit()
                 
@@ -1786,7 +2042,7 @@ class DatabaseManager:
     def get_system_stats(self) -> Dict[str, Any]:
         """Get system statistics for admin dashboard."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(read_only=True) as conn:
                 cursor = conn.cursor()
                 
                 # User stats
@@ -1848,7 +2104,7 @@ class DatabaseManager:
             Dict containing analysis results
         """
         try:
-            conn = self.get_connection()
+            conn = self.get_connection(read_only=True)
             cursor = conn.cursor()
             
             # Get user's words with review statistics
@@ -1983,11 +2239,9 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO ai_learning_sessions (user_id, target_words)
-                    VALUES (?, ?)
-                ''', (user_id, target_words))
-                session_id = cursor.lastrowid
+                cursor.execute(stmts.CREATE_AI_SESSION,
+                               {'user_id': user_id, 'target_words': target_words})
+                session_id = cursor.fetchone()['id']
                 conn.commit()
                 return session_id
         except SQLAlchemyError as e:
@@ -1999,12 +2253,10 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM ai_learning_sessions WHERE id = ?
-                ''', (session_id,))
+                cursor.execute(stmts.GET_AI_SESSION, {'session_id': session_id})
                 row = cursor.fetchone()
                 if row:
-                    return dict(row)
+                    return row.to_dict()
                 return None
         except SQLAlchemyError as e:
             print(f"Database error getting AI learning session: {e}")
@@ -2016,11 +2268,12 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE ai_learning_sessions 
-                    SET words_completed = ?, words_correct = ?, current_difficulty = ?
-                    WHERE id = ?
-                ''', (words_completed, words_correct, current_difficulty, session_id))
+                cursor.execute(stmts.UPDATE_AI_SESSION_PROGRESS, {
+                    'session_id': session_id,
+                    'new_words_completed': words_completed,
+                    'new_words_correct': words_correct,
+                    'new_difficulty': current_difficulty,
+                })
                 conn.commit()
                 return True
         except SQLAlchemyError as e:
@@ -2032,12 +2285,10 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE ai_learning_sessions 
-                    SET is_completed = 1, session_ended_at = CURRENT_TIMESTAMP, 
-                        total_time_seconds = ?
-                    WHERE id = ?
-                ''', (total_time_seconds, session_id))
+                cursor.execute(stmts.COMPLETE_AI_SESSION, {
+                    'session_id': session_id,
+                    'new_total_time_seconds': total_time_seconds,
+                })
                 conn.commit()
                 return True
         except SQLAlchemyError as e:
@@ -2051,11 +2302,11 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO ai_learning_session_words 
-                    (session_id, word_id, base_word_id, word_text, difficulty_level, word_order)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (session_id, word_id, base_word_id, word_text, difficulty_level, word_order))
+                cursor.execute(stmts.ADD_AI_SESSION_WORD, {
+                    'session_id': session_id, 'word_id': word_id, 'base_word_id': base_word_id,
+                    'word_text': word_text, 'difficulty_level': difficulty_level,
+                    'word_order': word_order,
+                })
                 conn.commit()
                 return True
         except SQLAlchemyError as e:
@@ -2070,7 +2321,7 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 
                 # First, get the session to find the user
-                cursor.execute('SELECT user_id FROM ai_learning_sessions WHERE id = ?', (session_id,))
+                cursor.execute(stmts.AI_SESSION_USER, {'session_id': session_id})
                 session_result = cursor.fetchone()
                 if not session_result:
                     print(f"No session found with id {session_id}")
@@ -2079,18 +2330,16 @@ class DatabaseManager:
                 user_id = session_result['user_id']
                 
                 # Record response in AI session
-                cursor.execute('''
-                    UPDATE ai_learning_session_words 
-                    SET user_response = ?, is_correct = ?, response_time_ms = ?
-                    WHERE session_id = ? AND word_text = ?
-                ''', (user_response, is_correct, response_time_ms, session_id, word_text))
+                cursor.execute(stmts.RECORD_AI_SESSION_RESPONSE, {
+                    'ai_session_id': session_id,
+                    'response_word_text': word_text,
+                    'new_user_response': user_response,
+                    'new_is_correct': is_correct,
+                    'new_response_time_ms': response_time_ms,
+                })
                 
                 # Update user's vocabulary mastery if this word exists in their vocabulary
-                cursor.execute('''
-                    SELECT id, times_reviewed, times_correct, mastery_level 
-                    FROM vocabulary 
-                    WHERE user_id = ? AND LOWER(word) = LOWER(?)
-                ''', (user_id, word_text))
+                cursor.execute(stmts.AI_RESPONSE_WORD_STATS, {'owner_id': user_id, 'word_text': word_text})
                 
                 vocab_result = cursor.fetchone()
                 if vocab_result:
@@ -2104,35 +2353,18 @@ class DatabaseManager:
                     new_times_correct = current_times_correct + (1 if is_correct else 0)
                     
                     # Calculate new mastery level based on accuracy and review count
-                    accuracy = (new_times_correct / new_times_reviewed) * 100 if new_times_reviewed > 0 else 0
-                    
-                    # Enhanced mastery level calculation:
-                    # Level 0 (needs practice): accuracy < 50% OR very few reviews
-                    # Level 1 (learning): 50-70% accuracy with 2+ reviews  
-                    # Level 2 (good): 70-85% accuracy with 3+ reviews
-                    # Level 3 (mastered): 85%+ accuracy with 4+ reviews
-                    
-                    if new_times_reviewed < 2 or accuracy < 50:
-                        mastery_level = 0
-                    elif new_times_reviewed >= 2 and accuracy >= 50 and accuracy < 70:
-                        mastery_level = 1
-                    elif new_times_reviewed >= 3 and accuracy >= 70 and accuracy < 85:
-                        mastery_level = 2
-                    elif new_times_reviewed >= 4 and accuracy >= 85:
-                        mastery_level = 3
-                    else:
-                        # Keep current level if not enough data or borderline performance
-                        mastery_level = vocab_result['mastery_level']
+                    mastery_level, accuracy = calculate_mastery_level(
+                        new_times_reviewed, new_times_correct, vocab_result['mastery_level'])
                     
                     # Update the word statistics
-                    cursor.execute('''
-                        UPDATE vocabulary 
-                        SET times_reviewed = ?, 
-                            times_correct = ?, 
-                            mastery_level = ?,
-                            last_reviewed = CURRENT_TIMESTAMP
-                        WHERE id = ? AND user_id = ?
-                    ''', (new_times_reviewed, new_times_correct, mastery_level, word_id, user_id))
+                    cursor.execute(stmts.RECORD_WORD_REVIEW, {
+                        'word_id': word_id,
+                        'owner_id': user_id,
+                        'new_times_reviewed': new_times_reviewed,
+                        'new_times_correct': new_times_correct,
+                        'new_mastery_level': mastery_level,
+                    })
+                    self._bump_vocab_version(cursor, user_id)
                     
                     print(f"Updated vocabulary word '{word_text}' for user {user_id}: "
                           f"accuracy={accuracy:.1f}%, mastery={mastery_level}")
@@ -2152,30 +2384,16 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 
                 # Get session details
-                cursor.execute('''
-                    SELECT s.*, 
-                           COUNT(w.id) as total_words_attempted,
-                           SUM(CASE WHEN w.is_correct = 1 THEN 1 ELSE 0 END) as words_correct,
-                           AVG(w.response_time_ms) as avg_response_time
-                    FROM ai_learning_sessions s
-                    LEFT JOIN ai_learning_session_words w ON s.id = w.session_id
-                    WHERE s.id = ?
-                    GROUP BY s.id
-                ''', (session_id,))
+                cursor.execute(stmts.AI_SESSION_SUMMARY, {'session_id': session_id})
                 
                 row = cursor.fetchone()
                 if row:
-                    summary = dict(row)
+                    summary = row.to_dict()
                     
                     # Get word-by-word breakdown
-                    cursor.execute('''
-                        SELECT word_text, difficulty_level, is_correct, user_response, response_time_ms
-                        FROM ai_learning_session_words 
-                        WHERE session_id = ?
-                        ORDER BY word_order
-                    ''', (session_id,))
+                    cursor.execute(stmts.AI_SESSION_WORDS_BREAKDOWN, {'session_id': session_id})
                     
-                    summary['words_breakdown'] = [dict(row) for row in cursor.fetchall()]
+                    summary['words_breakdown'] = [row.to_dict() for row in cursor.fetchall()]
                     return summary
                 return None
         except SQLAlchemyError as e:
@@ -2190,21 +2408,18 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 
                 # Check how many words user has in their vocabulary
-                cursor.execute('SELECT COUNT(*) as count FROM vocabulary WHERE user_id = ?', (user_id,))
+                cursor.execute(stmts.USER_WORD_COUNT, {'owner_id': user_id})
                 user_word_count = cursor.fetchone()['count']
                 print(f"Debug: User {user_id} has {user_word_count} words in their vocabulary")
                 
                 # Check what difficulty values exist in user's vocabulary
-                cursor.execute('SELECT DISTINCT difficulty FROM vocabulary WHERE user_id = ?', (user_id,))
+                cursor.execute(stmts.USER_DIFFICULTIES, {'owner_id': user_id})
                 available_difficulties = [row['difficulty'] for row in cursor.fetchall()]
                 print(f"Debug: Available difficulties in user vocabulary: {available_difficulties}")
                 
                 if exclude_mastered_words:
                     # Count words that are not mastered (mastery_level < 3 means not "already know")
-                    cursor.execute('''
-                        SELECT COUNT(*) as count FROM vocabulary 
-                        WHERE user_id = ? AND mastery_level < 3
-                    ''', (user_id,))
+                    cursor.execute(stmts.USER_UNMASTERED_COUNT, {'owner_id': user_id})
                     available_words = cursor.fetchone()['count']
                     print(f"Debug: {available_words} words available for learning (excluding mastered)")
                 
@@ -2218,56 +2433,21 @@ class DatabaseManager:
                     print("Debug: No words found in user vocabulary")
                     return []
                 
-                # Build the query to get words from user's vocabulary
-                if exclude_mastered_words:
-                    # Exclude words with mastery_level 3 (considered "already know")
-                    query = '''
-                        SELECT * FROM vocabulary 
-                        WHERE user_id = ? AND difficulty = ? AND mastery_level < 3
-                        ORDER BY RANDOM()
-                        LIMIT ?
-                    '''
-                    params = (user_id, target_difficulty, limit)
-                else:
-                    # Include all words regardless of mastery level
-                    query = '''
-                        SELECT * FROM vocabulary 
-                        WHERE user_id = ? AND difficulty = ?
-                        ORDER BY RANDOM()
-                        LIMIT ?
-                    '''
-                    params = (user_id, target_difficulty, limit)
-                
+                # Words from user's vocabulary; mastery_level 3 is considered "already know"
+                params = {'owner_id': user_id, 'difficulty': target_difficulty, 'limit': limit}
                 print(f"Debug: Querying user vocabulary for difficulty '{target_difficulty}', excluding mastered: {exclude_mastered_words}")
-                cursor.execute(query, params)
-                results = [dict(row) for row in cursor.fetchall()]
+                cursor.execute(stmts.AI_LEARNING_WORDS[exclude_mastered_words, True], params)
+                results = [row.to_dict() for row in cursor.fetchall()]
                 print(f"Debug: Found {len(results)} words for difficulty '{target_difficulty}'")
                 
                 # If no words found for specific difficulty, try getting any available words from user vocabulary
-                if not results and exclude_mastered_words:
-                    print(f"Debug: No words found for difficulty '{target_difficulty}', trying any difficulty (excluding mastered)")
-                    query = '''
-                        SELECT * FROM vocabulary 
-                        WHERE user_id = ? AND mastery_level < 3
-                        ORDER BY RANDOM()
-                        LIMIT ?
-                    '''
-                    params = (user_id, limit)
-                    cursor.execute(query, params)
-                    results = [dict(row) for row in cursor.fetchall()]
-                    print(f"Debug: Found {len(results)} words when trying any difficulty (excluding mastered)")
-                elif not results and not exclude_mastered_words:
-                    print(f"Debug: No words found for difficulty '{target_difficulty}', trying any difficulty (including mastered)")
-                    query = '''
-                        SELECT * FROM vocabulary 
-                        WHERE user_id = ?
-                        ORDER BY RANDOM()
-                        LIMIT ?
-                    '''
-                    params = (user_id, limit)
-                    cursor.execute(query, params)
-                    results = [dict(row) for row in cursor.fetchall()]
-                    print(f"Debug: Found {len(results)} words when trying any difficulty (including mastered)")
+                if not results:
+                    mastered = 'excluding' if exclude_mastered_words else 'including'
+                    print(f"Debug: No words found for difficulty '{target_difficulty}', trying any difficulty ({mastered} mastered)")
+                    cursor.execute(stmts.AI_LEARNING_WORDS[exclude_mastered_words, False],
+                                   {'owner_id': user_id, 'limit': limit})
+                    results = [row.to_dict() for row in cursor.fetchall()]
+                    print(f"Debug: Found {len(results)} words when trying any difficulty ({mastered} mastered)")
                 
                 return results
                 
@@ -2333,18 +2513,8 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT *, 
-                           julianday('now') - julianday(last_reviewed) as days_ago,
-                           ROUND((times_correct * 1.0 / NULLIF(times_reviewed, 0)) * 100, 1) as accuracy_percent
-                    FROM vocabulary 
-                    WHERE user_id = ? 
-                      AND last_reviewed IS NOT NULL 
-                      AND julianday('now') - julianday(last_reviewed) <= ?
-                    ORDER BY last_reviewed DESC
-                    LIMIT 50
-                ''', (user_id, days))
-                return [dict(row) for row in cursor.fetchall()]
+                cursor.execute(stmts.RECENT_WORDS, {'owner_id': user_id, 'days': days})
+                return [row.to_dict() for row in cursor.fetchall()]
         except Exception as e:
             print(f"Error getting recent words: {e}")
             return []
@@ -2360,7 +2530,7 @@ class DatabaseManager:
         }
         
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(read_only=True) as conn:
                 cursor = conn.cursor()
                 
                 # Words that need attention (low accuracy with multiple reviews)
@@ -2374,7 +2544,7 @@ class DatabaseManager:
                     ORDER BY times_reviewed DESC, accuracy ASC
                     LIMIT 10
                 ''', (user_id,))
-                insights['struggling_words'] = [dict(row) for row in cursor.fetchall()]
+                insights['struggling_words'] = [row.to_dict() for row in cursor.fetchall()]
                 insights['needs_review_count'] = len(insights['struggling_words'])
                 
                 # Progress over time (study sessions)
@@ -2390,7 +2560,7 @@ class DatabaseManager:
                     ORDER BY date DESC
                     LIMIT 14
                 ''', (user_id,))
-                insights['daily_progress'] = [dict(row) for row in cursor.fetchall()]
+                insights['daily_progress'] = [row.to_dict() for row in cursor.fetchall()]
                 
                 # Total mastered words
                 cursor.execute('SELECT COUNT(*) as mastered FROM vocabulary WHERE user_id = ? AND mastery_level = 3', (user_id,))
@@ -2418,26 +2588,10 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 
                 # Prioritize words user struggles with, then new words, then general review
-                cursor.execute('''
-                    SELECT *, 
-                           (times_correct * 1.0 / NULLIF(times_reviewed, 0)) as accuracy,
-                           COALESCE(julianday('now') - julianday(last_reviewed), 999) as days_since_review,
-                           CASE 
-                               WHEN times_reviewed = 0 THEN 1  -- New words first
-                               WHEN (times_correct * 1.0 / NULLIF(times_reviewed, 0)) < 0.6 AND times_reviewed >= 2 THEN 2  -- Struggling words  
-                               WHEN julianday('now') - julianday(last_reviewed) > 7 THEN 3  -- Haven't seen in a week
-                               WHEN mastery_level < 2 THEN 4  -- Still learning
-                               ELSE 5
-                           END as priority
-                    FROM vocabulary 
-                    WHERE user_id = ? 
-                      AND mastery_level < 3  -- Exclude fully mastered words
-                      AND (difficulty = ? OR difficulty = '')
-                    ORDER BY priority ASC, RANDOM()
-                    LIMIT ?
-                ''', (user_id, difficulty, limit))
+                cursor.execute(stmts.SMART_AI_LEARNING_WORDS,
+                               {'owner_id': user_id, 'difficulty': difficulty, 'limit': limit})
                 
-                return [dict(row) for row in cursor.fetchall()]
+                return [row.to_dict() for row in cursor.fetchall()]
         except Exception as e:
             print(f"Error getting smart words for AI learning: {e}")
             return []
@@ -28,6 +28,7 @@ WORKERS="${WORKERS:-1}"
 
 echo "🚀 Starting gunicorn with $WORKERS worker(s)..."
 exec gunicorn fastapi_web_flashcards:app \
+    --config gunicorn.conf.py \
     --bind 0.0.0.0:5001 \
     --workers "$WORKERS" \
     --worker-class uvicorn.workers.UvicornWorker \
@@ -16,6 +16,31 @@ from typing import Optional, Dict, Any
 from fastapi import HTTPException, Cookie, Header, Query, Request, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from database_manager import DatabaseManager, User
+import _db_statements as stmts
+from _db_unit_of_work import current_unit_of_work
+from _executors import run_db
+
+
+def session_user_from_row(row) -> Optional[User]:
+    """Build the User for a stmts.VALIDATE_SESSION row (None if no row).
+
+    Shared with AsyncDatabaseManager.validate_session.
+    """
+    if not row:
+        return None
+    return User(
+        user_id=row['id'],
+        email=row['email'],
+        username=row['username'],
+        first_name=row['first_name'],
+        last_name=row['last_name'],
+        profile_type=row['profile_type'],
+        year_of_birth=row['year_of_birth'],
+        class_year=row['class_year'],
+        created_at=row['created_at'],
+        last_login=row['last_login'],
+        is_active=row['is_active']
+    )
 
 
 class AuthenticationManager:
@@ -47,30 +72,8 @@ class AuthenticationManager:
         
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT u.id, u.email, u.username, u.first_name, u.last_name, u.profile_type, u.year_of_birth, 
-                       u.class_year, u.created_at, u.last_login, u.is_active, s.expires_at
-                FROM user_sessions s
-                JOIN users u ON s.user_id = u.id
-                WHERE s.session_token = ? AND s.expires_at > ?
-            ''', (session_token, datetime.now()))
-            
-            row = cursor.fetchone()
-            if row:
-                return User(
-                    user_id=row['id'],
-                    email=row['email'],
-                    username=row['username'],
-                    first_name=row['first_name'],
-                    last_name=row['last_name'],
-                    profile_type=row['profile_type'],
-                    year_of_birth=row['year_of_birth'],
-                    class_year=row['class_year'],
-                    created_at=row['created_at'],
-                    last_login=row['last_login'],
-                    is_active=row['is_active']
-                )
-        return None
+            cursor.execute(stmts.VALIDATE_SESSION, {'token': session_token, 'now': datetime.now()})
+            return session_user_from_row(cursor.fetchone())
     
     def delete_session(self, session_token: str) -> bool:
         """Delete a session."""
@@ -105,8 +108,11 @@ class UserPreferences:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT OR REPLACE INTO user_preferences (user_id, preference_key, preference_value)
+                    INSERT INTO user_preferences (user_id, preference_key, preference_value)
                     VALUES (?, ?, ?)
+                    ON CONFLICT (user_id, preference_key) DO UPDATE SET
+                        preference_value = EXCLUDED.preference_value,
+                        updated_at = CURRENT_TIMESTAMP
                 ''', (user_id, key, value))
                 conn.commit()
                 return True
@@ -129,11 +135,13 @@ class UserPreferences:
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
-                for key, value in preferences.items():
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO user_preferences (user_id, preference_key, preference_value)
-                        VALUES (?, ?, ?)
-                    ''', (user_id, key, str(value)))
+                cursor.executemany('''
+                    INSERT INTO user_preferences (user_id, preference_key, preference_value)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (user_id, preference_key) DO UPDATE SET
+                        preference_value = EXCLUDED.preference_value,
+                        updated_at = CURRENT_TIMESTAMP
+                ''', [(user_id, key, str(value)) for key, value in preferences.items()])
                 conn.commit()
                 return True
         except Exception:
@@ -143,12 +151,27 @@ class UserPreferences:
 # Global authentication manager and preferences
 auth_manager: Optional[AuthenticationManager] = None
 user_preferences: Optional[UserPreferences] = None
+_async_db_manager = None  # AsyncDatabaseManager, when the app provides one
 
-def init_authentication(db_manager: DatabaseManager):
+def init_authentication(db_manager: DatabaseManager, async_db_manager=None):
     """Initialize authentication for FastAPI app."""
-    global auth_manager, user_preferences
+    global auth_manager, user_preferences, _async_db_manager
     auth_manager = AuthenticationManager(db_manager)
     user_preferences = UserPreferences(db_manager)
+    _async_db_manager = async_db_manager
+
+async def validate_session_token(token: Optional[str]) -> Optional[User]:
+    """Validate a session token without blocking the event loop."""
+    if not token or not auth_manager:
+        return None
+    if _async_db_manager is not None and _async_db_manager.native:
+        user = await _async_db_manager.validate_session(token)
+    else:
+        user = await run_db(auth_manager.validate_session, token)
+    unit = current_unit_of_work()
+    if unit is not None and user is not None:
+        unit.user_id = user.user_id  # read-your-writes routing
+    return user
 
 # FastAPI Dependencies
 security = HTTPBearer(auto_error=False)
@@ -178,9 +201,7 @@ async def get_current_user(
     token: Optional[str] = Depends(get_session_token)
 ) -> Optional[User]:
     """Get current user from session token."""
-    if not token or not auth_manager:
-        return None
-    return auth_manager.validate_session(token)
+    return await validate_session_token(token)
 
 async def require_authentication(
     current_user: Optional[User] = Depends(get_current_user)
@@ -198,7 +219,7 @@ async def require_admin(
     current_user: User = Depends(require_authentication)
 ) -> User:
     """Require user to be admin."""
-    if not auth_manager or not auth_manager.db_manager.is_user_admin(current_user.user_id):
+    if not auth_manager or not await run_db(auth_manager.db_manager.is_user_admin, current_user.user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
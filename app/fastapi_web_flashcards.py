@@ -26,17 +26,32 @@ from fastapi.security import HTTPBearer
 import re
 import os
 import json
+import asyncio
 import requests
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional, Union
 import shutil
 from database_manager import DatabaseManager, initialize_multiuser_from_text_file, migrate_date_of_birth_to_year_of_birth, User
 from fastapi_auth import (
     init_authentication, get_current_user, require_authentication, require_admin, 
-    get_session_token, auth_manager, user_preferences, RequestState, request_state
+    get_session_token, auth_manager, user_preferences, RequestState, request_state,
+    validate_session_token
 )
+from async_database_manager import AsyncDatabaseManager
 from pydantic import BaseModel, field_validator
 from settings import settings
+import _db_metrics
+from _db_unit_of_work import release_unit_of_work
+from _executors import db_executor, executor_stats, run_ai, run_db
+from _db_adapter import get_translation_cache_stats
+from _admission import AdmissionController, Rejected, classify
+from _db_deadline import DeadlineExceeded, deadline_for_path, raise_if_exceeded, request_deadline
+from _db_pool import pool_limits, pool_stats
+from _sqlite_backup import SQLiteBackupScheduler, backup_enabled
+from _sqlite_maintenance import SQLiteMaintenance
+from _sqlite_checkpointer import WALCheckpointer
+from database import _is_network_filesystem, engine, set_inline_wal_checkpoints
 
 # Google OAuth (conditional import — only used when configured)
 _google_oauth = None
@@ -48,11 +63,62 @@ except ImportError:
 import html
 import secrets as _secrets
 
+# ─── Background DB maintenance ──────────────────────────────────
+# Local-disk SQLite mode: snapshot to SQLITE_BACKUP_PATH (see _sqlite_backup)
+sqlite_backup = (
+    SQLiteBackupScheduler(settings.SQLITE_BACKUP_INTERVAL_SECONDS) if backup_enabled() else None
+)
+# Idle-time ANALYZE / PRAGMA optimize / incremental_vacuum (see _sqlite_maintenance)
+sqlite_maintenance = (
+    SQLiteMaintenance(
+        engine, settings.SQLITE_MAINTENANCE_INTERVAL_SECONDS,
+        is_idle=lambda: db_executor.active == 0 and db_executor.queued == 0,
+    )
+    if engine.dialect.name == "sqlite" and settings.SQLITE_MAINTENANCE_INTERVAL_SECONDS > 0
+    else None
+)
+# Off-request-path WAL checkpoints (see _sqlite_checkpointer); WAL mode only
+wal_checkpointer = (
+    WALCheckpointer(
+        settings.db_path,
+        settings.SQLITE_CHECKPOINT_INTERVAL_SECONDS,
+        settings.SQLITE_CHECKPOINT_WAL_BYTES,
+        settings.SQLITE_CHECKPOINT_TRUNCATE_BYTES,
+        is_idle=lambda: db_executor.active == 0 and db_executor.queued == 0,
+    )
+    if engine.dialect.name == "sqlite" and settings.SQLITE_WAL_CHECKPOINTER
+    and not _is_network_filesystem(settings.db_path)
+    else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if sqlite_backup is not None:
+        sqlite_backup.start()
+    if sqlite_maintenance is not None:
+        sqlite_maintenance.start()
+    if wal_checkpointer is not None:
+        set_inline_wal_checkpoints(False)
+        wal_checkpointer.start()
+    yield
+    if wal_checkpointer is not None:
+        await asyncio.to_thread(wal_checkpointer.stop)
+        set_inline_wal_checkpoints(True)
+    if sqlite_maintenance is not None:
+        await asyncio.to_thread(sqlite_maintenance.stop)
+    if sqlite_backup is not None:
+        # Final snapshot for single-process runs; under gunicorn the master
+        # takes another once all workers have stopped (gunicorn.conf.py)
+        await asyncio.to_thread(sqlite_backup.stop)
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="A web application for managing vocabulary flashcards with multi-user support",
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # Add session middleware with secure cookie settings
@@ -134,7 +200,8 @@ templates.env.globals["google_oauth_enabled"] = False  # Updated after settings
 db_manager = DatabaseManager()  # Uses DATABASE_URL from settings
 
 # Initialize authentication
-init_authentication(db_manager)
+async_db_manager = AsyncDatabaseManager.from_settings(db_manager)  # hot-path methods
+init_authentication(db_manager, async_db_manager)
 
 # ─── Google OAuth Setup ─────────────────────────────────────────
 if _authlib_available and settings.google_oauth_configured:
@@ -229,7 +296,8 @@ Only respond with valid JSON, no additional text."""
             "temperature": 0.3
         }
         
-        # Make the HTTP request
+        # Make the HTTP request (without holding a DB connection)
+        release_unit_of_work()
         response = requests.post(url, headers=headers, json=data, timeout=30)
         
         if response.status_code == 200:
@@ -402,6 +470,7 @@ Rules:
             "temperature": 0.7
         }
 
+        release_unit_of_work()
         response = requests.post(url, headers=headers, json=data, timeout=60)
 
         if response.status_code == 200:
@@ -528,7 +597,7 @@ async def set_request_state(request: Request, call_next):
     try:
         token = await get_session_token(request)
         if token and auth_manager:
-            user = auth_manager.validate_session(token)
+            user = await validate_session_token(token)
             request_state.current_user = user
             request_state.session_token = token
     except Exception:
@@ -537,6 +606,68 @@ async def set_request_state(request: Request, call_next):
     response = await call_next(request)
     return response
 
+
+# ─── Request-scoped DB Unit of Work ─────────────────────────────
+# Registered after set_request_state so it wraps it: session validation and
+# every db_manager call in the request share one connection and one commit.
+# The final commit runs on the DB pool, not the event loop.
+@app.middleware("http")
+async def db_unit_of_work(request: Request, call_next):
+    if not settings.DB_UNIT_OF_WORK or request.url.path.startswith("/static"):
+        return await call_next(request)
+    async with db_manager.async_unit_of_work(run_db):
+        return await call_next(request)
+
+
+# ─── Request Deadline ───────────────────────────────────────────
+# Wraps the unit of work; statements get the remaining budget (_db_deadline).
+# DeadlineExceeded is turned into a 504 here rather than by an exception
+# handler: handlers run inside the unit of work, which would then commit.
+# A DB method that swallowed it still fails the request (raise_if_exceeded).
+@app.middleware("http")
+async def db_request_deadline(request: Request, call_next):
+    try:
+        with request_deadline(deadline_for_path(request.url.path)):
+            response = await call_next(request)
+            raise_if_exceeded()
+            return response
+    except DeadlineExceeded:
+        return JSONResponse(content={'detail': 'Request took too long'}, status_code=504)
+
+
+# ─── Admission Control ──────────────────────────────────────────
+# Registered last so it runs first: a shed request never validates its
+# session or checks out a connection.
+admission = (
+    AdmissionController(
+        settings.DB_ADMISSION_MAX_IN_FLIGHT or sum(pool_limits(
+            engines_per_worker=2 if settings.DB_ASYNC_ENGINE else 1,
+            is_sqlite=settings.DATABASE_URL.startswith("sqlite"),
+        )),
+        settings.DB_ADMISSION_QUEUE_TIMEOUT_MS,
+    )
+    if settings.DB_ADMISSION_CONTROL else None
+)
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    priority = classify(request.url.path) if admission is not None else None
+    if priority is None:
+        return await call_next(request)
+    try:
+        await admission.acquire(priority)
+    except Rejected as e:
+        return JSONResponse(
+            content={'detail': 'Server is busy, please retry shortly'},
+            status_code=503,
+            headers={'Retry-After': str(e.retry_after)},
+        )
+    try:
+        return await call_next(request)
+    finally:
+        admission.release()
+
 # Helper functions
 def require_admin_sync():
     """Ensure current user is an admin. Returns user_id if admin, raises exception otherwise."""
@@ -767,6 +898,7 @@ If you cannot suggest a word that meets ALL requirements, respond with:
             print(f"🤖 AI request attempt {retry_count + 1}/{max_retries} with temperature {temperature}")
             
             try:
+                release_unit_of_work()
                 response = requests.post(url, headers=headers, json=data, timeout=30)
                 response.raise_for_status()
                 
@@ -835,7 +967,7 @@ async def login_page(request: Request, current_user: Optional[User] = Depends(ge
     """Login page."""
     if current_user:
         return RedirectResponse(url="/", status_code=302)
-    ctx = get_template_context(request, current_user)
+    ctx = await run_db(get_template_context, request, current_user)
     ctx["active_page"] = "login"
     ctx["show_navbar"] = False
     return templates.TemplateResponse("login.html", ctx)
@@ -845,7 +977,7 @@ async def register_page(request: Request, current_user: Optional[User] = Depends
     """Registration page."""
     if current_user:
         return RedirectResponse(url="/", status_code=302)
-    ctx = get_template_context(request, current_user)
+    ctx = await run_db(get_template_context, request, current_user)
     ctx["active_page"] = "register"
     ctx["show_navbar"] = False
     return templates.TemplateResponse("register.html", ctx)
@@ -907,7 +1039,8 @@ async def register(
         raise HTTPException(status_code=400, detail='Invalid email format')
     
     # Create user
-    success, message, user_id = db_manager.create_user(
+    success, message, user_id = await run_db(
+        db_manager.create_user,
         email=email.strip().lower(),
         username=username.strip(),
         password=password
@@ -945,13 +1078,13 @@ async def login(
         raise HTTPException(status_code=400, detail='Email/username and password are required')
     
     # Authenticate user
-    success, message, user = db_manager.authenticate_user(login_identifier.strip().lower(), password)
+    success, message, user = await run_db(db_manager.authenticate_user, login_identifier.strip().lower(), password)
     
     if success and user and auth_manager:
         # Create session
         ip_address = request.client.host if request.client else None
         user_agent = request.headers.get('user-agent')
-        session_token = auth_manager.create_session(user, ip_address, user_agent)
+        session_token = await run_db(auth_manager.create_session, user, ip_address, user_agent)
         
         # Update last login
         # db_manager.update_last_login(user.user_id)  # Method may not exist, commenting out
@@ -981,7 +1114,7 @@ async def login(
 async def logout(request: Request, session_token: Optional[str] = Depends(get_session_token)):
     """API endpoint to logout user."""
     if session_token and auth_manager:
-        auth_manager.delete_session(session_token)
+        await run_db(auth_manager.delete_session, session_token)
     
     response = JSONResponse(content={'success': True, 'message': 'Logged out successfully'})
     response.delete_cookie("session_token")
@@ -991,7 +1124,7 @@ async def logout(request: Request, session_token: Optional[str] = Depends(get_se
 async def logout_redirect(request: Request, session_token: Optional[str] = Depends(get_session_token)):
     """Logout and redirect to login page."""
     if session_token and auth_manager:
-        auth_manager.delete_session(session_token)
+        await run_db(auth_manager.delete_session, session_token)
     
     response = RedirectResponse(url="/login", status_code=302)
     response.delete_cookie("session_token")
@@ -1028,7 +1161,8 @@ async def google_callback(request: Request):
         return RedirectResponse(url="/login?error=google_no_email", status_code=302)
 
     # Create or fetch the local user
-    success, message, user = db_manager.create_or_get_oauth_user(
+    success, message, user = await run_db(
+        db_manager.create_or_get_oauth_user,
         email=email,
         oauth_provider='google',
         oauth_id=user_info.get('sub', ''),
@@ -1043,7 +1177,7 @@ async def google_callback(request: Request):
     # Create session (same as normal login)
     ip_address = request.client.host if request.client else None
     user_agent = request.headers.get('user-agent')
-    session_token = auth_manager.create_session(user, ip_address, user_agent)
+    session_token = await run_db(auth_manager.create_session, user, ip_address, user_agent)
 
     response = RedirectResponse(url="/", status_code=302)
     response.set_cookie(
@@ -1065,10 +1199,10 @@ async def index(request: Request, current_user: Optional[User] = Depends(get_cur
         return RedirectResponse(url="/login", status_code=302)
     
     # Get user's words for the template
-    words = db_manager.get_user_words(current_user.user_id)
-    is_user_admin = is_admin_sync()
+    words = await async_db_manager.get_user_words(current_user.user_id)
+    is_user_admin = await run_db(is_admin_sync)
     
-    context = get_template_context(request, current_user)
+    context = await run_db(get_template_context, request, current_user)
     context.update({
         "words": words,
         "total_words": len(words),
@@ -1078,35 +1212,81 @@ async def index(request: Request, current_user: Optional[User] = Depends(get_cur
     context["active_page"] = "flashcards"
     return templates.TemplateResponse("flashcards.html", context)
 
+# ── vocabulary ETags ──────────────────────────────────────────
+# Word endpoints are tagged with the user's vocabulary version, which every
+# word / review / like change bumps.  The version is read before the data, so
+# a write racing the request can only make the tag older than the body (the
+# next request then refetches), never newer.
+VOCAB_CACHE_CONTROL = 'private, no-cache'
+
+
+def vocab_etag(user_id: int, version: int, *variant) -> str:
+    tag = '-'.join(str(part) for part in ('vocab', user_id, version) + variant)
+    return f'W/"{tag}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match lists ``etag`` (weak comparison)."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(',')]
+    return '*' in candidates or etag.removeprefix('W/') in (c.removeprefix('W/') for c in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': VOCAB_CACHE_CONTROL})
+
+
+def vocab_json(content: Dict[str, Any], etag: str) -> JSONResponse:
+    return JSONResponse(content=content, headers={'ETag': etag, 'Cache-Control': VOCAB_CACHE_CONTROL})
+
+
 @app.get('/api/words')
 async def get_words(
+    request: Request,
     current_user: User = Depends(require_authentication),
     search: Optional[str] = Query(None),
     word_type: Optional[str] = Query(None),
-    limit: Optional[int] = Query(None),
-    offset: Optional[int] = Query(0),
+    limit: Optional[int] = Query(None, ge=0),
+    offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     include_hidden: bool = Query(False)
 ):
-    """API endpoint to get user's vocabulary words."""
-    words = db_manager.get_user_words(current_user.user_id)
-    
-    # Apply filtering manually since the method doesn't support these parameters
-    if search:
-        words = [w for w in words if search.lower() in w.get('word', '').lower()]
-    
-    if word_type:
-        words = [w for w in words if w.get('word_type', '').lower() == word_type.lower()]
-    
-    if not include_hidden:
-        words = [w for w in words if not w.get('is_hidden', False)]
+    """API endpoint to get user's vocabulary words.
+
+    Filtering and paging run in SQL; ``search`` is a full-text search of
+    word, definition and example, ranked best match first.  With ``limit``,
+    ``next_cursor`` is the token for the following page (pass it back as
+    ``cursor``), or null on the last page.
+    """
+    version = await async_db_manager.get_vocab_version(current_user.user_id)
+    etag = vocab_etag(current_user.user_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    # Apply pagination
-    if offset:
-        words = words[offset:]
-    if limit:
-        words = words[:limit]
+    try:
+        words, next_cursor = await async_db_manager.get_user_words_page(
+            current_user.user_id, search=search, word_type=word_type,
+            include_hidden=include_hidden, limit=limit, offset=offset, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid cursor')
     
-    return JSONResponse(content={'success': True, 'words': words})
+    return vocab_json({'success': True, 'words': words, 'next_cursor': next_cursor}, etag)
+
+@app.get('/api/words/fuzzy')
+async def fuzzy_search_words(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(require_authentication),
+):
+    """Typo-tolerant word search: "abberant" finds "aberrant".
+
+    Returns the closest of the user's words and of the base vocabulary,
+    ranked by trigram similarity.
+    """
+    results = await run_db(db_manager.fuzzy_search_words, current_user.user_id, q, limit)
+    return JSONResponse(content={'success': True, **results})
 
 @app.post('/api/words')
 async def add_word(data: WordRequest, current_user: User = Depends(require_authentication)):
@@ -1130,12 +1310,12 @@ async def add_word(data: WordRequest, current_user: User = Depends(require_authe
         raise HTTPException(status_code=400, detail='Example is too long (max 500 characters)')
     
     # Check if word already exists for this user
-    existing_words = db_manager.get_user_words(current_user.user_id)
+    existing_words = await async_db_manager.get_user_words(current_user.user_id)
     if existing_words and any(w['word'].lower() == word.lower() for w in existing_words):
         raise HTTPException(status_code=400, detail='Word already exists in your vocabulary')
     
     # Add word
-    success, message = db_manager.add_user_word(current_user.user_id, word, word_type, definition, example)
+    success, message = await run_db(db_manager.add_user_word, current_user.user_id, word, word_type, definition, example)
     
     if success:
         return JSONResponse(content={'success': True, 'message': 'Word added successfully'})
@@ -1145,7 +1325,7 @@ async def add_word(data: WordRequest, current_user: User = Depends(require_authe
 @app.delete('/api/words/{word_id}')
 async def delete_word(word_id: int, current_user: User = Depends(require_authentication)):
     """API endpoint to delete a word."""
-    success, message = db_manager.remove_user_word(current_user.user_id, word_id)
+    success, message = await run_db(db_manager.remove_user_word, current_user.user_id, word_id)
     
     if success:
         return JSONResponse(content={'success': True, 'message': 'Word deleted successfully'})
@@ -1156,7 +1336,7 @@ async def delete_word(word_id: int, current_user: User = Depends(require_authent
 async def update_word(word_id: int, data: WordUpdateRequest, current_user: User = Depends(require_authentication)):
     """API endpoint to update a word."""
     # Get current word to verify ownership
-    words = db_manager.get_user_words(current_user.user_id)
+    words = await async_db_manager.get_user_words(current_user.user_id)
     word = next((w for w in words if w['id'] == word_id), None)
     
     if not word:
@@ -1168,7 +1348,7 @@ async def update_word(word_id: int, data: WordUpdateRequest, current_user: User
     new_definition = sanitize_input(data.definition) if data.definition is not None else word['definition']
     new_example = sanitize_input(data.example) if data.example is not None else word['example']
     
-    success, message = db_manager.update_user_word(current_user.user_id, word_id, new_word, new_type, new_definition, new_example)
+    success, message = await run_db(db_manager.update_user_word, current_user.user_id, word_id, new_word, new_type, new_definition, new_example)
     
     if success:
         return JSONResponse(content={'success': True, 'message': 'Word updated successfully'})
@@ -1179,7 +1359,7 @@ async def update_word(word_id: int, data: WordUpdateRequest, current_user: User
 @app.post('/api/words/{word_id}/like')
 async def like_word(word_id: int, current_user: User = Depends(require_authentication)):
     """Like a word."""
-    success, message = db_manager.like_word(current_user.user_id, word_id)
+    success, message = await async_db_manager.like_word(current_user.user_id, word_id)
     
     if success:
         return JSONResponse(content={'success': True, 'message': message})
@@ -1189,7 +1369,7 @@ async def like_word(word_id: int, current_user: User = Depends(require_authentic
 @app.post('/api/words/{word_id}/unlike')
 async def unlike_word(word_id: int, current_user: User = Depends(require_authentication)):
     """Unlike a word."""
-    success, message = db_manager.unlike_word(current_user.user_id, word_id)
+    success, message = await async_db_manager.unlike_word(current_user.user_id, word_id)
     
     if success:
         return JSONResponse(content={'success': True, 'message': message})
@@ -1199,7 +1379,7 @@ async def unlike_word(word_id: int, current_user: User = Depends(require_authent
 @app.post('/api/words/{word_id}/hide')
 async def hide_word(word_id: int, current_user: User = Depends(require_authentication)):
     """Hide a word from user's vocabulary."""
-    success, message = db_manager.hide_word_for_user(current_user.user_id, word_id)
+    success, message = await async_db_manager.hide_word_for_user(current_user.user_id, word_id)
     
     if success:
         return JSONResponse(content={'success': True, 'message': message})
@@ -1209,7 +1389,7 @@ async def hide_word(word_id: int, current_user: User = Depends(require_authentic
 @app.post('/api/words/{word_id}/unhide')
 async def unhide_word(word_id: int, current_user: User = Depends(require_authentication)):
     """Unhide a word in user's vocabulary."""
-    success, message = db_manager.unhide_word_for_user(current_user.user_id, word_id)
+    success, message = await async_db_manager.unhide_word_for_user(current_user.user_id, word_id)
     
     if success:
         return JSONResponse(content={'success': True, 'message': message})
@@ -1230,20 +1410,20 @@ async def review_word(word_id: int, request: Request, current_user: User = Depen
     correct = bool(json_data['correct'])
     auto = bool(json_data.get('auto', True))
 
-    success, message = db_manager.record_word_review(current_user.user_id, word_id, correct)
+    success, message = await async_db_manager.record_word_review(current_user.user_id, word_id, correct)
 
     actions = []
     if success and auto:
         try:
             if correct:
                 # Correct answer: ease the difficulty and hide from active queue
-                db_manager.update_word_difficulty(current_user.user_id, word_id, 'easy')
-                db_manager.hide_word_for_user(current_user.user_id, word_id)
+                await async_db_manager.update_word_difficulty(current_user.user_id, word_id, 'easy')
+                await async_db_manager.hide_word_for_user(current_user.user_id, word_id)
                 actions.extend(['set_easy', 'hidden'])
             else:
                 # Incorrect answer: raise difficulty and keep visible
-                db_manager.update_word_difficulty(current_user.user_id, word_id, 'hard')
-                db_manager.unhide_word_for_user(current_user.user_id, word_id)
+                await async_db_manager.update_word_difficulty(current_user.user_id, word_id, 'hard')
+                await async_db_manager.unhide_word_for_user(current_user.user_id, word_id)
                 actions.extend(['set_hard', 'unhidden'])
         except Exception:
             # Don't fail the review if adjustments encounter issues
@@ -1257,8 +1437,8 @@ async def review_word(word_id: int, request: Request, current_user: User = Depen
 @app.post('/api/words/{word_id}/know')
 async def mark_word_known(word_id: int, current_user: User = Depends(require_authentication)):
     """Mark a word as known: set difficulty to easy and hide it."""
-    ok_diff, msg_diff = db_manager.update_word_difficulty(current_user.user_id, word_id, 'easy')
-    ok_hide, msg_hide = db_manager.hide_word_for_user(current_user.user_id, word_id)
+    ok_diff, msg_diff = await async_db_manager.update_word_difficulty(current_user.user_id, word_id, 'easy')
+    ok_hide, msg_hide = await async_db_manager.hide_word_for_user(current_user.user_id, word_id)
 
     if ok_diff and ok_hide:
         return JSONResponse(content={'success': True, 'message': 'Marked as known (easy) and hidden'})
@@ -1285,7 +1465,7 @@ async def update_word_difficulty_api(word_id: int, request: Request, current_use
     if difficulty not in ['easy', 'medium', 'hard']:
         raise HTTPException(status_code=400, detail='Invalid difficulty level')
     
-    success, message = db_manager.update_word_difficulty(current_user.user_id, word_id, difficulty)
+    success, message = await async_db_manager.update_word_difficulty(current_user.user_id, word_id, difficulty)
     
     if success:
         return JSONResponse(content={'success': True, 'message': message})
@@ -1293,22 +1473,35 @@ async def update_word_difficulty_api(word_id: int, request: Request, current_use
         raise HTTPException(status_code=400, detail=message)
 
 @app.get('/api/user/liked-words')
-async def get_user_liked_words(current_user: User = Depends(require_authentication)):
+async def get_user_liked_words(request: Request, current_user: User = Depends(require_authentication)):
     """Get list of word IDs that the user has liked."""
-    liked_word_ids = db_manager.get_user_word_likes(current_user.user_id)
-    return JSONResponse(content={'liked_words': liked_word_ids})
+    version = await async_db_manager.get_vocab_version(current_user.user_id)
+    etag = vocab_etag(current_user.user_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    liked_word_ids = await run_db(db_manager.get_user_word_likes, current_user.user_id)
+    return vocab_json({'liked_words': liked_word_ids}, etag)
 
 @app.get('/api/most-liked-words')
 async def get_most_liked_words(current_user: User = Depends(require_authentication), limit: int = Query(50)):
     """Get the most liked words across all users."""
-    words = db_manager.get_most_liked_words(limit)
+    words = await run_db(db_manager.get_most_liked_words, limit)
     return JSONResponse(content={'words': words})
 
 @app.get('/api/user/recent-words')
-async def get_recent_words(current_user: User = Depends(require_authentication), days: int = Query(7)):
-    """API endpoint to get recently studied words."""
-    recent_words = db_manager.get_recent_words(current_user.user_id, days)
-    return JSONResponse(content={'success': True, 'recent_words': recent_words})
+async def get_recent_words(request: Request, current_user: User = Depends(require_authentication),
+                           days: int = Query(7)):
+    """API endpoint to get recently studied words.
+
+    The ETag also carries the UTC date, so words leaving the ``days`` window
+    are picked up at least daily (``days_ago`` in a 304'd body may be stale).
+    """
+    version = await async_db_manager.get_vocab_version(current_user.user_id)
+    etag = vocab_etag(current_user.user_id, version, datetime.now(timezone.utc).strftime('%Y%m%d'))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    recent_words = await run_db(db_manager.get_recent_words, current_user.user_id, days)
+    return vocab_json({'success': True, 'recent_words': recent_words}, etag)
 
 # Search and AI routes
 @app.get('/api/search/word/{word}')
@@ -1316,7 +1509,7 @@ async def search_word(word: str, current_user: User = Depends(require_authentica
     """API endpoint to search for word definition using OpenAI LLM."""
     try:
         # Use OpenAI to search for word definition
-        result = search_word_with_openai(word)
+        result = await run_ai(search_word_with_openai, word)
         
         # Check if there was an error
         if result.get("error"):
@@ -1354,10 +1547,10 @@ async def search_word(word: str, current_user: User = Depends(require_authentica
 async def ai_learning_page(request: Request, current_user: User = Depends(require_authentication)):
     """AI Learning page."""
     # Get user analysis data for the template
-    analysis = db_manager.analyze_user_learning_patterns(current_user.user_id)
-    is_user_admin = is_admin_sync()
+    analysis = await run_db(db_manager.analyze_user_learning_patterns, current_user.user_id)
+    is_user_admin = await run_db(is_admin_sync)
     
-    context = get_template_context(request, current_user)
+    context = await run_db(get_template_context, request, current_user)
     context.update({
         "user": current_user,
         "analysis": analysis,
@@ -1371,7 +1564,7 @@ async def ai_learning_page(request: Request, current_user: User = Depends(requir
 async def ai_suggest_word(current_user: User = Depends(require_authentication)):
     """API endpoint to get AI word suggestion."""
     try:
-        suggestion = get_ai_word_suggestion_based_on_patterns(current_user.user_id)
+        suggestion = await run_ai(get_ai_word_suggestion_based_on_patterns, current_user.user_id)
         return JSONResponse(content={
             'success': True,
             'suggestion': suggestion
@@ -1409,7 +1602,7 @@ async def start_ai_learning_session(request: Request, current_user: User = Depen
         if target_words < 5 or target_words > 50:
             raise HTTPException(status_code=400, detail='Target words must be between 5 and 50')
         
-        session_id = db_manager.create_ai_learning_session(current_user.user_id, target_words)
+        session_id = await async_db_manager.create_ai_learning_session(current_user.user_id, target_words)
         
         if session_id:
             return JSONResponse(content={'success': True, 'session_id': session_id})
@@ -1426,7 +1619,7 @@ async def get_next_session_word(session_id: int, current_user: User = Depends(re
     """Get next word for AI learning session."""
     try:
         # Get session details
-        session = db_manager.get_ai_learning_session(session_id)
+        session = await async_db_manager.get_ai_learning_session(session_id)
         if not session:
             print(f"Debug: Session {session_id} not found")
             raise HTTPException(status_code=404, detail='Session not found')
@@ -1444,7 +1637,7 @@ async def get_next_session_word(session_id: int, current_user: User = Depends(re
         print(f"Debug: Current difficulty for session {session_id}: {current_difficulty}")
         
         # Use smart word selection for AI learning sessions
-        available_words = db_manager.get_smart_words_for_ai_learning(current_user.user_id, limit=5)
+        available_words = await run_db(db_manager.get_smart_words_for_ai_learning, current_user.user_id, limit=5)
         
         if not available_words:
             print(f"Debug: No suitable words found for user {current_user.user_id}")
@@ -1459,8 +1652,8 @@ async def get_next_session_word(session_id: int, current_user: User = Depends(re
         
         # Add word to session
         word_order = session['words_completed'] + 1
-        success = db_manager.add_word_to_ai_session(
-            session_id, 
+        success = await async_db_manager.add_word_to_ai_session(
+            session_id,
             selected_word['word'],
             base_word_id=selected_word['id'],
             difficulty_level=word_difficulty,
@@ -1512,14 +1705,14 @@ async def submit_session_response(
             raise HTTPException(status_code=400, detail='Missing required fields')
         
         # Validate session ownership
-        session = db_manager.get_ai_learning_session(session_id)
+        session = await async_db_manager.get_ai_learning_session(session_id)
         if not session or session['user_id'] != current_user.user_id:
             raise HTTPException(status_code=404, detail='Session not found')
         
         is_correct = response == 'know'
         
         # Record the response
-        success = db_manager.record_ai_session_response(
+        success = await async_db_manager.record_ai_session_response(
             session_id, word, response, is_correct, response_time_ms
         )
         
@@ -1545,7 +1738,7 @@ async def submit_session_response(
             new_difficulty = session.get('current_difficulty', 'medium')
         
         # Update session
-        db_manager.update_ai_learning_session_progress(
+        await async_db_manager.update_ai_learning_session_progress(
             session_id, words_completed, words_correct, new_difficulty
         )
         
@@ -1585,18 +1778,18 @@ async def complete_ai_learning_session(
         total_time_seconds = json_data.get('total_time_seconds', 0)
         
         # Validate session ownership
-        session = db_manager.get_ai_learning_session(session_id)
+        session = await async_db_manager.get_ai_learning_session(session_id)
         if not session or session['user_id'] != current_user.user_id:
             raise HTTPException(status_code=404, detail='Session not found')
         
         # Complete the session
-        success = db_manager.complete_ai_learning_session(session_id, total_time_seconds)
+        success = await async_db_manager.complete_ai_learning_session(session_id, total_time_seconds)
         
         if not success:
             raise HTTPException(status_code=500, detail='Failed to complete session')
         
         # Get session summary
-        summary = db_manager.get_ai_session_summary(session_id)
+        summary = await async_db_manager.get_ai_session_summary(session_id)
         
         if summary:
             return JSONResponse(content={'success': True, 'summary': summary})
@@ -1616,10 +1809,10 @@ async def complete_ai_learning_session(
 async def manage_page(request: Request, current_user: User = Depends(require_authentication)):
     """Management page."""
     # Get user's words for the template
-    words = db_manager.get_user_words(current_user.user_id)
-    is_user_admin = is_admin_sync()
+    words = await async_db_manager.get_user_words(current_user.user_id)
+    is_user_admin = await run_db(is_admin_sync)
     
-    context = get_template_context(request, current_user)
+    context = await run_db(get_template_context, request, current_user)
     context.update({
         "words": words,
         "total_words": len(words),
@@ -1632,7 +1825,7 @@ async def manage_page(request: Request, current_user: User = Depends(require_aut
 @app.get('/profile', response_class=HTMLResponse)
 async def profile_page(request: Request, current_user: User = Depends(require_authentication)):
     """Profile page."""
-    ctx = get_template_context(request, current_user)
+    ctx = await run_db(get_template_context, request, current_user)
     ctx["active_page"] = "profile"
     return templates.TemplateResponse("profile.html", ctx)
 
@@ -1672,10 +1865,10 @@ async def app_info():
 async def admin_page(request: Request, current_user: User = Depends(require_admin)):
     """Admin page."""
     # Get system statistics and users for the template
-    stats = db_manager.get_system_stats()
-    users = db_manager.get_all_users()
+    stats = await run_db(db_manager.get_system_stats)
+    users = await run_db(db_manager.get_all_users)
     
-    context = get_template_context(request, current_user)
+    context = await run_db(get_template_context, request, current_user)
     context.update({
         "stats": stats,
         "users": users
@@ -1685,14 +1878,50 @@ async def admin_page(request: Request, current_user: User = Depends(require_admi
     return templates.TemplateResponse("admin.html", context)
 
 
+@app.get('/api/admin/db-stats')
+async def api_admin_db_stats(
+    limit: int = Query(20, ge=1, le=500),
+    current_user: User = Depends(require_admin),
+):
+    """DB statement latency, pools, caches and background jobs for this worker."""
+    statements = _db_metrics.snapshot(limit)
+    routes = _db_metrics.route_snapshot()
+    return JSONResponse(content={
+        'success': True,
+        'pid': os.getpid(),
+        'statements': statements,
+        'translation_cache': get_translation_cache_stats(),
+        'executors': executor_stats(),
+        'pools': pool_stats(),
+        'admission': admission.stats() if admission is not None else None,
+        'read_routing': {
+            'replica_configured': db_manager.has_read_replica,
+            'routes': routes,
+        },
+        'group_commit': db_manager.group_commit_stats(),
+        'sqlite_backup': sqlite_backup.stats() if sqlite_backup is not None else None,
+        'sqlite_maintenance': sqlite_maintenance.stats() if sqlite_maintenance is not None else None,
+        'wal_checkpointer': wal_checkpointer.stats() if wal_checkpointer is not None else None,
+        'vocab_cache': db_manager.vocab_cache.stats(),
+        'trigram_index': db_manager.trigram_index_stats(),
+    })
+
+
+@app.delete('/api/admin/db-stats')
+async def api_admin_reset_db_stats(current_user: User = Depends(require_admin)):
+    """Clear this worker's statement and read-routing counters."""
+    _db_metrics.reset()
+    return JSONResponse(content={'success': True, 'pid': os.getpid()})
+
+
 # Deep Dive / Word Explorer routes
 @app.get('/deep-dive', response_class=HTMLResponse)
 async def deep_dive_page(request: Request, current_user: User = Depends(require_authentication)):
     """Word Explorer deep-dive page."""
-    is_user_admin = is_admin_sync()
-    words = db_manager.get_user_words(current_user.user_id)
+    is_user_admin = await run_db(is_admin_sync)
+    words = await async_db_manager.get_user_words(current_user.user_id)
     
-    context = get_template_context(request, current_user)
+    context = await run_db(get_template_context, request, current_user)
     context.update({
         "is_admin": is_user_admin,
         "user_words": [w.get('word', '') for w in words] if words else [],
@@ -1711,7 +1940,7 @@ async def api_deep_dive_word(word: str, current_user: User = Depends(require_aut
         if not clean_word or len(clean_word) > 50:
             return JSONResponse(content={'success': False, 'error': 'Invalid word'}, status_code=400)
         
-        result = deep_dive_word_with_openai(clean_word)
+        result = await run_ai(deep_dive_word_with_openai, clean_word)
         
         if result.get('error'):
             return JSONResponse(content={'success': False, 'error': result['error']}, status_code=400)
@@ -1723,21 +1952,20 @@ async def api_deep_dive_word(word: str, current_user: User = Depends(require_aut
 # Startup function
 def initialize_app():
     """Initialize the application with database and load initial data if needed."""
-    # Load initial data if database is empty
+    # Load initial data if database is empty (an existence probe, not a
+    # COUNT(*) over every user's words, keeps cold starts cheap)
     with db_manager.get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) as count FROM vocabulary')
-        word_count = cursor.fetchone()['count']
+        cursor.execute('SELECT 1 FROM vocabulary LIMIT 1')
+        has_words = cursor.fetchone() is not None
     
-    if word_count == 0:
+    if not has_words:
         print("Database is empty. Checking for seed data...")
         if os.path.exists(text_file):
             print(f"Seed data found at: {text_file}")
             print("To load seed data, an admin user needs to be created first.")
         else:
             print(f"No seed data found at: {text_file}")
-    else:
-        print(f"📊 Database contains {word_count} words")
     
     print("🚀 Vocabulary Flashcard Web Application (FastAPI) initialized")
     print(f"🌐 Access the application at: http://{settings.HOST}:{settings.PORT}")
@@ -0,0 +1,13 @@
+"""
+Gunicorn server hooks (settings themselves are passed on the command line
+by entrypoint.sh)
+"""
+
+
+def on_exit(server):
+    # Runs in the master after every worker has exited, so this snapshot
+    # includes the last commit of every worker (see _sqlite_backup)
+    from _sqlite_backup import backup_on_exit
+
+    if backup_on_exit():
+        server.log.info("Final SQLite snapshot written")
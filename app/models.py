@@ -21,6 +21,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, relationship
 
@@ -62,6 +63,7 @@ class UserModel(Base):
     last_failed_login = Column(DateTime)
     oauth_provider = Column(String(50))  # e.g. "google"
     oauth_id = Column(String(255))  # Provider's unique user ID
+    vocab_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped on every word change
 
     # Relationships
     sessions = relationship("UserSessionModel", back_populates="user", cascade="all, delete-orphan")
@@ -126,6 +128,10 @@ class VocabularyModel(Base):
         Index("idx_vocab_word", "user_id", "word"),
         Index("idx_vocab_difficulty", "user_id", "difficulty"),
         Index("idx_vocab_base_word", "base_word_id"),
+        Index("idx_vocab_user_last_reviewed", "user_id", "last_reviewed"),
+        # ORDER BY word COLLATE NOCASE without a sort (SQLite only; the
+        # adapter drops COLLATE NOCASE on PostgreSQL, where idx_vocab_word fits)
+        Index("idx_vocab_user_word_nocase", "user_id", text("word COLLATE NOCASE")).ddl_if(dialect="sqlite"),
     )
 
 
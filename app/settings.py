@@ -20,7 +20,7 @@ import os
 import secrets
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -79,6 +79,43 @@ class Settings(BaseSettings):
     # ─── Database ───────────────────────────────────────────────
     DATABASE_URL: str = ""  # validated below — required in production
     DB_TIMEOUT: int = 30  # SQLite connection timeout in seconds
+    DB_BUSY_TIMEOUT_MS: int = 1000  # SQLite busy_timeout per attempt (WAL on local disk)
+    DB_BUSY_TIMEOUT_NON_WAL_MS: int = 60000  # busy_timeout without WAL (network FS, rollback journal)
+    DB_LOCK_RETRY_DEADLINE_MS: int = 15000  # give up retrying "database is locked" after this
+    DATABASE_READ_URL: str = ""  # optional read replica for read-only queries
+    DB_READ_STICKY_SECONDS: float = 5.0  # keep a user's reads on the primary after they write
+    DB_UNIT_OF_WORK: bool = True  # share one connection per request, commit once
+    DB_EXECUTOR_WORKERS: int = 16  # threads for blocking DB calls from async routes
+    AI_EXECUTOR_WORKERS: int = 8  # threads for Azure OpenAI calls (kept apart from DB)
+    DB_MAX_CONNECTIONS: int = 90  # PG connections this instance may open (all workers + engines); 0 = no cap
+    DB_POOL_SIZE: int = 0  # per-engine pool size; 0 = derived from executors and DB_MAX_CONNECTIONS
+    DB_POOL_MAX_OVERFLOW: int = -1  # per-engine overflow; -1 = derived
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a pooled connection before failing
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30  # ping a pooled connection on checkout only if idle this long
+    DB_ADMISSION_CONTROL: bool = True  # cap in-flight DB-bound requests per worker, 503 the overflow
+    DB_ADMISSION_MAX_IN_FLIGHT: int = 0  # 0 = primary pool size + overflow
+    DB_ADMISSION_QUEUE_TIMEOUT_MS: float = 2000  # longest a request waits for a slot (auth/reviews: 2x)
+    DB_REQUEST_DEADLINE_MS: int = 10000  # DB time budget per request (statement_timeout / SQLite interrupt); 0 = none
+    DB_ROUTE_DEADLINES_MS: Dict[str, int] = {  # path prefix -> budget, longest prefix wins
+        "/api/ai/": 90000,
+        "/api/deep-dive/": 90000,
+        "/api/admin/": 30000,
+        "/admin": 30000,
+    }
+    DB_ASYNC_ENGINE: bool = False  # await hot-path queries natively (aiosqlite / asyncpg)
+    DB_GROUP_COMMIT: bool = False  # SQLite: batch small writes into one transaction per window
+    DB_GROUP_COMMIT_WINDOW_MS: float = 2.0  # how long the writer collects a batch
+    DB_GROUP_COMMIT_MAX_BATCH: int = 64  # max write calls per transaction
+    VOCAB_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # per-worker LRU of users' word lists; 0 = off
+    TRIGRAM_INDEX_MAX_USERS: int = 500  # SQLite: users whose fuzzy-search trigram index each worker keeps
+    SQLITE_BACKUP_PATH: str = ""  # snapshot on durable storage; DATABASE_URL then lives on local disk
+    SQLITE_BACKUP_INTERVAL_SECONDS: int = 60  # how often changed data is copied to SQLITE_BACKUP_PATH
+    SQLITE_PRAGMA_PROFILE: str = "balanced"  # minimal | balanced | performance (mmap, temp_store, ...)
+    SQLITE_MAINTENANCE_INTERVAL_SECONDS: int = 3600  # ANALYZE / optimize / incremental_vacuum; 0 = off
+    SQLITE_WAL_CHECKPOINTER: bool = True  # checkpoint the WAL from a background thread, not in COMMIT
+    SQLITE_CHECKPOINT_INTERVAL_SECONDS: float = 30  # PASSIVE checkpoint at least this often if the WAL has frames
+    SQLITE_CHECKPOINT_WAL_BYTES: int = 4 * 1024 * 1024  # PASSIVE checkpoint once the WAL is this big
+    SQLITE_CHECKPOINT_TRUNCATE_BYTES: int = 64 * 1024 * 1024  # TRUNCATE (when idle) once the WAL is this big
 
     # ─── Azure OpenAI (optional) ────────────────────────────────
     AZURE_OPENAI_API_KEY: Optional[str] = None
@@ -105,6 +142,7 @@ class Settings(BaseSettings):
         secret_mappings = {
             "SECRET_KEY_FILE": "SECRET_KEY",
             "DATABASE_URL_FILE": "DATABASE_URL",
+            "DATABASE_READ_URL_FILE": "DATABASE_READ_URL",
             "AZURE_OPENAI_API_KEY_FILE": "AZURE_OPENAI_API_KEY",
             "GOOGLE_CLIENT_SECRET_FILE": "GOOGLE_CLIENT_SECRET",
         }
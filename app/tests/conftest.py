@@ -0,0 +1,86 @@
+"""
+Shared fixtures.  The app modules read their settings and build the engine at
+import time, so the environment is pointed at a throwaway SQLite database
+before any of them is imported.
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+
+_DATA_DIR = tempfile.mkdtemp(prefix="vocab-tests-")
+os.environ.update({
+    "APP_ENV": "development",
+    "DEBUG": "false",
+    "DATABASE_URL": f"sqlite:///{os.path.join(_DATA_DIR, 'vocabulary.db')}",
+    "DATABASE_READ_URL": "",
+    "SQLITE_BACKUP_PATH": "",
+    "DB_GROUP_COMMIT": "false",
+    "DB_ASYNC_ENGINE": "false",
+    "DB_ADMISSION_CONTROL": "false",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    import fastapi_web_flashcards
+    return fastapi_web_flashcards
+
+
+@pytest.fixture(scope="session")
+def client(app_module):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app_module.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def user(app_module, client):
+    """A fresh user with a session cookie set on ``client``; returns its id."""
+    name = f"u{uuid.uuid4().hex[:12]}"
+    ok, message, user_id = app_module.db_manager.create_user(f"{name}@example.com", name, "Passw0rd!23")
+    assert ok, message
+    # create_all() tables lack the migrations' server defaults (is_active true)
+    with app_module.db_manager.get_connection() as conn:
+        conn.cursor().execute('UPDATE users SET is_active = 1 WHERE id = ?', (user_id,))
+        conn.commit()
+    import fastapi_auth
+
+    token = fastapi_auth.auth_manager.create_session(app_module.db_manager.get_user_by_id(user_id))
+    client.cookies.set("session_token", token)
+    return user_id
+
+
+@pytest.fixture
+def add_words(app_module):
+    """Insert words for a user with every counter column set (see ``user``)."""
+    def add(user_id, *words):
+        with app_module.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            for word in words:
+                cursor.execute('''
+                    INSERT INTO vocabulary (user_id, word, word_type, definition, example, difficulty,
+                                            times_reviewed, times_correct, mastery_level, is_hidden,
+                                            like_count)
+                    VALUES (?, ?, 'noun', ?, '', 'medium', 0, 0, 0, 0, 0)
+                ''', (user_id, word, f"meaning of {word}"))
+            conn.commit()
+        with app_module.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, word FROM vocabulary WHERE user_id = ? ORDER BY id', (user_id,))
+            return {row['word']: row['id'] for row in cursor.fetchall()}
+    return add
+
+
+@pytest.fixture
+def admin(app_module, user):
+    """``user`` with admin rights."""
+    with app_module.db_manager.get_connection() as conn:
+        conn.cursor().execute('UPDATE users SET is_admin = 1 WHERE id = ?', (user,))
+        conn.commit()
+    return user
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from _admission import CRITICAL, LOW, NORMAL, AdmissionController, Rejected, classify
+
+
+def test_classify():
+    assert classify("/static/app.js") is None
+    assert classify("/health") is None
+    assert classify("/api/most-liked-words") == LOW
+    assert classify("/api/admin/db-stats") == LOW
+    assert classify("/api/auth/login") == CRITICAL
+    assert classify("/api/words/12/review") == CRITICAL
+    assert classify("/api/words") == NORMAL
+
+
+def test_low_priority_is_shed_when_slots_run_low():
+    async def run():
+        controller = AdmissionController(max_in_flight=4, queue_timeout_ms=50)
+        for _ in range(3):
+            await controller.acquire(NORMAL)
+        with pytest.raises(Rejected) as rejected:
+            await controller.acquire(LOW)
+        assert rejected.value.retry_after == 5
+        return controller.stats()
+
+    stats = asyncio.run(run())
+    assert stats["in_flight"] == 3
+    assert stats["by_priority"]["low"]["shed"] == 1
+
+
+def test_queue_wait_times_out():
+    async def run():
+        controller = AdmissionController(max_in_flight=1, queue_timeout_ms=20)
+        await controller.acquire(NORMAL)
+        with pytest.raises(Rejected) as rejected:
+            await controller.acquire(NORMAL)
+        assert rejected.value.reason == "queue timeout"
+        controller.release()
+        return controller.stats()
+
+    stats = asyncio.run(run())
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+    assert stats["by_priority"]["normal"]["timed_out"] == 1
+
+
+def test_released_slot_goes_to_the_highest_priority_waiter():
+    async def run():
+        controller = AdmissionController(max_in_flight=1, queue_timeout_ms=1000)
+        await controller.acquire(NORMAL)
+        order = []
+
+        async def request(priority, name):
+            await controller.acquire(priority)
+            order.append(name)
+            controller.release()
+
+        waiters = [asyncio.create_task(request(NORMAL, "normal")),
+                   asyncio.create_task(request(CRITICAL, "critical"))]
+        await asyncio.sleep(0.01)
+        assert controller.queue_depth == 2
+        controller.release()
+        await asyncio.gather(*waiters)
+        return order, controller.in_flight
+
+    assert asyncio.run(run()) == (["critical", "normal"], 0)
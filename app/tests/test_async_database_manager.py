@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from _executors import run_db
+
+
+@pytest.fixture
+def async_db(app_module):
+    from async_database_manager import AsyncDatabaseManager
+    from database import build_async_engine
+
+    engine = build_async_engine()
+    if engine is None:
+        pytest.skip("aiosqlite not installed")
+    manager = AsyncDatabaseManager(app_module.db_manager, engine)
+    yield manager
+    asyncio.run(engine.dispose())
+
+
+def _session_ids(app_module, user_id):
+    with app_module.db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id FROM ai_learning_sessions WHERE user_id = ?', (user_id,))
+        return [row['id'] for row in cursor.fetchall()]
+
+
+def test_native_write_outside_unit_of_work_commits(app_module, async_db, user):
+    session_id = asyncio.run(async_db.create_ai_learning_session(user, 5))
+
+    assert session_id is not None
+    assert _session_ids(app_module, user) == [session_id]
+
+
+def test_write_inside_unit_of_work_rolls_back_with_it(app_module, async_db, user):
+    async def request():
+        async with app_module.db_manager.async_unit_of_work(run_db):
+            assert await async_db.create_ai_learning_session(user, 5) is not None
+            raise RuntimeError("handler failed")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(request())
+
+    assert _session_ids(app_module, user) == []
+
+
+def test_write_inside_unit_of_work_commits_with_it(app_module, async_db, user):
+    async def request():
+        async with app_module.db_manager.async_unit_of_work(run_db):
+            return await async_db.create_ai_learning_session(user, 5)
+
+    session_id = asyncio.run(request())
+
+    assert _session_ids(app_module, user) == [session_id]
@@ -0,0 +1,148 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from _db_adapter import ConnectionAdapter, RowAdapter, _translate, get_translation_cache_stats
+
+
+@pytest.fixture
+def conn(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'adapter.db'}")
+    with engine.begin() as setup:
+        setup.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, word TEXT UNIQUE, n INTEGER)"))
+    session = Session(bind=engine)
+    yield ConnectionAdapter(session, is_sqlite=True)
+    session.close()
+    engine.dispose()
+
+
+# ── translation cache ─────────────────────────────────────────
+def test_translation_is_cached_per_statement_and_dialect():
+    sql = "SELECT id FROM vocabulary WHERE user_id = ? AND word = ? -- translation cache test"
+    before = get_translation_cache_stats()
+
+    sqlite_clause, names = _translate(sql, True, True)
+    assert names == ("_p1", "_p2")
+    assert "user_id = :_p1 AND word = :_p2" in str(sqlite_clause)
+    assert _translate(sql, True, True) is _translate(sql, True, True)
+    assert _translate(sql, False, True) is not _translate(sql, True, True)
+
+    after = get_translation_cache_stats()
+    assert after["misses"] - before["misses"] == 2
+    assert after["hits"] - before["hits"] == 3
+
+
+def test_postgres_translation_rewrites_sqlite_dialect():
+    clause, _names = _translate(
+        "SELECT word FROM vocabulary WHERE julianday('now') - julianday(last_reviewed) <= ? "
+        "ORDER BY word COLLATE NOCASE", False, True)
+    sql = str(clause)
+    assert "EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - last_reviewed)) / 86400.0 <= :_p1" in sql
+    assert "NOCASE" not in sql
+
+    clause, _names = _translate("INSERT OR IGNORE INTO word_likes (user_id, word_id) VALUES (?, ?)", False, True)
+    assert str(clause).endswith("VALUES (:_p1, :_p2) ON CONFLICT DO NOTHING")
+
+
+def test_sqlite_only_statements_are_skipped_on_postgres():
+    assert _translate("PRAGMA optimize", False, False) is None
+    assert _translate("PRAGMA optimize", True, False) is not None
+
+
+# ── rows ──────────────────────────────────────────────────────
+def test_rows_share_one_key_map(conn):
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO t (word, n) VALUES (?, ?)", ("alpha", 1))
+    cursor.execute("INSERT INTO t (word, n) VALUES (?, ?)", ("bravo", 2))
+    cursor.execute("SELECT word, n FROM t ORDER BY id")
+    first, second = cursor.fetchall()
+
+    assert first["word"] == first[0] == "alpha"
+    assert second.get("n") == 2 and second.get("missing", "x") == "x"
+    assert list(first) == ["alpha", 1] and len(first) == 2
+    assert "word" in first and "id" not in first
+    assert first.to_dict() == {"word": "alpha", "n": 1}
+    assert first.keys() is second.keys()
+    assert first._index is second._index
+
+
+def test_row_rejects_unknown_column():
+    row = RowAdapter((1,), ("id",), {"id": 0})
+    with pytest.raises(KeyError):
+        row["word"]
+
+
+# ── fetching ──────────────────────────────────────────────────
+def _fill(conn, count):
+    conn.cursor().executemany("INSERT INTO t (word, n) VALUES (?, ?)", [(f"w{i:04d}", i) for i in range(count)])
+
+
+def test_fetchmany_honours_size_and_arraysize(conn):
+    _fill(conn, 5)
+    cursor = conn.cursor()
+    cursor.execute("SELECT n FROM t ORDER BY n")
+
+    assert [r["n"] for r in cursor.fetchmany(2)] == [0, 1]
+    cursor.arraysize = 2
+    assert [r["n"] for r in cursor.fetchmany()] == [2, 3]
+    assert [r["n"] for r in cursor.fetchmany(10)] == [4]
+    assert cursor.fetchmany() == []
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_iterating_a_cursor_yields_every_row(conn, monkeypatch, stream):
+    import _db_adapter
+
+    monkeypatch.setattr(_db_adapter, "STREAM_BATCH_SIZE", 3)
+    _fill(conn, 10)
+    cursor = conn.cursor(stream=stream)
+    cursor.execute("SELECT n FROM t ORDER BY n")
+
+    assert [row["n"] for row in cursor] == list(range(10))
+
+
+def test_unexecuted_cursor_is_empty(conn):
+    cursor = conn.cursor()
+    assert cursor.fetchone() is None
+    assert cursor.fetchmany(3) == [] and cursor.fetchall() == []
+    assert list(cursor) == []
+
+
+# ── executemany ───────────────────────────────────────────────
+def test_executemany_pages_multi_row_inserts(conn, monkeypatch):
+    import _db_adapter
+
+    monkeypatch.setattr(_db_adapter, "MAX_ROWS_PER_INSERT", 4)
+    statements = []
+    real_execute = conn._session.execute
+    monkeypatch.setattr(conn._session, "execute",
+                        lambda clause, *a, **kw: statements.append(str(clause)) or real_execute(clause, *a, **kw))
+
+    cursor = conn.cursor()
+    cursor.executemany("INSERT INTO t (word, n) VALUES (?, ?)", [(f"w{i}", i) for i in range(10)])
+
+    assert cursor.rowcount == 10
+    assert len(statements) == 3  # pages of 4, 4 and 2 rows
+    cursor.execute("SELECT COUNT(*) AS c, SUM(n) AS s FROM t")
+    assert tuple(cursor.fetchone()) == (10, 45)
+
+
+def test_executemany_rowcount_counts_ignored_duplicates(conn):
+    cursor = conn.cursor()
+    cursor.executemany("INSERT INTO t (word, n) VALUES (?, ?)", [("alpha", 1)])
+    cursor.executemany("INSERT OR IGNORE INTO t (word, n) VALUES (?, ?)", [("alpha", 1), ("bravo", 2)])
+    assert cursor.rowcount == 1
+
+
+def test_executemany_runs_other_statements_once_per_row(conn):
+    _fill(conn, 3)
+    cursor = conn.cursor()
+    cursor.executemany("UPDATE t SET n = n + ? WHERE word = ?", [(10, "w0000"), (20, "w0002")])
+    assert cursor.rowcount == 2
+    cursor.execute("SELECT n FROM t ORDER BY word")
+    assert [r["n"] for r in cursor.fetchall()] == [10, 1, 22]
+
+
+def test_executemany_with_no_rows_is_a_no_op(conn):
+    cursor = conn.cursor()
+    assert cursor.executemany("INSERT INTO t (word, n) VALUES (?, ?)", []).rowcount == 0
@@ -0,0 +1,51 @@
+import threading
+
+import _db_metrics
+
+
+def _stats(key):
+    return next(s for s in _db_metrics.snapshot(None) if s["statement"] == key)
+
+
+def test_statement_latency_merges_thread_shards():
+    key = _db_metrics.normalize_statement("SELECT  metrics_test\n FROM t")
+    assert key == "SELECT metrics_test FROM t"
+
+    _db_metrics.record_execute(key, 1.0)
+    thread = threading.Thread(target=_db_metrics.record_execute, args=(key, 3.0, 2))
+    thread.start()
+    thread.join()
+    _db_metrics.record_fetch(key, 0.5, 4)
+
+    stats = _stats(key)
+    assert stats["calls"] == 2
+    assert stats["rows"] == 6
+    assert stats["exec_ms"] == 4.0 and stats["fetch_ms"] == 0.5
+    assert stats["max_ms"] == 3.0
+    assert 1.0 <= stats["p50_ms"] <= 1.2
+    assert 3.0 <= stats["p99_ms"] <= 3.6
+
+
+def test_reset_clears_statements_and_routes():
+    _db_metrics.record_execute("SELECT metrics_reset", 1.0)
+    _db_metrics.record_route("primary", "pending_writes")
+
+    _db_metrics.reset()
+
+    assert _db_metrics.snapshot(None) == []
+    assert _db_metrics.route_snapshot() == {}
+
+
+def test_db_stats_reset_needs_delete(client, admin):
+    _db_metrics.record_execute("SELECT metrics_route", 1.0)
+
+    assert client.get("/api/admin/db-stats", params={"reset": "true"}).status_code == 200
+    assert any(s["statement"] == "SELECT metrics_route" for s in _db_metrics.snapshot(None))
+
+    assert client.delete("/api/admin/db-stats").status_code == 200
+    assert not any(s["statement"] == "SELECT metrics_route" for s in _db_metrics.snapshot(None))
+
+
+def test_db_stats_is_admin_only(client, user):
+    assert client.get("/api/admin/db-stats").status_code == 403
+    assert client.delete("/api/admin/db-stats").status_code == 403
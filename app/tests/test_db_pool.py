@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+import _db_pool
+from _db_pool import (
+    BACKGROUND_CONNECTIONS, TimedQueuePool, install_idle_pre_ping, pool_limits, pool_stats, register_pool,
+)
+from settings import settings
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(settings, "DB_EXECUTOR_WORKERS", 16)
+    monkeypatch.setattr(settings, "AI_EXECUTOR_WORKERS", 8)
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 90)
+    monkeypatch.setattr(settings, "WORKERS", 1)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 0)
+    monkeypatch.setattr(settings, "DB_POOL_MAX_OVERFLOW", -1)
+    return monkeypatch
+
+
+def test_pool_covers_the_executor_threads(budget):
+    assert pool_limits() == (16, 8 + BACKGROUND_CONNECTIONS)
+    # SQLite has no server connection limit
+    budget.setattr(settings, "WORKERS", 8)
+    assert pool_limits(engines_per_worker=2, is_sqlite=True) == (16, 8 + BACKGROUND_CONNECTIONS)
+
+
+def test_workers_and_engines_share_the_connection_budget(budget):
+    budget.setattr(settings, "WORKERS", 4)
+    size, overflow = pool_limits(engines_per_worker=2)
+    assert (size, overflow) == (11, 0)
+    assert 4 * 2 * (size + overflow) <= settings.DB_MAX_CONNECTIONS
+
+    budget.setattr(settings, "WORKERS", 100)
+    assert pool_limits(engines_per_worker=2) == (1, 0)
+
+
+def test_explicit_sizes_win(budget):
+    budget.setattr(settings, "DB_POOL_SIZE", 3)
+    budget.setattr(settings, "DB_POOL_MAX_OVERFLOW", 2)
+    assert pool_limits() == (3, 2)
+
+
+def test_pool_stats_count_checkouts_and_idle_pings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_IDLE_SECONDS", 0)
+    monkeypatch.setattr(_db_pool, "_pools", {})
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool,
+                           pool_size=2, max_overflow=1)
+    install_idle_pre_ping(engine)
+    register_pool("test_pool", engine)
+    try:
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        stats = pool_stats()["test_pool"]
+        assert stats["pool_size"] == 2 and stats["max_overflow"] == 1
+        assert stats["checkouts"] == 3
+        assert stats["checked_out"] == 0
+        # Every checkout after the first reuses an idle connection
+        assert stats["idle_pings"] == 2 and stats["idle_ping_failures"] == 0
+    finally:
+        engine.dispose()
@@ -0,0 +1,59 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+import _db_statements as stmts
+
+
+def _sql(stmt, dialect):
+    return str(stmt.compile(dialect=dialect))
+
+
+def test_statements_render_each_dialect_natively():
+    assert "COLLATE NOCASE" in _sql(stmts.USER_WORDS, sqlite.dialect())
+    assert "COLLATE NOCASE" not in _sql(stmts.USER_WORDS, postgresql.dialect())
+
+    smart_sqlite = _sql(stmts.SMART_AI_LEARNING_WORDS, sqlite.dialect())
+    smart_pg = _sql(stmts.SMART_AI_LEARNING_WORDS, postgresql.dialect())
+    assert "julianday('now') - julianday(vocabulary.last_reviewed)" in smart_sqlite
+    assert "EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - vocabulary.last_reviewed))" in smart_pg
+
+    assert "is_hidden=1" in _sql(stmts.HIDE_WORD, sqlite.dialect())
+    assert "is_hidden=true" in _sql(stmts.HIDE_WORD, postgresql.dialect()).replace(" ", "")
+
+
+def test_update_binds_owner_and_new_values():
+    params = stmts.RECORD_WORD_REVIEW.compile(dialect=sqlite.dialect()).params
+    assert {"word_id", "owner_id", "new_times_reviewed", "new_times_correct", "new_mastery_level"} <= set(params)
+
+
+def _word(app_module, user_id, word_id):
+    with app_module.db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM vocabulary WHERE id = ? AND user_id = ?', (word_id, user_id))
+        return cursor.fetchone()
+
+
+def test_word_updates_through_core_statements(app_module, user, add_words):
+    db_manager = app_module.db_manager
+    word_id = add_words(user, "apple")["apple"]
+
+    assert db_manager.record_word_review(user, word_id, True)[0]
+    assert db_manager.record_word_review(user, word_id, False)[0]
+    assert db_manager.update_word_difficulty(user, word_id, "hard")[0]
+    assert db_manager.hide_word_for_user(user, word_id)[0]
+    row = _word(app_module, user, word_id)
+    assert (row["times_reviewed"], row["times_correct"]) == (2, 1)
+    assert row["difficulty"] == "hard"
+    assert row["is_hidden"] == 1
+
+    assert db_manager.unhide_word_for_user(user, word_id)[0]
+    assert _word(app_module, user, word_id)["is_hidden"] == 0
+
+
+def test_other_users_words_are_not_touched(app_module, user, add_words):
+    db_manager = app_module.db_manager
+    word_id = add_words(user, "pear")["pear"]
+    other = user + 100000
+
+    assert not db_manager.update_word_difficulty(other, word_id, "easy")[0]
+    assert not db_manager.record_word_review(other, word_id, True)[0]
+    assert _word(app_module, user, word_id)["difficulty"] == "medium"
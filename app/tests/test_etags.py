@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def _etag(client, path="/api/user/liked-words"):
+    response = client.get(path)
+    assert response.status_code == 200, response.text
+    return response.headers["ETag"]
+
+
+def test_unchanged_vocabulary_is_304(client, user, add_words):
+    add_words(user, "alpha")
+
+    for path in ("/api/words", "/api/user/liked-words"):
+        etag = _etag(client, path)
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert client.get(path, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+_MUTATIONS = {
+    "add": lambda client, ids: client.post("/api/words", json={
+        "word": "zulu", "type": "noun", "definition": "the letter z"}),
+    "delete": lambda client, ids: client.delete(f"/api/words/{ids['alpha']}"),
+    "update": lambda client, ids: client.put(f"/api/words/{ids['alpha']}", json={"definition": "first"}),
+    "like": lambda client, ids: client.post(f"/api/words/{ids['alpha']}/like"),
+    "hide": lambda client, ids: client.post(f"/api/words/{ids['alpha']}/hide"),
+    "review": lambda client, ids: client.post(f"/api/words/{ids['alpha']}/review",
+                                              json={"correct": True, "auto": False}),
+    "know": lambda client, ids: client.post(f"/api/words/{ids['alpha']}/know"),
+    "difficulty": lambda client, ids: client.put(f"/api/words/{ids['alpha']}/difficulty",
+                                                 json={"difficulty": "hard"}),
+}
+
+
+@pytest.mark.parametrize("mutation", sorted(_MUTATIONS))
+def test_each_mutation_invalidates_the_etag(client, user, add_words, mutation):
+    ids = add_words(user, "alpha", "bravo")
+    before = _etag(client)
+
+    response = _MUTATIONS[mutation](client, ids)
+    assert response.status_code == 200, response.text
+
+    stale = client.get("/api/user/liked-words", headers={"If-None-Match": before})
+    assert stale.status_code == 200
+    after = stale.headers["ETag"]
+    assert after != before
+    assert client.get("/api/user/liked-words", headers={"If-None-Match": after}).status_code == 304
+
+
+@pytest.mark.parametrize("undo, redo", [("unlike", "like"), ("unhide", "hide")])
+def test_undo_mutations_invalidate_the_etag(client, user, add_words, undo, redo):
+    ids = add_words(user, "alpha")
+    assert client.post(f"/api/words/{ids['alpha']}/{redo}").status_code == 200
+    before = _etag(client)
+
+    assert client.post(f"/api/words/{ids['alpha']}/{undo}").status_code == 200
+    assert client.get("/api/user/liked-words", headers={"If-None-Match": before}).status_code == 200
+
+
+def test_failed_mutation_keeps_the_etag(client, user, add_words):
+    add_words(user, "alpha")
+    before = _etag(client)
+
+    assert client.post("/api/words/999999/hide").status_code == 400
+    assert client.get("/api/user/liked-words", headers={"If-None-Match": before}).status_code == 304
+
+
+def test_recent_words_etag_changes_with_the_utc_date(app_module, client, user, add_words, monkeypatch):
+    add_words(user, "alpha")
+    path = "/api/user/recent-words"
+    etag = _etag(client, path)
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    class Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return super().now(tz) + timedelta(days=1)
+
+    monkeypatch.setattr(app_module, "datetime", Tomorrow)
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
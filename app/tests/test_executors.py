@@ -0,0 +1,63 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from _executors import BoundedExecutor
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.fixture
+def executor():
+    pool = BoundedExecutor("test", max_workers=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_runs_on_pool_thread_with_callers_context(executor):
+    async def call():
+        _request_id.set("r-1")
+        return await executor.run(lambda: (threading.current_thread().name, _request_id.get()))
+
+    thread_name, request_id = asyncio.run(call())
+    assert thread_name.startswith("test-exec")
+    assert request_id == "r-1"
+
+
+def test_stats_count_queueing_and_failures(executor):
+    def boom():
+        raise ValueError("boom")
+
+    async def calls():
+        await asyncio.gather(*(executor.run(time.sleep, 0.05) for _ in range(4)))
+        with pytest.raises(ValueError):
+            await executor.run(boom)
+
+    asyncio.run(calls())
+    stats = executor.stats()
+    assert stats["submitted"] == stats["completed"] == 5
+    assert stats["failed"] == 1
+    assert stats["max_queued"] >= 2
+    assert stats["max_wait_ms"] >= 40
+    assert stats["active"] == stats["queued"] == 0
+
+
+def test_cancelled_caller_waits_for_the_thread(executor):
+    finished = threading.Event()
+
+    def slow():
+        time.sleep(0.1)
+        finished.set()
+
+    async def cancel_midway():
+        task = asyncio.ensure_future(executor.run(slow))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+    assert finished.is_set()
@@ -0,0 +1,44 @@
+import pytest
+
+from database_manager import full_text_query
+
+
+def test_full_text_query_keeps_only_word_characters():
+    assert full_text_query('Big "cat" OR-', True) == '"big"* "cat"* "or"*'
+    assert full_text_query("Big cat's", False) == "big:* & cat:* & s:*"
+    assert full_text_query("- *", True) is None
+
+
+def _search(app_module, user_id, search, **kwargs):
+    words, _cursor = app_module.db_manager.get_user_words_page(user_id, search=search, **kwargs)
+    return [w["word"] for w in words]
+
+
+@pytest.fixture
+def vocabulary(app_module, user, add_words):
+    ids = add_words(user, "harbor", "shelter", "anchor")
+    with app_module.db_manager.get_connection() as conn:
+        conn.cursor().execute("UPDATE vocabulary SET definition = ? WHERE id = ?",
+                              ("a safe harbor for ships", ids["shelter"]))
+        conn.commit()
+    return user, ids
+
+
+def test_word_matches_rank_before_definition_matches(app_module, vocabulary):
+    user, _ids = vocabulary
+    assert _search(app_module, user, "harb") == ["harbor", "shelter"]
+
+
+def test_index_follows_updates_and_deletes(app_module, vocabulary):
+    user, ids = vocabulary
+    db_manager = app_module.db_manager
+    assert db_manager.update_user_word(user, ids["anchor"], "anchor", "noun", "weight on a rope", "")[0]
+    assert _search(app_module, user, "rope") == ["anchor"]
+
+    assert db_manager.remove_user_word(user, ids["harbor"])[0]
+    assert _search(app_module, user, "harbor") == ["shelter"]
+
+
+def test_search_without_word_characters_matches_substrings(app_module, user, add_words):
+    add_words(user, "well-known", "known")
+    assert _search(app_module, user, "-") == ["well-known"]
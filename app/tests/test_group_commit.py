@@ -0,0 +1,101 @@
+import time
+from concurrent.futures import Future
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import _db_unit_of_work
+from _db_group_commit import GroupCommitWriter
+from _db_unit_of_work import current_unit_of_work
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'group.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER NOT NULL)"))
+    yield engine
+    engine.dispose()
+
+
+def _insert(value, fail=False):
+    with current_unit_of_work().connection() as conn:
+        conn.cursor().execute("INSERT INTO t (x) VALUES (?)", (value,))
+        if fail:
+            raise ValueError(f"call {value} failed")
+        conn.commit()
+    return value
+
+
+def _run(writer, *calls):
+    batch = [(call, Future(), time.perf_counter()) for call in calls]
+    writer._run_batch(batch)
+    return [future for _call, future, _enqueued in batch]
+
+
+def _values(engine):
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(text("SELECT x FROM t ORDER BY x"))]
+
+
+def test_batch_commits_once_and_isolates_failing_call(engine):
+    writer = GroupCommitWriter(engine, window_ms=0, max_batch=8)
+    ok1, bad, ok2 = _run(writer, lambda: _insert(1), lambda: _insert(2, fail=True), lambda: _insert(3))
+
+    assert ok1.result() == 1 and ok2.result() == 3
+    with pytest.raises(ValueError):
+        bad.result()
+    assert _values(engine) == [1, 3]
+    assert writer.stats()["batch_fallbacks"] == 0
+
+
+def test_failed_batch_commit_reruns_each_call_alone(engine, monkeypatch):
+    real_commit = _db_unit_of_work.commit_session
+    commits = []
+
+    def commit_failing_first(session, is_sqlite):
+        commits.append(session)
+        if len(commits) == 1:
+            raise RuntimeError("disk I/O error")
+        return real_commit(session, is_sqlite)
+
+    monkeypatch.setattr(_db_unit_of_work, "commit_session", commit_failing_first)
+    writer = GroupCommitWriter(engine, window_ms=0, max_batch=8)
+    ok1, bad, ok2 = _run(writer, lambda: _insert(1), lambda: _insert(2, fail=True), lambda: _insert(3))
+
+    assert ok1.result() == 1 and ok2.result() == 3
+    with pytest.raises(ValueError):
+        bad.result()
+    # Nothing from the failed batch commit survives; each good call once
+    assert _values(engine) == [1, 3]
+    assert writer.stats()["batch_fallbacks"] == 1
+    assert len(commits) == 3
+
+
+def test_fallback_reports_a_per_call_commit_failure(engine, monkeypatch):
+    real_commit = _db_unit_of_work.commit_session
+    commits = []
+
+    def commit_failing(session, is_sqlite):
+        commits.append(session)
+        # The batch commit and the second call's own commit fail
+        if len(commits) in (1, 3):
+            raise RuntimeError("database is locked")
+        return real_commit(session, is_sqlite)
+
+    monkeypatch.setattr(_db_unit_of_work, "commit_session", commit_failing)
+    writer = GroupCommitWriter(engine, window_ms=0, max_batch=8)
+    first, second = _run(writer, lambda: _insert(1), lambda: _insert(2))
+
+    assert first.result() == 1
+    with pytest.raises(RuntimeError, match="locked"):
+        second.result()
+    assert _values(engine) == [1]
+
+
+def test_submit_runs_on_the_writer_thread(engine):
+    writer = GroupCommitWriter(engine, window_ms=1, max_batch=8)
+
+    assert writer.submit(lambda: (_insert(5), writer.on_writer_thread)) == (5, True)
+    assert _values(engine) == [5]
+    assert writer.stats()["ops"] == 1
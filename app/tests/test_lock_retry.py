@@ -0,0 +1,81 @@
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from _db_adapter import ConnectionAdapter
+from database import _install_sqlite_pragmas
+from settings import settings
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_BUSY_TIMEOUT_MS", 20)
+    monkeypatch.setattr(settings, "DB_LOCK_RETRY_DEADLINE_MS", 5000)
+    path = tmp_path / "locks.db"
+    with sqlite3.connect(path) as setup:
+        setup.execute("PRAGMA journal_mode = WAL")
+        setup.execute("CREATE TABLE t (x INTEGER NOT NULL)")
+    return path
+
+
+def _engine(path, on_network_fs=False):
+    engine = create_engine(f"sqlite:///{path}")
+    _install_sqlite_pragmas(engine, on_network_fs)
+    return engine
+
+
+def _busy_timeout(engine):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+
+
+def test_short_busy_timeout_only_with_wal(db_path):
+    wal, network = _engine(db_path), _engine(db_path, on_network_fs=True)
+    try:
+        assert _busy_timeout(wal) == settings.DB_BUSY_TIMEOUT_MS
+        assert _busy_timeout(network) == settings.DB_BUSY_TIMEOUT_NON_WAL_MS
+    finally:
+        wal.dispose()
+        network.dispose()
+
+
+def test_transaction_start_waits_for_the_writer(db_path):
+    engine = _engine(db_path)
+    writer = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    writer.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.2, writer.rollback).start()
+    session = Session(bind=engine)
+    try:
+        conn = ConnectionAdapter(session, is_sqlite=True)
+        conn.execute("INSERT INTO t (x) VALUES (?)", (1,))
+        conn.commit()
+        assert session.execute(text("SELECT x FROM t")).scalar() == 1
+    finally:
+        session.close()
+        writer.close()
+        engine.dispose()
+
+
+def test_lock_error_inside_a_transaction_is_not_retried(db_path):
+    engine = _engine(db_path)
+    session = Session(bind=engine)
+    try:
+        conn = ConnectionAdapter(session, is_sqlite=True)
+        conn.execute("INSERT INTO t (x) VALUES (?)", (1,))
+        calls = []
+
+        def locked(*args, **kwargs):
+            calls.append(args)
+            raise OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+
+        session.execute = locked
+        with pytest.raises(OperationalError):
+            conn.execute("INSERT INTO t (x) VALUES (?)", (2,))
+        assert len(calls) == 1
+    finally:
+        session.close()
+        engine.dispose()
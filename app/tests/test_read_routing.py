@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+import _db_unit_of_work
+from _db_unit_of_work import _note_user_write, recently_wrote
+from settings import settings
+
+
+@pytest.fixture(autouse=True)
+def writers(monkeypatch):
+    monkeypatch.setattr(_db_unit_of_work, "_last_write_at", OrderedDict())
+    monkeypatch.setattr(settings, "DB_READ_STICKY_SECONDS", 5.0)
+    return _db_unit_of_work._last_write_at
+
+
+def _unit(pending_writes=0, wrote=False, user_id=None):
+    return SimpleNamespace(pending_writes=pending_writes, wrote=wrote, user_id=user_id)
+
+
+@pytest.fixture
+def reason(app_module):
+    return app_module.db_manager._primary_read_reason
+
+
+def test_reads_outside_a_request_use_the_replica(reason):
+    assert reason(None) is None
+    assert reason(_unit(user_id=1)) is None
+
+
+def test_reads_after_writes_stay_on_the_primary(reason):
+    assert reason(_unit(pending_writes=1)) == "pending_writes"
+    assert reason(_unit(wrote=True)) == "request_wrote"
+    _note_user_write(7)
+    assert reason(_unit(user_id=7)) == "recent_user_write"
+    assert reason(_unit(user_id=8)) is None
+
+
+def test_sticky_window_expires(monkeypatch, writers):
+    clock = [100.0]
+    monkeypatch.setattr(_db_unit_of_work.time, "monotonic", lambda: clock[0])
+    _note_user_write(1)
+    clock[0] += 4
+    assert recently_wrote(1, settings.DB_READ_STICKY_SECONDS)
+    clock[0] += 2
+    assert not recently_wrote(1, settings.DB_READ_STICKY_SECONDS)
+
+    _note_user_write(2)
+    assert list(writers) == [2]
+
+
+def test_writer_map_is_capped(monkeypatch, writers):
+    monkeypatch.setattr(_db_unit_of_work, "_LAST_WRITE_MAX_USERS", 3)
+    for user_id in range(5):
+        _note_user_write(user_id)
+    _note_user_write(2)
+
+    assert list(writers) == [3, 4, 2]
@@ -0,0 +1,113 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+import _db_adapter
+from _db_deadline import DeadlineExceeded, raise_if_exceeded, remaining_ms, request_deadline
+
+
+def _insert_user(db_manager, username):
+    with db_manager.get_connection() as conn:
+        conn.cursor().execute(
+            "INSERT INTO users (email, username, password_hash) VALUES (?, ?, 'x')",
+            (f"{username}@example.com", username))
+        conn.commit()
+
+
+def _count_users(db_manager, username):
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) AS n FROM users WHERE username = ?', (username,))
+        return cursor.fetchone()['n']
+
+
+def _expired():
+    raise DeadlineExceeded("request deadline exceeded before the statement started")
+
+
+def test_deadline_is_504_and_rolls_back_the_request(app_module, client):
+    db_manager = app_module.db_manager
+    username = f"d{uuid.uuid4().hex[:12]}"
+    path = f"/_test/deadline/{username}"
+
+    def write_then_time_out():
+        _insert_user(db_manager, username)
+        raise DeadlineExceeded("request deadline exceeded")
+
+    app_module.app.add_api_route(path, write_then_time_out)
+    response = client.get(path)
+
+    assert response.status_code == 504
+    assert _count_users(db_manager, username) == 0
+
+
+def test_swallowed_deadline_still_fails_the_request(app_module, client):
+    db_manager = app_module.db_manager
+    username = f"s{uuid.uuid4().hex[:12]}"
+    path = f"/_test/swallowed/{username}"
+
+    def write_then_call_a_method():
+        _insert_user(db_manager, username)
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(_db_adapter, "check_deadline", _expired)
+            # get_user_by_id catches every Exception and returns None
+            user = db_manager.get_user_by_id(1)
+        return {"user": user}
+
+    app_module.app.add_api_route(path, write_then_call_a_method)
+    response = client.get(path)
+
+    assert response.status_code == 504
+    assert _count_users(db_manager, username) == 0
+
+
+def test_deadline_is_recorded_per_request():
+    with request_deadline(1000):
+        assert 0 < remaining_ms() <= 1000
+        raise_if_exceeded()
+        try:
+            raise DeadlineExceeded("caught by a DB method")
+        except Exception:
+            pass
+        with pytest.raises(DeadlineExceeded):
+            raise_if_exceeded()
+
+    with request_deadline(1000):
+        raise_if_exceeded()
+    assert remaining_ms() is None
+
+
+class _Cursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql):
+        self.statements.append(sql)
+
+
+def test_statement_timeout_shrinks_with_the_budget(monkeypatch):
+    import _db_deadline
+
+    conn, cursor = SimpleNamespace(info={}), _Cursor()
+    left = [900.0]
+    monkeypatch.setattr(_db_deadline, "remaining_ms", lambda: left[0])
+
+    def before_statement():
+        _db_deadline._refresh_statement_timeout(conn, cursor, "SELECT 1", {}, None, False)
+
+    before_statement()
+    assert cursor.statements == []  # no transaction with a timeout yet
+
+    conn.info[_db_deadline._TIMEOUT_KEY] = 1000
+    before_statement()
+    assert cursor.statements == ["SET LOCAL statement_timeout = 900"]
+    left[0] = 880.0
+    before_statement()
+    assert len(cursor.statements) == 1  # within STATEMENT_TIMEOUT_SLACK_MS
+    left[0] = 0.0
+    with pytest.raises(DeadlineExceeded):
+        before_statement()
+
+    _db_deadline._forget_statement_timeout(conn)
+    assert conn.info == {}
@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine
+
+from _schema_fingerprint import (
+    FINGERPRINT_TABLE, schema_fingerprint, store_schema_fingerprint, stored_schema_fingerprint,
+)
+
+
+def test_fingerprint_round_trip(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fp.db'}")
+    try:
+        assert stored_schema_fingerprint(engine) is None
+        fingerprint = schema_fingerprint(engine, 1)
+        assert fingerprint == schema_fingerprint(engine, 1)
+        assert fingerprint != schema_fingerprint(engine, 2)
+
+        store_schema_fingerprint(engine, fingerprint)
+        store_schema_fingerprint(engine, fingerprint)
+        assert stored_schema_fingerprint(engine) == fingerprint
+    finally:
+        engine.dispose()
+
+
+def test_startup_skips_init_until_the_row_is_deleted(app_module):
+    db_manager = app_module.db_manager
+    assert db_manager.ensure_schema() is False
+
+    with db_manager.get_connection() as conn:
+        conn.cursor().execute(f"DELETE FROM {FINGERPRINT_TABLE}")
+        conn.commit()
+    assert db_manager.ensure_schema() is True
+    assert db_manager.ensure_schema() is False
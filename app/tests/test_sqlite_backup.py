@@ -0,0 +1,81 @@
+import sqlite3
+import threading
+
+import pytest
+
+import _sqlite_backup
+from _process_lock import ProcessLeaderLock
+from _sqlite_backup import _lock_path, backup_on_exit, restore_if_needed
+from settings import settings
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    local = tmp_path / "local" / "vocabulary.db"
+    snapshot = tmp_path / "share" / "vocabulary.db"
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{local}")
+    monkeypatch.setattr(settings, "SQLITE_BACKUP_PATH", str(snapshot))
+    return local, snapshot
+
+
+def _make_db(path, value):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (?)", (value,))
+    conn.close()
+
+
+def _value(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT x FROM t").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def leader(paths):
+    paths[0].parent.mkdir(parents=True, exist_ok=True)
+    lock = ProcessLeaderLock(_lock_path())
+    assert lock.try_acquire()
+    yield lock
+    lock.release()
+
+
+def test_restore_does_not_wait_for_the_backup_leader(paths, leader):
+    local, snapshot = paths
+    _make_db(snapshot, 1)
+    result = []
+    worker = threading.Thread(target=lambda: result.append(restore_if_needed()), daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+
+    assert result == [True]
+    assert _value(local) == 1
+
+
+def test_restore_keeps_an_existing_database(paths):
+    local, snapshot = paths
+    _make_db(local, 1)
+    _make_db(snapshot, 2)
+
+    assert restore_if_needed() is False
+    assert _value(local) == 1
+
+
+def test_backup_on_exit_writes_a_snapshot(paths):
+    local, snapshot = paths
+    _make_db(local, 3)
+
+    assert backup_on_exit() is True
+    assert _value(snapshot) == 3
+
+
+def test_backup_on_exit_gives_up_while_the_lock_is_held(paths, leader, monkeypatch):
+    local, snapshot = paths
+    _make_db(local, 3)
+    monkeypatch.setattr(_sqlite_backup, "EXIT_LOCK_WAIT_SECONDS", 0.2)
+
+    assert backup_on_exit() is False
+    assert not snapshot.exists()
@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from _sqlite_maintenance import SQLiteMaintenance
+from database import _profile_pragmas
+from settings import settings
+
+
+def _engine(path, auto_vacuum=None):
+    with sqlite3.connect(path) as conn:
+        if auto_vacuum:
+            conn.execute(f"PRAGMA auto_vacuum = {auto_vacuum}")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, word TEXT)")
+        conn.execute("CREATE INDEX idx_t_word ON t (word)")
+        conn.executemany("INSERT INTO t (word) VALUES (?)", [(f"w{i}" + "x" * 500,) for i in range(200)])
+    conn.close()
+    return create_engine(f"sqlite:///{path}")
+
+
+def test_run_analyzes_stale_tables(tmp_path):
+    engine = _engine(tmp_path / "m.db")
+    try:
+        stats = SQLiteMaintenance(engine, 3600).run_now()
+        assert stats["runs"] == 1 and stats["last_error"] is None
+        assert stats["last_analyzed"] == ["t"]
+        assert stats["tables"] == [{"table": "t", "rows": 200, "analyzed_rows": 200,
+                                    "drift": 0.0, "stale": False}]
+        assert stats["auto_vacuum"] == "none"
+
+        assert SQLiteMaintenance(engine, 3600).run_now()["last_analyzed"] == []
+    finally:
+        engine.dispose()
+
+
+def test_incremental_vacuum_returns_free_pages(tmp_path):
+    engine = _engine(tmp_path / "v.db", auto_vacuum="INCREMENTAL")
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM t")
+        stats = SQLiteMaintenance(engine, 3600).run_now()
+        assert stats["auto_vacuum"] == "incremental"
+        assert stats["last_vacuumed_pages"] > 0
+    finally:
+        engine.dispose()
+
+
+def test_network_fs_profile_skips_mmap(monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_PRAGMA_PROFILE", "performance")
+    assert _profile_pragmas(on_network_fs=False)["mmap_size"] > 0
+    network = _profile_pragmas(on_network_fs=True)
+    assert "mmap_size" not in network and "wal_autocheckpoint" not in network
+
+
+@pytest.fixture
+def reviewed(app_module, user, add_words):
+    ids = add_words(user, "today", "lastweek", "never")
+    with app_module.db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE vocabulary SET last_reviewed = CURRENT_TIMESTAMP WHERE id = ?", (ids["today"],))
+        cursor.execute("UPDATE vocabulary SET last_reviewed = datetime('now', '-10 days') WHERE id = ?",
+                       (ids["lastweek"],))
+        conn.commit()
+    return user
+
+
+def test_recent_words_cutoff_is_computed_in_sql(app_module, reviewed):
+    recent = app_module.db_manager.get_recent_words(reviewed, days=7)
+    assert [w["word"] for w in recent] == ["today"]
+    assert recent[0]["days_ago"] < 0.01
+
+    older = app_module.db_manager.get_recent_words(reviewed, days=14)
+    assert [w["word"] for w in older] == ["today", "lastweek"]
@@ -0,0 +1,113 @@
+from _trigram_index import TrigramIndex, VocabularyTrigramIndexes, trigrams
+
+
+def _ids(index, query, limit=10):
+    return [word_id for word_id, _score in index.search(query, limit)]
+
+
+def test_trigrams_follow_pg_trgm_padding():
+    assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+    assert trigrams("!!") == frozenset()
+
+
+def test_search_finds_misspelling():
+    index = TrigramIndex()
+    index.sync([(1, "aberrant"), (2, "abundant"), (3, "zebra")])
+
+    hits = index.search("abberant", 10)
+    assert hits[0][0] == 1
+    assert 0 < hits[0][1] < 1
+    assert 3 not in _ids(index, "abberant")
+
+
+def test_sync_adds_renames_and_deletes():
+    index = TrigramIndex()
+    assert index.sync([(1, "aberrant"), (2, "zebra")]) == 2
+
+    # Unchanged rows are not re-indexed
+    assert index.sync([(1, "aberrant"), (2, "zebra")]) == 0
+
+    # 1 renamed, 2 deleted, 3 added
+    assert index.sync([(1, "giraffe"), (3, "abhorrent")]) == 3
+    assert len(index) == 2
+    assert _ids(index, "giraffe") == [1]
+    assert 1 not in _ids(index, "aberrant")
+    assert _ids(index, "zebra") == []
+    assert _ids(index, "abhorent") == [3]
+
+    # Deleted words leave no empty posting lists behind
+    assert index.sync([]) == 2
+    assert len(index) == 0
+    assert index._postings == {}
+
+
+def test_user_index_resyncs_only_on_new_version():
+    indexes = VocabularyTrigramIndexes(max_users=2)
+    loads = []
+
+    def rows(*pairs):
+        def load():
+            loads.append(pairs)
+            return pairs
+        return load
+
+    index = indexes.user_index(7, 1, rows((1, "aberrant")))
+    assert indexes.user_index(7, 1, rows((1, "ignored"))) is index
+    assert len(loads) == 1
+
+    assert indexes.user_index(7, 2, rows((1, "aberrant"), (2, "zebra"))) is index
+    assert _ids(index, "zebra") == [2]
+    assert indexes.stats()["reindexed_words"] == 2
+
+    indexes.user_index(8, 1, rows())
+    indexes.user_index(9, 1, rows())
+    assert indexes.stats()["users"] == 2
+    assert indexes.stats()["evictions"] == 1
+
+
+def test_base_index_resyncs_only_on_new_fingerprint():
+    indexes = VocabularyTrigramIndexes(max_users=1)
+    loads = []
+
+    def rows(*pairs):
+        def load():
+            loads.append(pairs)
+            return pairs
+        return load
+
+    base = indexes.base_index((1, 1, "t1"), rows((1, "aberrant")))
+    assert indexes.base_index((1, 1, "t1"), rows((1, "ignored"))) is base
+    assert len(loads) == 1
+
+    # Same count and max id, but a later updated_at: the rename is picked up
+    indexes.base_index((1, 1, "t2"), rows((1, "zebra")))
+    assert _ids(base, "zebra") == [1]
+    assert _ids(base, "aberrant") == []
+    assert indexes.stats()["base_syncs"] == 2
+
+
+def _base_hits(app_module, user, query):
+    return [w["word"] for w in app_module.db_manager.fuzzy_search_words(user, query)["base_words"]]
+
+
+def test_fuzzy_search_follows_base_vocabulary_edits(app_module, user):
+    db_manager = app_module.db_manager
+    with db_manager.get_connection() as conn:
+        conn.cursor().execute(
+            "INSERT INTO base_vocabulary (word, word_type, definition, example, is_active, updated_at) "
+            "VALUES (?, 'adjective', '', '', 1, '2020-01-01 00:00:00')", ("aberrant",))
+        conn.commit()
+    assert _base_hits(app_module, user, "abberant") == ["aberrant"]
+
+    with db_manager.get_connection() as conn:
+        conn.cursor().execute(
+            "UPDATE base_vocabulary SET word = ?, updated_at = '2020-01-02 00:00:00' WHERE word = ?",
+            ("abhorrent", "aberrant"))
+        conn.commit()
+    assert _base_hits(app_module, user, "abberant") == []
+    assert _base_hits(app_module, user, "abhorent") == ["abhorrent"]
+
+    with db_manager.get_connection() as conn:
+        conn.cursor().execute("DELETE FROM base_vocabulary WHERE word = ?", ("abhorrent",))
+        conn.commit()
+    assert _base_hits(app_module, user, "abhorent") == []
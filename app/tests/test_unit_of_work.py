@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from _db_unit_of_work import unit_of_work
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'uow.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER NOT NULL)"))
+    yield engine
+    engine.dispose()
+
+
+def _insert(unit, value, fail=False):
+    with unit.connection() as conn:
+        conn.cursor().execute("INSERT INTO t (x) VALUES (?)", (value,))
+        if fail:
+            raise RuntimeError("method failed")
+        conn.commit()
+
+
+def _values(engine):
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(text("SELECT x FROM t ORDER BY x"))]
+
+
+def test_failed_borrow_rolls_back_to_its_savepoint(engine):
+    with unit_of_work(engine, is_sqlite=True) as unit:
+        _insert(unit, 1)
+        _insert(unit, 2)
+        with pytest.raises(RuntimeError):
+            _insert(unit, 3, fail=True)
+        _insert(unit, 4)
+        assert unit.pending_writes == 3
+
+    assert _values(engine) == [1, 2, 4]
+
+
+def test_first_borrow_rolls_back_without_savepoint(engine):
+    with unit_of_work(engine, is_sqlite=True) as unit:
+        with pytest.raises(RuntimeError):
+            _insert(unit, 1, fail=True)
+        _insert(unit, 2)
+
+    assert _values(engine) == [2]
+
+
+def test_uncommitted_borrow_is_undone_on_close(engine):
+    with unit_of_work(engine, is_sqlite=True) as unit:
+        _insert(unit, 1)
+        conn = unit.connection()
+        conn.cursor().execute("INSERT INTO t (x) VALUES (?)", (2,))
+        conn.close()
+
+    assert _values(engine) == [1]
+
+
+def test_unit_rolls_back_everything_when_block_raises(engine):
+    with pytest.raises(RuntimeError):
+        with unit_of_work(engine, is_sqlite=True) as unit:
+            _insert(unit, 1)
+            raise RuntimeError("request failed")
+
+    assert _values(engine) == []
+
+
+def test_nested_unit_joins_outer(engine):
+    with unit_of_work(engine, is_sqlite=True) as outer:
+        with unit_of_work(engine, is_sqlite=True) as inner:
+            assert inner is outer
+            _insert(inner, 1)
+        assert not outer.closed
+
+    assert _values(engine) == [1]
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_async_unit_closes_through_run_blocking(engine, fail):
+    import asyncio
+    import threading
+
+    from _db_unit_of_work import async_unit_of_work
+
+    closed_on = []
+
+    async def run_blocking(fn, *args, **kwargs):
+        def call():
+            closed_on.append(threading.current_thread())
+            return fn(*args, **kwargs)
+        return await asyncio.to_thread(call)
+
+    async def request():
+        async with async_unit_of_work(engine, True, run_blocking) as unit:
+            _insert(unit, 1)
+            if fail:
+                raise RuntimeError("request failed")
+
+    if fail:
+        with pytest.raises(RuntimeError):
+            asyncio.run(request())
+    else:
+        asyncio.run(request())
+
+    assert len(closed_on) == 1 and closed_on[0] is not threading.main_thread()
+    assert _values(engine) == ([] if fail else [1])
@@ -0,0 +1,66 @@
+import pytest
+
+from _db_adapter import _or_replace_to_upsert
+
+
+@pytest.fixture
+def prefs():
+    import fastapi_auth
+    return fastapi_auth.user_preferences
+
+
+def _like_count(db_manager, word_id):
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT like_count FROM vocabulary WHERE id = ?', (word_id,))
+        return cursor.fetchone()['like_count']
+
+
+def test_set_preference_updates_the_row_in_place(app_module, user, prefs):
+    def theme_row_id():
+        with app_module.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id FROM user_preferences WHERE user_id = ? AND preference_key = ?',
+                           (user, "theme"))
+            return cursor.fetchone()['id']
+
+    assert prefs.set_preference(user, "theme", "dark")
+    row_id = theme_row_id()
+
+    assert prefs.set_preference(user, "theme", "light")
+    assert prefs.set_multiple_preferences(user, {"theme": "blue", "font": "large"})
+
+    stored = prefs.get_all_preferences(user)
+    assert (stored["theme"], stored["font"]) == ("blue", "large")
+    assert theme_row_id() == row_id
+
+
+def test_like_is_idempotent_and_unlike_reverts(app_module, user, add_words):
+    db = app_module.db_manager
+    word_id = add_words(user, "alpha")["alpha"]
+
+    assert db.like_word(user, word_id) == (True, "Word liked successfully")
+    assert db.like_word(user, word_id) == (False, "You have already liked this word")
+    assert _like_count(db, word_id) == 1
+    assert db.get_user_word_likes(user) == [word_id]
+
+    assert db.unlike_word(user, word_id) == (True, "Word unliked successfully")
+    assert db.unlike_word(user, word_id) == (False, "You haven't liked this word")
+    assert _like_count(db, word_id) == 0
+    assert db.get_user_word_likes(user) == []
+
+
+def test_cannot_like_another_users_word(app_module, user, add_words):
+    other = app_module.db_manager.create_user("other-like@example.com", "otherlike", "Passw0rd!23")[2]
+    word_id = add_words(other, "bravo")["bravo"]
+
+    assert app_module.db_manager.like_word(user, word_id) == (False, "Word not found or not accessible")
+
+
+def test_insert_or_replace_becomes_on_conflict_upsert():
+    sql = _or_replace_to_upsert(
+        "INSERT OR REPLACE INTO user_preferences (user_id, preference_key, preference_value) VALUES (?, ?, ?)")
+    assert sql == (
+        "INSERT INTO user_preferences (user_id, preference_key, preference_value) VALUES (?, ?, ?)"
+        " ON CONFLICT (user_id, preference_key) DO UPDATE SET preference_value = EXCLUDED.preference_value"
+    )
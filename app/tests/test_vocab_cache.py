@@ -0,0 +1,71 @@
+from _vocab_cache import VocabularyCache, estimate_bytes
+
+
+def _words(*names):
+    return [{"id": i, "word": name} for i, name in enumerate(names)]
+
+
+def test_entry_is_only_served_at_its_version():
+    cache = VocabularyCache(1 << 20)
+    cache.put(1, 3, _words("alpha"))
+
+    assert cache.get(1, 3) == _words("alpha")
+    assert cache.get(1, 4) is None
+    assert cache.get(1, 3) is None  # the stale entry was dropped
+    assert cache.stats()["stale"] == 1
+
+
+def test_older_list_does_not_replace_a_newer_one():
+    cache = VocabularyCache(1 << 20)
+    cache.put(1, 5, _words("new"))
+    cache.put(1, 4, _words("old"))
+
+    assert cache.get(1, 5) == _words("new")
+
+
+def test_entries_are_copies():
+    cache = VocabularyCache(1 << 20)
+    words = _words("alpha")
+    cache.put(1, 1, words)
+    words[0]["word"] = "changed"
+    cache.get(1, 1)[0]["word"] = "changed"
+
+    assert cache.get(1, 1) == _words("alpha")
+
+
+def test_lru_eviction_by_bytes():
+    one_user = estimate_bytes(_words("alpha", "bravo"))
+    cache = VocabularyCache(one_user * 2 + one_user // 2)
+    for user_id in (1, 2):
+        cache.put(user_id, 1, _words("alpha", "bravo"))
+    cache.get(1, 1)
+    cache.put(3, 1, _words("alpha", "bravo"))
+
+    assert cache.get(2, 1) is None
+    assert cache.get(1, 1) is not None and cache.get(3, 1) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_disabled_cache_stores_nothing():
+    cache = VocabularyCache(0)
+    cache.put(1, 1, _words("alpha"))
+    assert not cache.enabled and cache.get(1, 1) is None
+
+
+def test_word_list_is_cached_and_invalidated_by_writes(app_module, user, add_words):
+    db_manager = app_module.db_manager
+    ids = add_words(user, "alpha", "bravo")
+    # add_words writes behind the manager's back: bump as a write path would
+    with db_manager.get_connection() as conn:
+        db_manager._bump_vocab_version(conn.cursor(), user)
+        conn.commit()
+
+    first = db_manager.get_user_words(user)
+    hits = db_manager.vocab_cache.hits
+    assert db_manager.get_user_words(user) == first
+    assert db_manager.vocab_cache.hits == hits + 1
+
+    assert db_manager.update_word_difficulty(user, ids["alpha"], "hard")[0]
+    words = {w["word"]: w for w in db_manager.get_user_words(user)}
+    assert words["alpha"]["difficulty"] == "hard"
@@ -0,0 +1,83 @@
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import database
+from _sqlite_checkpointer import WALCheckpointer
+from database import _install_sqlite_pragmas, set_inline_wal_checkpoints
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "wal.db"
+    with sqlite3.connect(path) as setup:
+        setup.execute("PRAGMA journal_mode = WAL")
+        setup.execute("CREATE TABLE t (x INTEGER)")
+    setup.close()
+    # The app's lifespan may have turned them off for the session's checkpointer
+    inline = database._inline_wal_checkpoints
+    set_inline_wal_checkpoints(True)
+    yield path
+    set_inline_wal_checkpoints(inline)
+
+
+@pytest.fixture
+def engines(db_path):
+    primary = create_engine(f"sqlite:///{db_path}")
+    replica = create_engine(f"sqlite:///{db_path}")
+    _install_sqlite_pragmas(primary, on_network_fs=False)
+    _install_sqlite_pragmas(replica, on_network_fs=False, query_only=True)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _autocheckpoint(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA wal_autocheckpoint")).scalar()
+
+
+def test_flag_reaches_pooled_connections_of_every_engine(engines):
+    expected = database._profile_pragmas(False).get("wal_autocheckpoint", 1000)
+    assert [_autocheckpoint(e) for e in engines] == [expected, expected]
+
+    set_inline_wal_checkpoints(False)
+    assert [_autocheckpoint(e) for e in engines] == [0, 0]
+
+    set_inline_wal_checkpoints(True)
+    assert [_autocheckpoint(e) for e in engines] == [expected, expected]
+
+
+def test_flag_reaches_the_async_engine(db_path):
+    pytest.importorskip("aiosqlite")
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        _install_sqlite_pragmas(engine.sync_engine, on_network_fs=False)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            set_inline_wal_checkpoints(False)
+            async with engine.connect() as conn:
+                return (await conn.execute(text("PRAGMA wal_autocheckpoint"))).scalar()
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_checkpointer_copies_frames_back(db_path, engines):
+    set_inline_wal_checkpoints(False)
+    with engines[0].begin() as conn:
+        conn.execute(text("INSERT INTO t (x) VALUES (1)"))
+    checkpointer = WALCheckpointer(str(db_path), 60, 1, 1)
+    try:
+        assert checkpointer.wal_size() > 0
+        result = checkpointer.checkpoint("TRUNCATE")
+        assert result["busy"] == 0
+        assert checkpointer.wal_size() == 0
+    finally:
+        checkpointer.stop()
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import _db_statements as stmts
+from database_manager import encode_word_cursor
+
+
+def _pages(client, limit, **params):
+    words, cursor = [], None
+    while True:
+        query = dict(params, limit=limit, **({"cursor": cursor} if cursor else {}))
+        response = client.get("/api/words", params=query)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert len(body["words"]) <= limit
+        words.extend(word["word"] for word in body["words"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return words
+
+
+# ── keyset pagination ─────────────────────────────────────────
+def test_cursor_pages_cover_the_list_once(client, user, add_words):
+    names = ["delta", "alpha", "echo", "charlie", "bravo", "foxtrot", "golf"]
+    add_words(user, *names)
+
+    everything = client.get("/api/words").json()["words"]
+    assert [w["word"] for w in everything] == sorted(names)
+    for limit in (1, 2, 3, 7, 10):
+        assert _pages(client, limit) == sorted(names)
+
+
+def test_search_cursor_pages_match_unpaged_search(client, user, add_words):
+    add_words(user, "aberrant", "abandon", "abacus", "zebra", "abate")
+
+    ranked = [w["word"] for w in client.get("/api/words", params={"search": "ab"}).json()["words"]]
+    assert sorted(ranked) == ["abacus", "abandon", "abate", "aberrant"]
+    assert _pages(client, 1, search="ab") == ranked
+
+
+def test_search_cursor_pages_through_tied_ranks(client, user, add_words):
+    # "meaning" only matches the definitions, which are equally long: every
+    # row has the same rank and only the id orders them
+    names = [f"tie{i}" for i in range(7)]
+    add_words(user, *names)
+
+    ranked = [w["word"] for w in client.get("/api/words", params={"search": "meaning"}).json()["words"]]
+    assert sorted(ranked) == names
+    for limit in (1, 2, 3):
+        assert _pages(client, limit, search="meaning") == ranked
+
+
+def test_postgres_rank_is_float8():
+    sql = str(stmts.ranked_user_words_page(False, False, False, True, True).compile(dialect=postgresql.dialect()))
+    assert "AS DOUBLE PRECISION) AS search_rank" in sql
+
+
+@pytest.mark.parametrize("search, cursor", [
+    (None, encode_word_cursor(-1.5, 1)),        # search cursor on the plain list
+    ("ab", encode_word_cursor("abacus", 1)),    # word cursor on a search
+    (None, "not-a-cursor"),
+    (None, encode_word_cursor(True, 1)),
+])
+def test_mismatched_or_malformed_cursor_is_400(client, user, add_words, search, cursor):
+    add_words(user, "abacus", "abate")
+
+    params = {"limit": 1, "cursor": cursor, **({"search": search} if search else {})}
+    response = client.get("/api/words", params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -73,7 +73,7 @@ def export_base_vocabulary(db_path: str) -> List[Dict[str, Any]]:
             ORDER BY word COLLATE NOCASE
         ''')
         
-        for row in cursor.fetchall():
+        for row in cursor:
             word_data = {
                 'word': row['word'],
                 'type': row['word_type'],
@@ -119,7 +119,7 @@ def export_user_vocabulary(db_path: str, user_id: Optional[int] = None) -> List[
                 ORDER BY word COLLATE NOCASE
             ''')
         
-        for row in cursor.fetchall():
+        for row in cursor:
             word_data = {
                 'word': row['word'],
                 'type': row['word_type'],
@@ -159,7 +159,7 @@ def export_unique_words(db_path: str, include_user_words: bool = True) -> List[D
             ORDER BY word COLLATE NOCASE
         ''')
         
-        for row in cursor.fetchall():
+        for row in cursor:
             word_key = row['word'].lower()
             if word_key not in unique_words:
                 word_data = {
@@ -188,7 +188,7 @@ def export_unique_words(db_path: str, include_user_words: bool = True) -> List[D
                 ORDER BY word COLLATE NOCASE
             ''')
             
-            for row in cursor.fetchall():
+            for row in cursor:
                 word_key = row['word'].lower()
                 if word_key not in unique_words:
                     word_data = {
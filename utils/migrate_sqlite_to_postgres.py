@@ -101,12 +101,9 @@ def migrate_table(
     if skipped:
         print(f"  NOTE: skipping columns not in PG: {skipped}")
 
-    # Read all rows from SQLite
+    # Stream rows from SQLite one batch at a time
     col_list = ", ".join(common_columns)
     cur = sqlite_conn.execute(f"SELECT {col_list} FROM {table}")
-    rows = cur.fetchall()
-    if not rows:
-        return 0
 
     # Build INSERT statement with named parameters
     placeholders = ", ".join(f":{c}" for c in common_columns)
@@ -117,8 +114,10 @@ def migrate_table(
     # Insert in batches
     total = 0
     with pg_engine.begin() as conn:
-        for i in range(0, len(rows), batch_size):
-            batch = rows[i : i + batch_size]
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
             params = [dict(zip(common_columns, row)) for row in batch]
             conn.execute(insert_sql, params)
             total += len(batch)